@@ -9,6 +9,10 @@ let recognition = null;
 let currentLanguage = 'ar-SA'; // Default to Arabic
 let isSpeaking = false; // Prevent multiple TTS calls
 let isAuthChecked = false; // Prevent multiple auth checks
+let lastInputWasVoice = false; // Voice turns are routed to the fast model tier
+let historyBeforeId = null; // Cursor for the next (older) history page, null = no more
+let loadingOlderHistory = false;
+let interviewSocket = null; // Live interview WebSocket session (see InterviewSocket)
 
 // =====================
 // Text-to-Speech Utilities
@@ -78,6 +82,57 @@ function speakText(text, lang) {
 }
 }
 
+// =====================
+// History cache (incremental /api/history sync)
+// =====================
+// The last messages are kept in localStorage; on page load they are shown
+// right away and only newer messages are fetched (since_id), with the
+// ETag sent back as If-None-Match so an unchanged history is a bare 304.
+const HISTORY_CACHE_LIMIT = 200;
+
+function historyCacheKey() {
+    let user = null;
+    try {
+        user = JSON.parse(localStorage.getItem('user') || 'null');
+    } catch (e) { /* ignore malformed user */ }
+    return 'history_cache:' + ((user && (user.id || user.username)) || 'anonymous');
+}
+
+function readHistoryCache() {
+    try {
+        return JSON.parse(localStorage.getItem(historyCacheKey()) || 'null');
+    } catch (e) {
+        return null;
+    }
+}
+
+function writeHistoryCache(cache) {
+    if (cache.messages.length > HISTORY_CACHE_LIMIT) {
+        cache.messages = cache.messages.slice(-HISTORY_CACHE_LIMIT);
+        cache.beforeId = cache.messages[0].id;
+    }
+    try {
+        localStorage.setItem(historyCacheKey(), JSON.stringify(cache));
+    } catch (e) {
+        console.warn('⚠️ Could not save history cache:', e);
+    }
+}
+
+function dropHistoryCache() {
+    localStorage.removeItem(historyCacheKey());
+}
+
+function renderHistory(messages, beforeId) {
+    historyEl.innerHTML = '';
+    messages.forEach(msg => {
+        appendMessage(msg.role, msg.text);
+    });
+    historyBeforeId = beforeId;
+
+    // Scroll to bottom
+    historyEl.scrollTop = historyEl.scrollHeight;
+}
+
 // Clear chat history on server
 async function clearServerHistory() {
     const token = localStorage.getItem('access_token');
@@ -97,6 +152,7 @@ async function clearServerHistory() {
 
         if (response.ok) {
             const data = await response.json();
+            dropHistoryCache();
             console.log('✅ Server history cleared:', data);
             return true;
         } else {
@@ -118,13 +174,18 @@ async function loadHistory() {
         return;
     }
 
+    const cache = readHistoryCache();
     try {
         console.log('Loading history with token:', token.substring(0, 20) + '...');
-        const response = await fetch('/api/history', {
-            headers: {
-                'Authorization': `Bearer ${token}`
-            }
-        });
+        let url = '/api/history';
+        const headers = { 'Authorization': `Bearer ${token}` };
+        if (cache) {
+            // Show the cached conversation right away, then fetch only what is new
+            renderHistory(cache.messages, cache.beforeId);
+            url += `?since_id=${cache.lastId || 0}`;
+            if (cache.etag) headers['If-None-Match'] = cache.etag;
+        }
+        const response = await fetch(url, { headers });
 
         console.log('History response status:', response.status);
 
@@ -137,25 +198,81 @@ async function loadHistory() {
             return;
         }
 
+        if (response.status === 304) {
+            console.log('History unchanged (304), using cache');
+            return;
+        }
+
         if (!response.ok) {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
-        const messages = await response.json();
-        
-        console.log('Loaded messages:', messages.length);
-        historyEl.innerHTML = '';
-        messages.forEach(msg => {
-            appendMessage(msg.role, msg.text);
+        const page = await response.json();
+        const etag = response.headers.get('ETag');
+        const toCache = msg => ({ id: msg.id, role: msg.role, text: msg.text });
+
+        if (cache) {
+            if (page.reset_version === cache.resetVersion && !page.has_more) {
+                // Delta: append the new messages to the cached ones
+                console.log('History delta:', page.messages.length);
+                page.messages.forEach(msg => appendMessage(msg.role, msg.text));
+                historyEl.scrollTop = historyEl.scrollHeight;
+                cache.messages = cache.messages.concat(page.messages.map(toCache));
+                cache.lastId = page.last_id || cache.lastId;
+                cache.etag = etag;
+                writeHistoryCache(cache);
+                return;
+            }
+            // History was cleared meanwhile (or the delta is too big): start over
+            dropHistoryCache();
+            return loadHistory();
+        }
+
+        console.log('Loaded messages:', page.messages.length);
+        renderHistory(page.messages, page.has_more ? page.next_before_id : null);
+        writeHistoryCache({
+            messages: page.messages.map(toCache),
+            lastId: page.last_id || 0,
+            beforeId: historyBeforeId,
+            etag: etag,
+            resetVersion: page.reset_version
         });
-        
-        // Scroll to bottom
-        historyEl.scrollTop = historyEl.scrollHeight;
     } catch (error) {
         console.error('Error loading history:', error);
         appendMessage('system', '❌ Error loading chat history: ' + error.message);
     }
 }
 
+// Load the previous history page when the user scrolls to the top
+async function loadOlderHistory() {
+    const token = localStorage.getItem('access_token');
+    if (!token || historyBeforeId === null || loadingOlderHistory) return;
+
+    loadingOlderHistory = true;
+    try {
+        const response = await fetch(`/api/history?before_id=${historyBeforeId}`, {
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+        const page = await response.json();
+
+        // Render the older messages, then move them above the current ones
+        // (keeping the scroll position on the message the user was reading)
+        const previousHeight = historyEl.scrollHeight;
+        const firstCurrent = historyEl.firstChild;
+        const start = historyEl.childNodes.length;
+        page.messages.forEach(msg => appendMessage(msg.role, msg.text, { speak: false }));
+        const added = Array.from(historyEl.childNodes).slice(start);
+        added.forEach(node => historyEl.insertBefore(node, firstCurrent));
+        historyEl.scrollTop = historyEl.scrollHeight - previousHeight;
+
+        historyBeforeId = page.has_more ? page.next_before_id : null;
+    } catch (error) {
+        console.error('Error loading older history:', error);
+    } finally {
+        loadingOlderHistory = false;
+    }
+}
+
 // Append message to history
 function sanitizeForDisplay(t) {
     if (!t) return '';
@@ -213,7 +330,7 @@ function createListFromText(text, lang) {
     return listEl.childElementCount ? listEl : null;
 }
 
-function appendMessage(role, text) {
+function appendMessage(role, text, options = {}) {
     const msgDiv = document.createElement('div');
     msgDiv.className = `message ${role}`;
     
@@ -255,8 +372,8 @@ function appendMessage(role, text) {
     // Scroll to bottom
     historyEl.scrollTop = historyEl.scrollHeight;
     
-    // Auto-speak assistant messages if Arabic is selected
-    if (role === 'assistant' && currentLanguage.startsWith('ar')) {
+    // Auto-speak assistant messages if Arabic is selected (not for older history pages)
+    if (role === 'assistant' && options.speak !== false && currentLanguage.startsWith('ar')) {
         speakText(text, currentLanguage);
     }
 }
@@ -292,8 +409,9 @@ async function sendMessage() {
                 'Content-Type': 'application/json',
                 'Authorization': `Bearer ${token}`
             },
-            body: JSON.stringify({ message })
+            body: JSON.stringify(lastInputWasVoice ? { message, page: 'voice' } : { message })
         });
+        lastInputWasVoice = false;
 
         console.log('📥 Response status:', response.status);
 
@@ -440,6 +558,7 @@ window.addEventListener('DOMContentLoaded', async () => {
             method: 'DELETE',
             headers: { 'Authorization': `Bearer ${token}` }
         });
+        dropHistoryCache();
         console.log('✅ History cleared');
     } catch (error) {
         console.error('⚠️ Error clearing history:', error);
@@ -449,6 +568,11 @@ window.addEventListener('DOMContentLoaded', async () => {
     
     // Initialize DOM elements
     historyEl = document.getElementById('history');
+    if (historyEl) {
+        historyEl.addEventListener('scroll', () => {
+            if (historyEl.scrollTop === 0) loadOlderHistory();
+        });
+    }
     messageEl = document.getElementById('message');
     sendBtn = document.getElementById('send');
     speechBtn = document.getElementById('speech');
@@ -470,6 +594,7 @@ window.addEventListener('DOMContentLoaded', async () => {
         recognition.onresult = (event) => {
             const transcript = event.results[0][0].transcript;
             messageEl.value = transcript;
+            lastInputWasVoice = true;
             speechBtn.textContent = '🎤';
         };
 
@@ -585,6 +710,9 @@ window.addEventListener('DOMContentLoaded', async () => {
             if (recognition) {
                 recognition.lang = currentLanguage;
             }
+            if (interviewSocket) {
+                interviewSocket.setLanguage(currentLanguage);
+            }
             
             // Update HTML direction for RTL/LTR
             const html = document.documentElement;
@@ -969,7 +1097,7 @@ window.addEventListener('DOMContentLoaded', async () => {
         setTimeout(() => {
             try {
                 recognition.continuous = false; // Only listen once per question
-                recognition.interimResults = false;
+                recognition.interimResults = true; // Stable interim text starts a speculative reply
                 recognition.lang = currentLanguage;
                 recognition.start();
                 console.log('🎧 ✅ Listening started for one answer (single mode)');
@@ -1035,6 +1163,22 @@ window.addEventListener('DOMContentLoaded', async () => {
         }
     }
 
+    // Send the interim transcript once it has stopped changing for a moment;
+    // the server starts generating the reply before the final result arrives
+    const INTERIM_STABLE_MS = 400;
+    let interimTimer = null;
+
+    function offerInterimTranscript(text) {
+        clearTimeout(interimTimer);
+        // Only free-chat turns go to the model, and not while a reply is still being spoken
+        if (['domain', 'jobtitle', 'followups'].includes(interviewPhase) || isSpeaking) return;
+        interimTimer = setTimeout(() => {
+            if (!interviewActive) return;
+            if (!interviewSocket) interviewSocket = new InterviewSocket(currentLanguage);
+            interviewSocket.interim(text.trim());
+        }, INTERIM_STABLE_MS);
+    }
+
     async function handleInterviewUtterance(text) {
         const spoken = text.trim();
         if (!spoken) return;
@@ -1193,101 +1337,97 @@ window.addEventListener('DOMContentLoaded', async () => {
         const payload = currentLanguage.startsWith('ar') ? (prefixAr + spoken) : (prefixEn + spoken);
 
         try {
-            const resp = await fetch('/api/chat', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                    'Authorization': `Bearer ${token}`
-                },
-                body: JSON.stringify({ message: payload })
-            });
+            // Stream the reply and speak each sentence as soon as it is complete,
+            // instead of waiting for the whole answer (removes dead air per turn).
+            let pendingUtterances = 0;
+            let streamFinished = false;
+            let spokeAnything = false;
+
+            const restartListeningIfIdle = () => {
+                if (!streamFinished || pendingUtterances > 0) return;
+                isSpeaking = false;
+                setSpeakingState(false);
+                setTimeout(() => {
+                    console.log('🔄 Attempting to restart listening... interviewActive:', interviewActive);
+                    if (interviewActive) {
+                        startLiveListening();
+                    }
+                }, 1000);
+            };
 
-            if (!resp.ok) {
-                const err = await resp.json().catch(() => ({}));
-                throw new Error(err.detail || ('HTTP ' + resp.status));
-            }
-            const data = await resp.json();
-            if (data.messages && data.messages.length) {
-                const assistantText = data.messages[0].text || '';
-                appendTranscript('assistant', assistantText);
-                
-                    // Speak the response and restart listening when done
-                    setSpeakingState(true);
-                    isSpeaking = true;
-                
+            const speakSentence = (sentence) => {
+                if (!('speechSynthesis' in window)) return;
+                const cleanText = sentence.replace(/\*\*(.*?)\*\*/g, '$1').replace(/\*(.*?)\*/g, '$1');
+                if (!cleanText.trim()) return;
+
+                if (!spokeAnything) {
                     // Stop recognition while speaking
                     if (recognition) {
                         try { recognition.stop(); } catch {}
                     }
-                
-                    // Create speech with custom callback to restart listening
-                    const cleanText = assistantText.replace(/\*\*(.*?)\*\*/g, '$1').replace(/\*(.*?)\*/g, '$1');
-                    if ('speechSynthesis' in window) {
-                        window.speechSynthesis.cancel();
-                    
-                        const utterance = new SpeechSynthesisUtterance(cleanText);
-                        utterance.lang = currentLanguage;
-                        utterance.rate = 0.85;
-                        utterance.pitch = 1;
-                        utterance.volume = 1;
-                    
-                        // Load Arabic voice
-                        let voices = window.speechSynthesis.getVoices();
-                        if (currentLanguage.startsWith('ar')) {
-                            const arabicVoice = voices.find(v => v.lang.startsWith('ar'));
-                            if (arabicVoice) utterance.voice = arabicVoice;
-                        }
-                    
-                        utterance.onstart = () => {
-                            isSpeaking = true;
-                            setSpeakingState(true);
-                            console.log('🗣️ AI speaking...');
-                        };
-                    
-                        utterance.onend = () => {
-                            console.log('✅ AI finished speaking');
-                            isSpeaking = false;
-                            setSpeakingState(false);
-                            
-                            // Restart listening after a short delay
-                            setTimeout(() => {
-                                console.log('🔄 Attempting to restart listening... interviewActive:', interviewActive);
-                                if (interviewActive) {
-                                    console.log('📢 Calling startLiveListening()');
-                                    startLiveListening();
-                                } else {
-                                    console.log('⚠️ Interview not active, skipping restart');
-                                }
-                            }, 1000); // Increased delay to 1 second
-                        };
-                    
-                        utterance.onerror = (event) => {
-                            console.error('❌ Speech error:', event.error);
-                            isSpeaking = false;
-                            setSpeakingState(false);
-                            
-                            // Always try to restart on error
-                            setTimeout(() => {
-                                console.log('🔄 Restarting after speech error...');
-                                if (interviewActive) {
-                                    startLiveListening();
-                                }
-                            }, 1000);
-                        };
-                    
-                        window.speechSynthesis.speak(utterance);
-                        interviewQuestion.textContent = '🗣️ جارٍ إلقاء الرد...';
-                        
-                        // Safety fallback: restart listening after 20 seconds if utterance callbacks don't fire
-                        setTimeout(() => {
-                            if (isSpeaking && interviewActive) {
-                                console.warn('⚠️ Safety timeout: TTS took too long, forcing restart');
-                                isSpeaking = false;
-                                setSpeakingState(false);
-                                startLiveListening();
-                            }
-                        }, 20000);
+                    window.speechSynthesis.cancel();
+                    spokeAnything = true;
+                    interviewQuestion.textContent = '🗣️ جارٍ إلقاء الرد...';
+                }
+
+                const utterance = new SpeechSynthesisUtterance(cleanText);
+                utterance.lang = currentLanguage;
+                utterance.rate = 0.85;
+                utterance.pitch = 1;
+                utterance.volume = 1;
+                let voices = window.speechSynthesis.getVoices();
+                if (currentLanguage.startsWith('ar')) {
+                    const arabicVoice = voices.find(v => v.lang.startsWith('ar'));
+                    if (arabicVoice) utterance.voice = arabicVoice;
+                }
+                utterance.onstart = () => {
+                    isSpeaking = true;
+                    setSpeakingState(true);
+                    console.log('🗣️ AI speaking...');
+                };
+                utterance.onend = () => {
+                    pendingUtterances -= 1;
+                    restartListeningIfIdle();
+                };
+                utterance.onerror = (event) => {
+                    console.error('❌ Speech error:', event.error);
+                    pendingUtterances -= 1;
+                    restartListeningIfIdle();
+                };
+                pendingUtterances += 1;
+                isSpeaking = true;
+                setSpeakingState(true);
+                // speechSynthesis queues utterances, so sentences play back-to-back
+                window.speechSynthesis.speak(utterance);
+            };
+
+            let assistantText;
+            try {
+                // One authenticated socket per interview; the server keeps the
+                // prompt and recent turns, so only the utterance is sent
+                if (!interviewSocket) interviewSocket = new InterviewSocket(currentLanguage);
+                assistantText = await interviewSocket.ask(spoken, { onSentence: speakSentence });
+            } catch (err) {
+                if (!err.transport) throw err;
+                console.warn('⚠️ Interview socket unavailable, falling back to HTTP streaming:', err.message);
+                assistantText = await streamChat(payload, { onSentence: speakSentence, page: 'voice' });
+            }
+            streamFinished = true;
+
+            if (assistantText) {
+                appendTranscript('assistant', assistantText);
+                if (!spokeAnything) {
+                    restartListeningIfIdle();
+                }
+                // Safety fallback: restart listening after 20 seconds if utterance callbacks don't fire
+                setTimeout(() => {
+                    if (isSpeaking && interviewActive) {
+                        console.warn('⚠️ Safety timeout: TTS took too long, forcing restart');
+                        isSpeaking = false;
+                        setSpeakingState(false);
+                        startLiveListening();
                     }
+                }, 20000);
             } else {
                 appendTranscript('system', '⚠️ لم يتم استلام رد من الخادم');
                 console.log('⚠️ No response from server, restarting listening...');
@@ -1315,9 +1455,11 @@ window.addEventListener('DOMContentLoaded', async () => {
             mediaStream = null;
         }
         
-        // Stop speech recognition
+        // Stop speech recognition (and go back to final-only results for the chat box)
+        clearTimeout(interimTimer);
         if (recognition) {
             try { recognition.stop(); } catch {}
+            recognition.interimResults = false;
         }
         
         // Stop any ongoing speech
@@ -1325,6 +1467,12 @@ window.addEventListener('DOMContentLoaded', async () => {
             window.speechSynthesis.cancel();
         }
         
+        // End the live interview session on the server
+        if (interviewSocket) {
+            interviewSocket.close();
+            interviewSocket = null;
+        }
+        
         // Hide modal
         videoModal.classList.remove('active');
         
@@ -1355,6 +1503,11 @@ window.addEventListener('DOMContentLoaded', async () => {
         recognition.onresult = (event) => {
             const transcript = event.results[0][0].transcript;
             if (interviewActive && videoModal && videoModal.classList.contains('active')) {
+                if (!event.results[0].isFinal) {
+                    offerInterimTranscript(transcript);
+                    return;
+                }
+                clearTimeout(interimTimer);
                 // In live mode: stop recognition to avoid duplicate triggers, then process
                 try { recognition.stop(); } catch {}
                 handleInterviewUtterance(transcript);
@@ -1637,6 +1790,240 @@ function extractJson(text) {
     return text; // fallback
 }
 
+// Stream a chat reply from /api/chat/stream (Server-Sent Events over fetch).
+// onToken receives each raw token, onSentence each completed sentence and
+// onItem each finished element of a JSON reply's "phases"/"questions" array.
+// page names the page of origin ('voice' puts the turn on the fast model tier).
+// Resolves with the full reply text once the server sends "done".
+async function streamChat(message, { onToken, onSentence, onItem, page } = {}) {
+    const token = localStorage.getItem('access_token');
+    if (!token) throw new Error('No token');
+
+    const resp = await fetch('/api/chat/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+            'Authorization': `Bearer ${token}`
+        },
+        body: JSON.stringify(page ? { message, page } : { message })
+    });
+    if (!resp.ok || !resp.body) {
+        const err = await resp.json().catch(() => ({}));
+        throw new Error(err.detail || ('HTTP ' + resp.status));
+    }
+
+    const reader = resp.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let fullText = '';
+
+    const handleFrame = (frame) => {
+        let event = 'message';
+        const dataLines = [];
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) event = line.slice(6).trim();
+            else if (line.startsWith('data:')) dataLines.push(line.slice(5).trim());
+        });
+        if (!dataLines.length) return;
+        let data = {};
+        try { data = JSON.parse(dataLines.join('\n')); } catch { return; }
+
+        if (event === 'token') {
+            fullText += data.text || '';
+            if (onToken) onToken(data.text || '');
+        } else if (event === 'sentence') {
+            if (onSentence) onSentence(data.text || '');
+        } else if (event === 'item') {
+            if (onItem) onItem(data.item, data.index, data.key);
+        } else if (event === 'done') {
+            fullText = data.text || fullText;
+        } else if (event === 'error') {
+            throw new Error(data.message || 'Stream error');
+        }
+    };
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true }).replace(/\r\n/g, '\n');
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) !== -1) {
+            const frame = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+            handleFrame(frame);
+        }
+    }
+    if (buffer.trim()) handleFrame(buffer);
+    return fullText;
+}
+
+// Live interview transport over WebSocket (/api/ws/interview).
+// Authenticates once, then each utterance is a single small frame and the
+// reply streams back as token / sentence / done frames. Every server frame
+// has a sequence number: after a dropped connection the socket reconnects
+// with session_id + last_seq and the server replays what was missed.
+// ask() rejects with err.transport = true if the socket cannot be opened,
+// so callers can fall back to streamChat().
+class InterviewSocket {
+    constructor(language, mode = 'free') {
+        this.language = language;
+        this.mode = mode;
+        this.ws = null;
+        this.sessionId = null;
+        this.lastSeq = 0;
+        this.nextTurn = 1;
+        this.pending = new Map(); // turn id -> { resolve, reject, text, onToken, onSentence }
+        this.opening = null;
+        this.closed = false;
+        this.retries = 0;
+    }
+
+    open() {
+        if (this.ws && this.ws.readyState === WebSocket.OPEN && !this.opening) return Promise.resolve();
+        if (this.opening) return this.opening;
+        this.opening = new Promise((resolve, reject) => {
+            const token = localStorage.getItem('access_token');
+            if (!token || !('WebSocket' in window)) {
+                this.opening = null;
+                return reject(Object.assign(new Error('WebSocket not available'), { transport: true }));
+            }
+            const scheme = window.location.protocol === 'https:' ? 'wss' : 'ws';
+            const ws = new WebSocket(`${scheme}://${window.location.host}/api/ws/interview`);
+            this.ws = ws;
+            let ready = false;
+
+            ws.onopen = () => {
+                // The token goes in the first frame, not the URL (kept out of access logs)
+                ws.send(JSON.stringify({
+                    type: 'auth', token, language: this.language, mode: this.mode,
+                    session_id: this.sessionId, last_seq: this.lastSeq
+                }));
+            };
+            ws.onmessage = (event) => {
+                let frame;
+                try { frame = JSON.parse(event.data); } catch { return; }
+                if (frame.type === 'ready') {
+                    ready = true;
+                    this.retries = 0;
+                    this.opening = null;
+                    if (this.sessionId && (!frame.resumed || frame.gap)) {
+                        // Old session expired or frames were lost: pending replies cannot be completed
+                        this.failPending(Object.assign(new Error('Interview session was reset'), { transport: true }));
+                        this.lastSeq = 0;
+                    }
+                    this.sessionId = frame.session_id;
+                    resolve();
+                    return;
+                }
+                this.handleFrame(frame);
+            };
+            ws.onclose = (event) => {
+                if (this.ws === ws) this.ws = null;
+                if (!ready) {
+                    this.opening = null;
+                    reject(Object.assign(new Error('Interview socket closed (' + event.code + ')'), { transport: true }));
+                }
+                this.reconnect(event.code);
+            };
+        });
+        return this.opening;
+    }
+
+    reconnect(code) {
+        // 4401: bad token, 4409: replaced by a newer socket
+        if (this.closed || code === 4401 || code === 4409) {
+            this.failPending(Object.assign(new Error('Interview socket closed'), { transport: true }));
+            return;
+        }
+        if (!this.sessionId && !this.pending.size) return;
+        if (this.retries >= 5) {
+            this.failPending(Object.assign(new Error('Interview socket lost'), { transport: true }));
+            return;
+        }
+        const delay = Math.min(8000, 500 * 2 ** this.retries);
+        this.retries += 1;
+        setTimeout(() => { this.open().catch(() => {}); }, delay);
+    }
+
+    handleFrame(frame) {
+        if (frame.seq) {
+            if (frame.seq <= this.lastSeq) return; // already seen before a reconnect
+            this.lastSeq = frame.seq;
+        }
+        if (frame.type === 'ping') {
+            this.send({ type: 'pong', t: frame.t });
+            return;
+        }
+        const turn = this.pending.get(frame.turn);
+        if (!turn) return;
+        if (frame.type === 'token') {
+            if (turn.onToken) turn.onToken(frame.text || '');
+        } else if (frame.type === 'sentence') {
+            if (turn.onSentence) turn.onSentence(frame.text || '');
+        } else if (frame.type === 'done') {
+            this.pending.delete(frame.turn);
+            turn.resolve(frame.text || '');
+        } else if (frame.type === 'error') {
+            this.pending.delete(frame.turn);
+            turn.reject(new Error(frame.message || 'Interview error'));
+        }
+    }
+
+    send(frame) {
+        if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+            this.ws.send(JSON.stringify(frame));
+            return true;
+        }
+        return false;
+    }
+
+    failPending(err) {
+        this.pending.forEach(turn => turn.reject(err));
+        this.pending.clear();
+    }
+
+    async ask(text, { onToken, onSentence } = {}) {
+        await this.open();
+        const turn = this.nextTurn++;
+        return new Promise((resolve, reject) => {
+            this.pending.set(turn, { resolve, reject, onToken, onSentence });
+            if (!this.send({ type: 'utterance', text, turn })) {
+                this.pending.delete(turn);
+                reject(Object.assign(new Error('Interview socket not open'), { transport: true }));
+            }
+        });
+    }
+
+    interim(text) {
+        if (!text) return;
+        this.open()
+            .then(() => this.send({ type: 'interim', text }))
+            .catch(() => {}); // speculation is best-effort
+    }
+
+    setLanguage(language) {
+        this.language = language;
+        this.send({ type: 'config', language });
+    }
+
+    close() {
+        this.closed = true;
+        this.failPending(new Error('Interview ended'));
+        if (this.send({ type: 'bye' })) return; // the server closes the socket
+        if (this.ws) this.ws.close();
+    }
+}
+
+// Tab closed or navigated away: say goodbye so the server frees the
+// session now instead of keeping it (and its replay buffer) until it expires
+window.addEventListener('pagehide', () => {
+    if (interviewSocket) {
+        interviewSocket.close();
+        interviewSocket = null;
+    }
+});
+
 // Add window load event to ensure scroll after everything is loaded
 window.addEventListener('load', () => {
     const forceScrollTop = () => {
@@ -0,0 +1,36 @@
+# backend/api/health.py
+"""
+Health endpoints for the load balancer / orchestrator.
+
+GET /healthz  liveness: the process is up and its event loop answers.
+              Never touches a dependency, so a slow provider cannot get a
+              healthy worker restarted.
+GET /readyz   readiness: 200 once the warm-up (services/warmup.py) has
+              finished and the database answers, 503 before that. The body
+              lists every dependency with its latency.
+"""
+
+import os
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from backend.services.warmup import warmup
+
+router = APIRouter(tags=["health"])
+
+STARTED_AT = time.time()
+
+
+@router.get("/healthz")
+def healthz():
+    return {"status": "ok", "pid": os.getpid(), "uptime_seconds": round(time.time() - STARTED_AT, 1)}
+
+
+@router.get("/readyz")
+async def readyz(request: Request):
+    ready, report = await warmup.readiness(request.app)
+    report["pid"] = os.getpid()
+    # Probes must not be cached by anything in between
+    return JSONResponse(report, status_code=200 if ready else 503, headers={"Cache-Control": "no-store"})
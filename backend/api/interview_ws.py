@@ -0,0 +1,322 @@
+# backend/api/interview_ws.py
+"""
+WebSocket transport for the live voice interview (/api/ws/interview).
+
+Protocol (JSON text frames):
+  client -> server
+    {"type": "auth", "token": JWT, "language": "ar-SA", "mode": "free"}      first frame
+    {"type": "auth", "token": JWT, "session_id": ..., "last_seq": n}          resume
+    {"type": "interim", "text": ...}                   stable interim transcript (speculation)
+    {"type": "utterance", "text": ..., "turn": id}     one recognized answer
+    {"type": "config", "language": ..., "mode": ...}   change session settings
+    {"type": "cancel"}                                 stop the reply in progress
+    {"type": "ping"} / {"type": "pong"}                heartbeats
+    {"type": "bye"}                                    end the session
+  server -> client
+    {"type": "ready", "session_id", "resumed", "gap", "seq", ...}
+    {"type": "start" | "token" | "sentence" | "done" | "error", "seq", ...}
+    {"type": "ping"} / {"type": "pong"}                (no seq, never replayed)
+
+The JWT is checked and the user looked up once per connection; the system
+prompt, the interview style instruction and the recent turns live in the
+session on the server, so an utterance costs one small frame. Interim
+transcripts start a speculative reply (services/speculation.py) that is
+served if the final transcript matches it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+
+from backend.api.routes import ARABIC_SYSTEM_PROMPT, ENGLISH_SYSTEM_PROMPT
+from backend.core.auth import decode_access_token
+from backend.core.config import settings
+from backend.core.lazy import lazy_import
+from backend.db.database import SessionLocal
+from backend.models.user import User
+from backend.services.admission import AdmissionRejected, admission
+from backend.services.history_store import history_store
+from backend.services.interview_sessions import InterviewSession, interview_sessions
+from backend.services.model_tiering import TierDecision, model_tiering
+from backend.services.speculation import speculative_prefetch
+from backend.services.streaming import SentenceSplitter
+
+# Imported when the first turn is built (see core/lazy.py)
+lc_messages = lazy_import("langchain_core.messages")
+
+router = APIRouter()
+
+INTERVIEW_CONVERSATION = "interview"
+
+# Close codes (4000-4999 are free for applications)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_SUPERSEDED = 4409
+
+
+def _authenticate(token: Optional[str]) -> Optional[User]:
+    """Decode the JWT and load the user (same checks as auth_routes.get_current_user)."""
+    payload = decode_access_token(token) if token else None
+    if not payload or payload.get("sub") is None:
+        return None
+    try:
+        user_id = int(payload["sub"])
+    except (TypeError, ValueError):
+        return None
+    db = SessionLocal()
+    try:
+        return db.query(User).filter(User.id == user_id).first()
+    finally:
+        db.close()
+
+
+def _system_prompt(session: InterviewSession) -> str:
+    base = ARABIC_SYSTEM_PROMPT if session.lang_code == "ar" else ENGLISH_SYSTEM_PROMPT
+    return f"{base}\n\n{session.style_prompt()}"
+
+
+def _prompt(session: InterviewSession, text: str) -> List[Any]:
+    messages: List[Any] = [lc_messages.SystemMessage(content=_system_prompt(session))]
+    for role, turn in session.turns:
+        messages.append(lc_messages.HumanMessage(content=turn) if role == "user" else lc_messages.AIMessage(content=turn))
+    messages.append(lc_messages.HumanMessage(content=text))
+    return messages
+
+
+def _save_turn(user_id: int, question: str, answer: str):
+    try:
+        history_store.append(user_id, "user", question, INTERVIEW_CONVERSATION)
+        if answer:
+            history_store.append(user_id, "assistant", answer, INTERVIEW_CONVERSATION)
+    except Exception as e:
+        print(f"[InterviewWS] ⚠️ Could not save turn for user {user_id}: {e}")
+
+
+def _tier_for(session: InterviewSession, text: str) -> TierDecision:
+    variant = "arabic" if session.lang_code == "ar" else "english"
+    return model_tiering.classify(text, variant, "voice")
+
+
+async def _generate(session: InterviewSession, llm_router, text: str, tier: TierDecision) -> AsyncIterator[str]:
+    """Reply tokens for text, given the session's prompt and recent turns."""
+    messages = _prompt(session, text)
+    async with admission.slot(session.user_id):
+        async for chunk in llm_router.astream(messages, models=tier.models, **tier.llm_kwargs()):
+            if chunk.content:
+                yield chunk.content
+
+
+def _speculate(session: InterviewSession, llm_router, text: str):
+    """Start (or keep) a speculative reply to an interim transcript."""
+    if llm_router is None or (session.task is not None and not session.task.done()):
+        # Not while a reply is still playing: the turns it adds would be missing from the prompt
+        return
+    session.speculation = speculative_prefetch.offer(
+        session.speculation, text, lambda t: _generate(session, llm_router, t, _tier_for(session, t))
+    )
+
+
+async def _run_turn(session: InterviewSession, llm_router, text: str, turn: Any):
+    """Generate one reply, streaming token / sentence frames into the session."""
+    speculation = speculative_prefetch.claim(session.speculation, text)
+    session.speculation = None
+    await session.send("start", turn=turn, speculative=speculation is not None)
+    if llm_router is None:
+        error_msg = "⚠️ AI features not available. Please configure OPENAI_API_KEY in .env file."
+        await session.send("error", turn=turn, message=error_msg)
+        return
+
+    tier = _tier_for(session, speculation.text if speculation else text)
+    splitter = SentenceSplitter()
+    parts: List[str] = []
+    try:
+        started = time.perf_counter()
+        # A matching speculation already has a head start; otherwise generate now
+        source = speculation.stream() if speculation else _generate(session, llm_router, text, tier)
+        async for token in source:
+            parts.append(token)
+            await session.send("token", turn=turn, text=token)
+            for sentence in splitter.feed(token):
+                await session.send("sentence", turn=turn, text=sentence)
+        for sentence in splitter.flush():
+            await session.send("sentence", turn=turn, text=sentence)
+        reply = "".join(parts)
+        model_tiering.record(tier, time.perf_counter() - started, reply)
+    except asyncio.CancelledError:
+        # Barge-in / cancel: keep the question, drop the half-spoken answer
+        if speculation:
+            speculation.cancel()
+        session.add_turn("user", text, interview_sessions.recent_turns)
+        raise
+    except AdmissionRejected as e:
+        await session.send("error", turn=turn, message=e.reason, retry_after=e.retry_after)
+        return
+    except Exception as e:
+        print(f"[InterviewWS] ❌ Reply failed for session {session.session_id}: {e}")
+        await session.send("error", turn=turn, message=f"❌ Error: {str(e)}")
+        return
+
+    session.add_turn("user", text, interview_sessions.recent_turns)
+    session.add_turn("assistant", reply, interview_sessions.recent_turns)
+    interview_sessions.turns += 1
+    await session.send("done", turn=turn, text=reply)
+    # Saved in the background: the turn is over (and the next one can speculate) once "done" is out
+    asyncio.get_running_loop().run_in_executor(None, _save_turn, session.user_id, text, reply)
+
+
+def _start_turn(session: InterviewSession, llm_router, text: str, turn: Any):
+    """A new utterance interrupts the reply in progress (the candidate talked over it)."""
+    if session.task is not None and not session.task.done():
+        session.task.cancel()
+    session.task = asyncio.get_running_loop().create_task(_run_turn(session, llm_router, text, turn))
+
+
+async def _handshake(websocket: WebSocket) -> Optional[InterviewSession]:
+    """Authenticate the first frame and create or resume the session."""
+    try:
+        raw = await asyncio.wait_for(websocket.receive_text(), timeout=settings.WS_IDLE_TIMEOUT_SECONDS)
+        hello = json.loads(raw)
+    except (asyncio.TimeoutError, ValueError, WebSocketDisconnect):
+        await _close(websocket, CLOSE_UNAUTHORIZED)
+        return None
+
+    user = await run_in_threadpool(_authenticate, hello.get("token")) if hello.get("type") == "auth" else None
+    if user is None:
+        print("[InterviewWS] ❌ Authentication failed")
+        await _close(websocket, CLOSE_UNAUTHORIZED)
+        return None
+
+    session = None
+    if hello.get("session_id"):
+        session = interview_sessions.resume(str(hello["session_id"]), user.id)
+    resumed = session is not None
+    if session is None:
+        session = interview_sessions.create(
+            user.id, user.username, str(hello.get("language") or "ar-SA"), str(hello.get("mode") or "free")
+        )
+
+    # Attach and replay under the send lock, so no live frame slips in between
+    async with session.send_lock:
+        previous = session.websocket
+        interview_sessions.attach(session, websocket)
+        frames, gap = session.frames_after(int(hello.get("last_seq") or 0)) if resumed else ([], False)
+        await websocket.send_text(json.dumps({
+            "type": "ready",
+            "session_id": session.session_id,
+            "resumed": resumed,
+            "gap": gap,  # frames were lost beyond the replay buffer
+            "seq": session.seq,
+            "language": session.language,
+            "mode": session.mode,
+            "heartbeat_seconds": settings.WS_HEARTBEAT_SECONDS,
+        }, ensure_ascii=False))
+        for frame in frames:
+            await websocket.send_text(frame)
+    if previous is not None and previous is not websocket:
+        # The same session reconnected before the old socket timed out
+        await _close(previous, CLOSE_SUPERSEDED)
+
+    action = f"resumed ({len(frames)} frames replayed)" if resumed else "started"
+    print(f"[InterviewWS] 🎙️ Session {session.session_id} {action} for user {user.username}")
+    return session
+
+
+async def _close(websocket: WebSocket, code: int):
+    try:
+        await websocket.close(code=code)
+    except Exception:
+        pass
+
+
+# Evicts sessions that were detached and never resumed (tab closed, network gone)
+_sweeper: Optional[asyncio.Task] = None
+
+
+async def _sweep_sessions():
+    interval = max(1.0, settings.WS_SESSION_TTL_SECONDS / 2)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            interview_sessions.sweep()
+        except Exception as e:
+            print(f"[InterviewWS] ⚠️ Session sweep failed: {e}")
+
+
+def start_session_sweeper():
+    """Start the periodic session sweep (from the app's startup event)."""
+    global _sweeper
+    if _sweeper is None or _sweeper.done():
+        _sweeper = asyncio.create_task(_sweep_sessions())
+
+
+def stop_session_sweeper():
+    """Cancel the periodic session sweep (from the app's shutdown event)."""
+    global _sweeper
+    if _sweeper is not None:
+        _sweeper.cancel()
+        _sweeper = None
+
+
+@router.websocket("/ws/interview")
+async def interview_socket(websocket: WebSocket):
+    """Live interview session: one authenticated socket, many utterances."""
+    await websocket.accept()
+    session = await _handshake(websocket)
+    if session is None:
+        return
+    llm_router = getattr(websocket.app.state, "llm_router", None)
+
+    try:
+        while True:
+            try:
+                raw = await asyncio.wait_for(websocket.receive_text(), timeout=settings.WS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if time.monotonic() - session.last_seen > settings.WS_IDLE_TIMEOUT_SECONDS:
+                    print(f"[InterviewWS] 💤 Session {session.session_id} idle, closing socket")
+                    await _close(websocket, 1001)
+                    return
+                await session.send("ping", replay=False, t=time.time())
+                continue
+
+            session.last_seen = time.monotonic()
+            try:
+                message: Dict[str, Any] = json.loads(raw)
+            except ValueError:
+                await session.send("error", replay=False, message="invalid JSON frame")
+                continue
+
+            kind = message.get("type")
+            if kind == "interim":
+                _speculate(session, llm_router, str(message.get("text") or ""))
+            elif kind == "utterance":
+                text = str(message.get("text") or "").strip()
+                if text:
+                    _start_turn(session, llm_router, text, message.get("turn"))
+            elif kind == "ping":
+                await session.send("pong", replay=False, t=message.get("t"))
+            elif kind == "pong":
+                pass
+            elif kind == "config":
+                session.language = str(message.get("language") or session.language)
+                session.mode = str(message.get("mode") or session.mode)
+                await session.send("config", language=session.language, mode=session.mode)
+            elif kind == "cancel":
+                if session.task is not None and not session.task.done():
+                    session.task.cancel()
+            elif kind == "bye":
+                interview_sessions.close(session)
+                await _close(websocket, 1000)
+                print(f"[InterviewWS] 👋 Session {session.session_id} ended")
+                return
+            else:
+                await session.send("error", replay=False, message=f"unknown frame type: {kind}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        # Keep the session (and any reply in progress) for a resume
+        interview_sessions.detach(session, websocket)
@@ -1,82 +1,68 @@
 # backend/api/routes.py
 from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
-from typing import Any, Dict, List
-from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from contextlib import AsyncExitStack
+import asyncio
+import time
 from backend.api.auth_routes import get_current_user
+from backend.core.config import settings
+from backend.core.lazy import lazy_import, stats as lazy_import_stats
+from backend.core.page_cache import etag_matches
 from backend.models.user import User
+from backend.services.admission import AdmissionRejected, admission
+from backend.services.conversation_memory import MemoryContext, Summarizer, conversation_memory
+from backend.services.history_store import DEFAULT_CONVERSATION, history_store
+from backend.services.interview_sessions import interview_sessions
+from backend.services.json_stream import JsonItemStreamer
+from backend.services.model_tiering import TierDecision, model_tiering, page_from_referer
+from backend.services.response_cache import normalize_message
+from backend.services.singleflight import SingleFlight, all_stats as singleflight_stats, make_key
+from backend.services.speculation import speculative_prefetch
+from backend.services.streaming import SentenceSplitter, format_sse
+
+# Imported on first use, not at startup (see core/lazy.py)
+httpx = lazy_import("httpx")
+lc_messages = lazy_import("langchain_core.messages")
 
 router = APIRouter()
 security = HTTPBearer()
 
 class ChatRequest(BaseModel):
     message: str
+    # Page of origin ("voice", "career-path", ...); defaults to the Referer path
+    page: Optional[str] = None
+    # Conversation to continue; defaults to the main chat (JSON page prompts: one per page)
+    conversation_id: Optional[str] = None
 
 class Message(BaseModel):
     role: str
     text: str
+    id: Optional[int] = None
 
 class ChatResponse(BaseModel):
     messages: List[Message]
 
-# Simple in-memory chat history (replace with database in production)
-chat_history = []
+class HistoryResponse(BaseModel):
+    messages: List[Message]
+    next_before_id: Optional[int] = None
+    has_more: bool = False
+    last_id: Optional[int] = None
+    version: int = 0
+    reset_version: int = 0
+
+# Coalesces identical /chat prompts that are in flight at the same time
+chat_singleflight = SingleFlight("chat")
 
-@router.post("/chat")
-def chat(
-    req: ChatRequest, 
-    request: Request,
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Chat endpoint that uses OpenAI for responses.
-    Requires authentication.
-    """
-    print(f"💬 Chat request from user: {current_user.username}")
-    print(f"📝 Message: {req.message[:100]}...")
-    
-    # Save user message
-    chat_history.append({
-        "role": "user",
-        "text": req.message,
-        "timestamp": datetime.utcnow().isoformat()
-    })
-    
-    # Try to use OpenAI client from app state
-    try:
-        from langchain_openai import ChatOpenAI
-        from langchain_core.messages import SystemMessage, HumanMessage
-        from backend.core.config import settings
-        
-        if not settings.is_openai_configured():
-            error_msg = "⚠️ AI features not available. Please configure OPENAI_API_KEY in .env file."
-            chat_history.append({
-                "role": "assistant",
-                "text": error_msg,
-                "timestamp": datetime.utcnow().isoformat()
-            })
-            return {
-                "response": error_msg,
-                "messages": [{"role": "assistant", "text": error_msg}]
-            }
-        
-        # Initialize OpenAI chat
-        chat_client = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.7,
-            openai_api_key=settings.OPENAI_API_KEY
-        )
-        
-        # Detect if the message is in Arabic
-        has_arabic = any('\u0600' <= char <= '\u06FF' for char in req.message)
-        
-        # Check if JSON format is requested
-        needs_json = 'JSON' in req.message or 'json' in req.message or '"phases"' in req.message or '"questions"' in req.message
-        
-        # Bilingual system message
-        if needs_json:
-            system_content = """You are AskTech AI Assistant. When user requests JSON format, you MUST respond with ONLY valid JSON, nothing else.
+
+# =====================================================
+# SYSTEM PROMPTS
+# =====================================================
+JSON_SYSTEM_PROMPT = """You are AskTech AI Assistant. When user requests JSON format, you MUST respond with ONLY valid JSON, nothing else.
 
 CRITICAL RULES for JSON responses:
 1. Return ONLY valid JSON - no explanations before or after
@@ -105,8 +91,8 @@ For interview questions, use:
 }
 
 For other requests without JSON requirement, respond normally in Arabic in a friendly, concise manner."""
-        elif has_arabic:
-            system_content = """أنت AskTech، مساعد شغل صاحبك. اتكلم عامي زي الناس، مش رسمي خالص.
+
+ARABIC_SYSTEM_PROMPT = """أنت AskTech، مساعد شغل صاحبك. اتكلم عامي زي الناس، مش رسمي خالص.
 
 القواعد المهمة جداً:
 - الرد كله ميزيدش عن 3 جمل بس! ممنوع تزيد.
@@ -128,30 +114,165 @@ For other requests without JSON requirement, respond normally in Arabic in a fri
 
 **مهم جداً: الرد كله = 3 جمل فقط، مش أكتر!**
 """
-        else:
-            system_content = """You are AskTech, an AI career assistant helping users with:
+
+ENGLISH_SYSTEM_PROMPT = """You are AskTech, an AI career assistant helping users with:
 - Job skills development
 - Interview preparation
 - Career advice and guidance
 - Career path selection
 
 Be helpful, concise, and professional. Always respond in English when the user speaks English."""
+
+
+def select_system_prompt(message: str) -> Tuple[str, str]:
+    """
+    Return (variant, system_prompt) for a user message.
+    variant is one of "json", "arabic" or "english".
+    """
+    # Check if JSON format is requested
+    needs_json = 'JSON' in message or 'json' in message or '"phases"' in message or '"questions"' in message
+    if needs_json:
+        return "json", JSON_SYSTEM_PROMPT
+
+    # Detect if the message is in Arabic
+    has_arabic = any('\u0600' <= char <= '\u06FF' for char in message)
+    if has_arabic:
+        return "arabic", ARABIC_SYSTEM_PROMPT
+    return "english", ENGLISH_SYSTEM_PROMPT
+
+
+async def _append_history(user_id: Any, conversation_id: str, role: str, text: str):
+    """Persist a message to the user's history (errors are stored with role "system")."""
+    await run_in_threadpool(history_store.append, user_id, role, text, conversation_id)
+
+
+def _page_of_origin(req: ChatRequest, request: Request) -> Optional[str]:
+    return req.page or page_from_referer(request.headers.get("referer"))
+
+
+def _conversation_for(req: ChatRequest, variant: str, page: Optional[str]) -> str:
+    """Main chat turns share one conversation; each page's JSON prompts get their own."""
+    if req.conversation_id:
+        return req.conversation_id
+    if variant == "json":
+        return f"page:{page or 'unknown'}"
+    return DEFAULT_CONVERSATION
+
+
+def _get_llm_router(request: Request):
+    """Return the LLM router created at startup, or None if no provider is configured."""
+    return getattr(request.app.state, "llm_router", None)
+
+
+async def _load_memory(user_id: Any, variant: str, conversation_id: str) -> MemoryContext:
+    """Per-user conversation memory; JSON-mode page prompts are one-shot and skip it."""
+    if variant == "json":
+        return MemoryContext()
+    return await run_in_threadpool(conversation_memory.load, user_id, conversation_id)
+
+
+def _memory_summarizer(llm_router, user_id: Any) -> Summarizer:
+    """Background summary updates run on the fast tier, in their own admission queue."""
+    tier = model_tiering.for_tier("fast", "conversation summary")
+
+    async def summarize(messages) -> str:
+        async with admission.slot(f"memory:{user_id}"):
+            response = await llm_router.ainvoke(
+                messages, models=tier.models, max_tokens=settings.MEMORY_SUMMARY_MAX_TOKENS
+            )
+        return response.content
+
+    return summarize
+
+
+def _schedule_summary(llm_router, user_id: Any, variant: str, conversation_id: str):
+    """Fold older turns of the conversation into its summary, if due (background)."""
+    if variant != "json":
+        conversation_memory.schedule_summary(user_id, _memory_summarizer(llm_router, user_id), conversation_id)
+
+
+def _classify_tier(req: ChatRequest, variant: str, page: Optional[str]) -> TierDecision:
+    """Pick the model tier / max_tokens budget for this request."""
+    return model_tiering.classify(req.message, variant, page)
+
+
+@router.post("/chat")
+async def chat(
+    req: ChatRequest, 
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Chat endpoint that uses OpenAI for responses.
+    Requires authentication.
+    """
+    print(f"💬 Chat request from user: {current_user.username}")
+    print(f"📝 Message: {req.message[:100]}...")
+    
+    # Pick the system prompt variant (JSON / Arabic / English) and the conversation
+    variant, system_content = select_system_prompt(req.message)
+    page = _page_of_origin(req, request)
+    conversation_id = _conversation_for(req, variant, page)
+    
+    # Rolling summary + recent turns of this user's conversation (before this message)
+    memory = await _load_memory(current_user.id, variant, conversation_id)
+    
+    # Save user message
+    await _append_history(current_user.id, conversation_id, "user", req.message)
+    
+    # Use the provider router (pooled clients) from app state
+    try:
+        llm_router = _get_llm_router(request)
+        if llm_router is None:
+            error_msg = "⚠️ AI features not available. Please configure OPENAI_API_KEY in .env file."
+            await _append_history(current_user.id, conversation_id, "system", error_msg)
+            return {
+                "response": error_msg,
+                "messages": [{"role": "assistant", "text": error_msg}]
+            }
         
-        messages = [
-            SystemMessage(content=system_content),
-            HumanMessage(content=req.message)
-        ]
-        
-        # Get response from OpenAI
-        response = chat_client.invoke(messages)
-        assistant_msg = response.content
+        # Serve repeated / near-identical templated prompts from the cache
+        # (not when the answer depends on the user's own conversation)
+        cache = getattr(request.app.state, "response_cache", None) if memory.empty else None
+        lookup = await cache.aget(variant, req.message, page) if cache else None
+        if lookup is not None and lookup.hit:
+            assistant_msg = lookup.response
+            print(f"⚡ Cache hit ({variant}, similarity={lookup.similarity:.3f})")
+        else:
+            messages = [
+                lc_messages.SystemMessage(content=system_content),
+                *memory.messages(),
+                lc_messages.HumanMessage(content=req.message)
+            ]
+            # Voice turns go to a faster model, JSON gets a bigger budget
+            tier = _classify_tier(req, variant, page)
+            
+            async def _complete() -> str:
+                # Only the single-flight leader takes an LLM slot; followers just wait.
+                # If the leader's user is rejected, followers run _complete themselves
+                # (with their own slot) instead of getting a 429 that is not theirs.
+                async with admission.slot(current_user.id):
+                    # Get response from the fastest healthy provider
+                    started = time.perf_counter()
+                    response = await llm_router.ainvoke(messages, models=tier.models, **tier.llm_kwargs())
+                model_tiering.record(
+                    tier, time.perf_counter() - started, response.content,
+                    getattr(response, "usage_metadata", None),
+                )
+                if cache:
+                    await cache.aset(variant, req.message, response.content, vector=lookup.vector, page=page)
+                return response.content
+            
+            if memory.empty:
+                # Identical prompts already in flight share one upstream call
+                flight_key = make_key(variant, tier.tier, normalize_message(req.message))
+                assistant_msg = await chat_singleflight.do(flight_key, _complete, retry_on=(AdmissionRejected,))
+            else:
+                assistant_msg = await _complete()
         
         # Save assistant response
-        chat_history.append({
-            "role": "assistant",
-            "text": assistant_msg,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        await _append_history(current_user.id, conversation_id, "assistant", assistant_msg)
+        _schedule_summary(llm_router, current_user.id, variant, conversation_id)
         
         print(f"✅ Response generated: {assistant_msg[:100]}...")
         
@@ -161,49 +282,260 @@ Be helpful, concise, and professional. Always respond in English when the user s
             "messages": [{"role": "assistant", "text": assistant_msg}]  # Legacy format
         }
         
+    except AdmissionRejected:
+        # Answered as 429 + Retry-After by the app's exception handler
+        raise
     except Exception as e:
         print(f"❌ Chat error: {e}")
         import traceback
         traceback.print_exc()
         error_msg = f"❌ Error: {str(e)}"
-        chat_history.append({
-            "role": "assistant",
-            "text": error_msg,
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        await _append_history(current_user.id, conversation_id, "system", error_msg)
         return {
             "response": error_msg,
             "messages": [{"role": "assistant", "text": error_msg}]
         }
 
-@router.get("/history")
-def get_history(current_user: User = Depends(get_current_user)):
+async def _stream_tokens(llm, messages, **kwargs) -> AsyncIterator[str]:
+    """Yield non-empty text chunks from a streaming chat completion."""
+    async for chunk in llm.astream(messages, **kwargs):
+        if chunk.content:
+            yield chunk.content
+
+
+async def _replay_text(text: str) -> AsyncIterator[str]:
+    """Replay an already complete reply (e.g. a cache hit) as a single token."""
+    yield text
+
+
+@router.post("/chat/stream")
+async def chat_stream(
+    req: ChatRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
     """
-    Return chat history. Requires authentication.
+    Streaming variant of /chat (Server-Sent Events).
+    Emits "token" events as the model generates, "sentence" events at each
+    sentence boundary (so the browser TTS can start early) and a final "done"
+    event with the full text. JSON-mode replies get "item" events instead of
+    sentences: one per completed element of the "phases" / "questions" array,
+    so pages can render them while the rest is still generating.
+    Requires authentication.
     """
-    print(f"📜 History request from user: {current_user.username}")
-    print(f"📊 Total messages in history: {len(chat_history)}")
-    return [Message(role=msg["role"], text=msg["text"]) for msg in chat_history]
+    print(f"💬 Streaming chat request from user: {current_user.username}")
+    print(f"📝 Message: {req.message[:100]}...")
+
+    llm_router = _get_llm_router(request)
+    variant, system_content = select_system_prompt(req.message)
+    page = _page_of_origin(req, request)
+    conversation_id = _conversation_for(req, variant, page)
+    tier = _classify_tier(req, variant, page)
+
+    # Memory, cache lookup and LLM admission happen before the response starts, so a
+    # full queue is still answered with a real 429 instead of an SSE error
+    memory = MemoryContext()
+    cache = None
+    lookup = None
+    slot = AsyncExitStack()
+    if llm_router is not None:
+        memory = await _load_memory(current_user.id, variant, conversation_id)
+        if memory.empty:
+            cache = getattr(request.app.state, "response_cache", None)
+        lookup = await cache.aget(variant, req.message, page) if cache else None
+        if lookup is None or not lookup.hit:
+            await slot.enter_async_context(admission.slot(current_user.id))
+
+    await _append_history(current_user.id, conversation_id, "user", req.message)
+
+    async def event_stream() -> AsyncIterator[str]:
+        if llm_router is None:
+            error_msg = "⚠️ AI features not available. Please configure OPENAI_API_KEY in .env file."
+            await _append_history(current_user.id, conversation_id, "system", error_msg)
+            yield format_sse("error", {"message": error_msg})
+            yield format_sse("done", {"text": error_msg})
+            return
+
+        yield format_sse("start", {"variant": variant})
+
+        messages = [
+            lc_messages.SystemMessage(content=system_content),
+            *memory.messages(),
+            lc_messages.HumanMessage(content=req.message)
+        ]
+
+        splitter = SentenceSplitter()
+        items = JsonItemStreamer() if variant == "json" else None
+        parts: List[str] = []
+        assistant_msg = ""
+        saved = False
+        try:
+            # A cached reply is replayed through the same event pipeline
+            cached = lookup is not None and lookup.hit
+            started = time.perf_counter()
+            if cached:
+                token_source = _replay_text(lookup.response)
+            else:
+                token_source = _stream_tokens(llm_router, messages, models=tier.models, **tier.llm_kwargs())
+
+            async for token in token_source:
+                parts.append(token)
+                yield format_sse("token", {"text": token})
+                if items is not None:
+                    # JSON answers: emit each finished phase / question
+                    for key, index, item in items.feed(token):
+                        yield format_sse("item", {"key": key, "index": index, "item": item})
+                else:
+                    for sentence in splitter.feed(token):
+                        yield format_sse("sentence", {"text": sentence})
+            if items is None:
+                for sentence in splitter.flush():
+                    yield format_sse("sentence", {"text": sentence})
+            assistant_msg = "".join(parts)
+            if not cached:
+                model_tiering.record(tier, time.perf_counter() - started, assistant_msg)
+            if cache and not cached and assistant_msg:
+                await cache.aset(variant, req.message, assistant_msg, vector=lookup.vector, page=page)
+            if assistant_msg:
+                await _append_history(current_user.id, conversation_id, "assistant", assistant_msg)
+                saved = True
+                _schedule_summary(llm_router, current_user.id, variant, conversation_id)
+            yield format_sse("done", {"text": assistant_msg, "cached": cached})
+            print(f"✅ Streamed response: {assistant_msg[:100]}...")
+        except Exception as e:
+            print(f"❌ Streaming chat error: {e}")
+            assistant_msg = f"❌ Error: {str(e)}"
+            yield format_sse("error", {"message": assistant_msg})
+        finally:
+            # Free the LLM slot as soon as generation is over
+            await slot.aclose()
+            # Persist whatever was produced, even if the client went away mid-stream
+            # (shielded: the write finishes in its thread even if the request is torn down)
+            if not saved and (parts or assistant_msg):
+                role = "assistant" if parts else "system"
+                await asyncio.shield(
+                    _append_history(current_user.id, conversation_id, role, "".join(parts) or assistant_msg)
+                )
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Safety net if the stream never starts; closing twice is a no-op
+        background=BackgroundTask(slot.aclose),
+    )
+
+@router.get("/metrics")
+def get_metrics(request: Request):
+    """
+    Return runtime counters for the chat pipeline (cache hit/miss,
+    collapsed single-flight calls, ...).
+    """
+    metrics: Dict[str, Any] = {}
+    cache = getattr(request.app.state, "response_cache", None)
+    if cache is not None:
+        metrics["response_cache"] = cache.stats()
+    metrics["singleflight"] = singleflight_stats()
+    metrics["admission"] = admission.stats()
+    page_cache = getattr(request.app.state, "page_cache", None)
+    if page_cache is not None:
+        metrics["page_cache"] = page_cache.stats()
+    metrics["model_tiers"] = model_tiering.stats()
+    metrics["conversation_memory"] = conversation_memory.stats()
+    metrics["interview_sessions"] = interview_sessions.stats()
+    metrics["speculation"] = speculative_prefetch.stats()
+    metrics["lazy_imports"] = lazy_import_stats()
+    llm_router = _get_llm_router(request)
+    if llm_router is not None:
+        metrics["llm_router"] = llm_router.stats()
+    rag = getattr(request.app.state, "rag_manager", None)
+    if rag is not None:
+        metrics["rag"] = rag.stats()
+    return metrics
+
+def _history_etag(version: int, conversation_id: str, before_id: Optional[int], limit: Optional[int]) -> str:
+    """
+    ETag of the caller's history state. Latest-page and since_id requests
+    share it (same version = nothing new to fetch); older pages are keyed
+    by their cursor too. The page size is always part of it: a 304 must not
+    hand a 20-message page to a client that asked for 50.
+    """
+    tag = f"v{version}-{conversation_id}-l{limit or ''}"
+    if before_id is not None:
+        tag += f"-b{before_id}"
+    return f'W/"{tag}"'
+
+
+@router.get("/history", response_model=HistoryResponse)
+def get_history(
+    request: Request,
+    before_id: Optional[int] = None,
+    since_id: Optional[int] = None,
+    limit: Optional[int] = None,
+    conversation_id: str = DEFAULT_CONVERSATION,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Return the caller's chat history, newest page first (messages within a
+    page are oldest first). Pass next_before_id back as before_id to get the
+    previous page; limit defaults to HISTORY_PAGE_SIZE.
+
+    Incremental sync: since_id returns only messages newer than that id
+    (has_more = even newer ones did not fit). Responses carry an ETag built
+    from the user's history version; send it back in If-None-Match to get
+    304 Not Modified when nothing changed. reset_version changes whenever
+    the history is cleared, which invalidates any client-side cache.
+    Requires authentication.
+    """
+    version, reset_version = history_store.version(current_user.id)
+    etag = _history_etag(version, conversation_id, before_id, limit)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if since_id is not None:
+        page = history_store.since(current_user.id, conversation_id, since_id=since_id, limit=limit)
+    else:
+        page = history_store.page(current_user.id, conversation_id, before_id=before_id, limit=limit)
+    print(f"📜 History request from user: {current_user.username} ({len(page.messages)} messages)")
+    body = HistoryResponse(
+        messages=[Message(role=msg["role"], text=msg["text"], id=msg["id"]) for msg in page.messages],
+        next_before_id=page.next_before_id,
+        has_more=page.has_more,
+        last_id=page.last_id,
+        version=version,
+        reset_version=reset_version,
+    )
+    return JSONResponse(content=body.model_dump(), headers=headers)
 
 @router.delete("/history")
-def clear_history(current_user: User = Depends(get_current_user)):
+def clear_history(
+    conversation_id: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
     """
-    Clear chat history. Requires authentication.
+    Clear the caller's chat history (one conversation, or all of them) and
+    its conversation memory. Requires authentication.
     """
-    global chat_history
     print(f"🗑️ Clearing chat history for user: {current_user.username}")
-    chat_history.clear()
-    print(f"✅ Chat history cleared. Current count: {len(chat_history)}")
-    return {"message": "Chat history cleared successfully", "count": 0}
+    deleted = conversation_memory.clear(current_user.id, conversation_id)
+    print(f"✅ Chat history cleared. Deleted messages: {deleted}")
+    return {"message": "Chat history cleared successfully", "count": 0, "deleted": deleted}
 
 @router.post("/nim_chat")
-def nim_chat(req: ChatRequest, request: Request):
+async def nim_chat(req: ChatRequest, request: Request):
     """
     Forward a simple chat message to NVIDIA NIM chat/completions endpoint and return the JSON result.
-    Uses the nim client stored on request.app.state by backend.app startup.
+    Uses the pooled "nvidia" client from app.state.llm_pool, falling back to the
+    legacy sync nim client set up by the NIM app variants.
     """
-    nim = getattr(request.app.state, "nim_client", None)
-    model = getattr(request.app.state, "nim_model", None)
+    pool = getattr(request.app.state, "llm_pool", None)
+    if pool is not None and pool.has("nvidia"):
+        nim = pool.http("nvidia")
+        model = pool.model("nvidia")
+    else:
+        nim = getattr(request.app.state, "nim_client", None)
+        model = getattr(request.app.state, "nim_model", None)
     if nim is None or model is None:
         raise HTTPException(status_code=503, detail="NIM client not configured on server")
 
@@ -218,16 +550,22 @@ def nim_chat(req: ChatRequest, request: Request):
         "temperature": 0.7,
         "stream": False
     }
-'''
+    # Unauthenticated endpoint: queue fairly per client address
+    client_key = f"ip:{request.client.host}" if request.client else "anonymous"
     try:
-        resp = nim.post("/chat/completions", json=payload)
+        async with admission.slot(client_key):
+            if isinstance(nim, httpx.AsyncClient):
+                resp = await nim.post("/chat/completions", json=payload)
+            else:
+                resp = await run_in_threadpool(nim.post, "/chat/completions", json=payload)
         resp.raise_for_status()
         return resp.json()
+    except AdmissionRejected:
+        raise
     except Exception as e:
         # Log and surface provider error as 502
         print("[/api/nim_chat] NIM request failed:", e)
-        # you can also log resp.text here if resp exists
         raise HTTPException(status_code=502, detail=f"NIM request failed: {e}")
-'''
+
 # NOTE: The authenticated OpenAI-based /chat endpoint is defined above.
 # The NIM chat endpoint remains available separately at /api/nim_chat.
@@ -1,19 +1,34 @@
 
 
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+import asyncio
 import os
 import traceback
 from fastapi.staticfiles import StaticFiles
 from backend.api.routes import router as api_router
 from backend.api.auth_routes import router as auth_router
+from backend.api.health import router as health_router
+from backend.api.interview_ws import router as interview_ws_router, start_session_sweeper, stop_session_sweeper
 from backend.api.user_stats import router as user_stats_router
+from backend.core.assets import asset_url, router as assets_router
+from backend.core.compression import CompressionMiddleware
 from backend.core.config import settings
+from backend.core.page_cache import Page, PageCache
 from backend.db.database import init_db
+from backend.services.admission import AdmissionRejected, admission_rejected_handler
+from backend.services.conversation_memory import conversation_memory
+from backend.services.history_store import history_store
+from backend.services.warmup import warmup
 
 app = FastAPI(title="AskTech - Dev Scaffold")
+# LLM admission control rejections -> 429 + Retry-After
+app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
+# zstd / brotli / gzip per Accept-Encoding (HTML, JSON, JS, CSS, streams)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 BASE = Path(__file__).resolve().parent
 STATIC_DIR = BASE / "Static"
 TEMPLATES_DIR = BASE / "Templates"
@@ -21,6 +36,12 @@ STATIC_DIR.mkdir(parents=True, exist_ok=True)
 TEMPLATES_DIR.mkdir(parents=True, exist_ok=True)
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# {{ asset_url('app.js') }} -> content-hashed, immutable /assets/ URL
+templates.env.globals["asset_url"] = asset_url
+# Rendered HTML pages (see PAGES below)
+page_cache = PageCache(templates, check_mtime=settings.PAGE_CACHE_CHECK_MTIME)
+app.state.page_cache = page_cache
+app.include_router(assets_router)
 '''
 # Video Interview page
 @app.get(
@@ -34,17 +55,16 @@ def video_interview_page(request: Request):
         {"request": request}
     )
 '''
-# Video Interview page
-@app.get("/video-interview", response_class=HTMLResponse)
-def video_interview_page(request: Request):
-    return templates.TemplateResponse("video-interview.html", {"request": request})
 
 
 
 # Include API routers (your routes under /api)
 app.include_router(api_router, prefix="/api")
+app.include_router(interview_ws_router, prefix="/api")
 app.include_router(auth_router)
 app.include_router(user_stats_router)
+# /healthz (liveness) and /readyz (readiness, gated on the warm-up below)
+app.include_router(health_router)
 
 
 # Startup / Shutdown lifecycle (initialize expensive clients here)
@@ -56,10 +76,35 @@ async def startup_event():
     """
     # Initialize database
     init_db()
+    history_store.init_db()
+    conversation_memory.init_db()
+
+    # Evict interview sessions whose socket went away and never resumed
+    start_session_sweeper()
     
     # Always initialize to None first
     app.state.embeddings = None
     app.state.rag_manager = None
+    app.state.llm_pool = None
+    app.state.llm_router = None
+
+    # One long-lived async LLM client per provider (pooled connections),
+    # fronted by a latency-aware router that hedges slow requests
+    try:
+        from backend.services.llm_clients import LLMClientPool
+        from backend.services.llm_router import LLMRouter
+        app.state.llm_pool = LLMClientPool.from_settings(settings)
+        if app.state.llm_pool.providers:
+            app.state.llm_router = LLMRouter.from_pool(app.state.llm_pool, settings)
+    except Exception as e:
+        print(f"[Startup] ❌ Error initializing LLM client pool: {e}")
+        traceback.print_exc()
+
+    # Semantic response cache (embeddings are attached below once available)
+    app.state.response_cache = None
+    if settings.CHAT_CACHE_ENABLED:
+        from backend.services.response_cache import SemanticResponseCache
+        app.state.response_cache = SemanticResponseCache.from_settings(settings)
     
     # Open browser after a short delay (redirect to login page)
     import sys
@@ -81,18 +126,17 @@ async def startup_event():
     
     try:
         # lazy imports (so import-time doesn't attempt API calls)
-        from langchain_openai import OpenAIEmbeddings
+        from backend.services.llm_clients import build_embeddings
         from backend.services.rag_manager import RAGManager
-        from pydantic import SecretStr
 
         print(f"[Startup] 🔧 Initializing OpenAI embeddings...")
         
         # initialize and attach to app.state
-        # At this point we know OPENAI_API_KEY is not None due to the check above
-        api_key = settings.OPENAI_API_KEY
-        if api_key is None:
-            raise ValueError("OPENAI_API_KEY should not be None at this point")
-        app.state.embeddings = OpenAIEmbeddings(api_key=SecretStr(api_key))
+        if settings.MOCK_LLM_URL:
+            print(f"[Startup] 🧪 Using mock LLM server at {settings.MOCK_LLM_URL}")
+        app.state.embeddings = build_embeddings(settings)
+        if app.state.response_cache is not None:
+            app.state.response_cache.embeddings = app.state.embeddings
         
         # Initialize RAG manager with skip_initial_index flag to avoid startup hang
         print("[Startup] 📚 Initializing RAG manager (without initial indexing)...")
@@ -113,8 +157,33 @@ async def startup_event():
         app.state.rag_manager = None
 
 
+@app.on_event("startup")
+async def warmup_event():
+    """
+    Warm the worker up (index, provider connections, templates, tokenizer,
+    a synthetic embedding) before /readyz reports it ready. Runs after
+    startup_event, once app.state is filled in.
+    """
+    run = warmup.run(app, page_templates={page.template for page in PAGES})
+    if settings.WARMUP_BLOCKING:
+        await run
+    else:
+        # Serve /healthz (and 503 on /readyz) meanwhile
+        app.state.warmup_task = asyncio.create_task(run)
+
+
 @app.on_event("shutdown")
-def shutdown_event():
+async def shutdown_event():
+    stop_session_sweeper()
+
+    pool = getattr(app.state, "llm_pool", None)
+    if pool:
+        try:
+            await pool.aclose()
+            print("[Shutdown] LLM client pool closed.")
+        except Exception as e:
+            print(f"[Shutdown] Error closing LLM client pool: {e}")
+
     rag = getattr(app.state, "rag_manager", None)
     if rag:
         try:
@@ -124,125 +193,43 @@ def shutdown_event():
             print(f"[Shutdown] Error shutting down RAGManager: {e}")
 
 
-# Welcome/Landing page - public page with Sign In/Sign Up buttons
-@app.get("/", response_class=HTMLResponse)
-def welcome(request: Request):
-    welcome_file = TEMPLATES_DIR / "welcome.html"
-    if welcome_file.exists():
-        return templates.TemplateResponse("welcome.html", {"request": request})
-    # Fallback to login if welcome page doesn't exist
-    return RedirectResponse(url="/login")
-
-# Main authenticated page - serves the main app with all services
-@app.get("/home", response_class=HTMLResponse)
-def home(request: Request):
-    index_file = TEMPLATES_DIR / "index.html"
-    if index_file.exists():
-        return templates.TemplateResponse("index.html", {"request": request})
-    # Fallback to login if index page doesn't exist
-    return RedirectResponse(url="/login")
-
-# Login page
-@app.get("/login", response_class=HTMLResponse)
-def login_page(request: Request):
-    login_file = TEMPLATES_DIR / "login.html"
-    if login_file.exists():
-        return templates.TemplateResponse("login.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Login page not found</h2></body></html>"
-    )
-
-# Register page
-@app.get("/register", response_class=HTMLResponse)
-def register_page(request: Request):
-    register_file = TEMPLATES_DIR / "register.html"
-    if register_file.exists():
-        return templates.TemplateResponse("register.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Register page not found</h2></body></html>"
-    )
-
-# Chat page (protected - JS will check authentication)
-@app.get("/chat", response_class=HTMLResponse)
-def chat_page(request: Request):
-    index_file = TEMPLATES_DIR / "index.html"
-    if index_file.exists():
-        return templates.TemplateResponse("index.html", {"request": request})
-    return HTMLResponse(
+# =====================================================
+# HTML PAGES
+# =====================================================
+# One route per page, all served from the rendered-page cache
+# (rendered once, ETag / 304, re-rendered on template change)
+PAGES = [
+    # Welcome/Landing page - public page with Sign In/Sign Up buttons
+    Page("/", "welcome", "welcome.html", redirect_if_missing="/login"),
+    # Main authenticated page - serves the main app with all services
+    Page("/home", "home", "index.html", redirect_if_missing="/login"),
+    Page("/login", "login_page", "login.html", missing_html="<html><body><h2>Login page not found</h2></body></html>"),
+    Page("/register", "register_page", "register.html", missing_html="<html><body><h2>Register page not found</h2></body></html>"),
+    # Chat page (protected - JS will check authentication)
+    Page("/chat", "chat_page", "index.html", missing_html=(
         "<html><body><h2>Chat UI not found</h2>"
         '<p>Create <code>backend/templates/index.html</code> and restart the server.</p>'
         "</body></html>"
-    )
-
-# Interview Preparation page
-@app.get("/interview", response_class=HTMLResponse)
-def interview_page(request: Request):
-    interview_file = TEMPLATES_DIR / "interview.html"
-    if interview_file.exists():
-        return templates.TemplateResponse("interview.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Interview page not found</h2></body></html>"
-    )
-
-# Job Requirements page
-@app.get("/requirements", response_class=HTMLResponse)
-def requirements_page(request: Request):
-    requirements_file = TEMPLATES_DIR / "requirements.html"
-    if requirements_file.exists():
-        return templates.TemplateResponse("requirements.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Requirements page not found</h2></body></html>"
-    )
-
-# Top Jobs page
-@app.get("/top-jobs", response_class=HTMLResponse)
-def top_jobs_page(request: Request):
-    top_jobs_file = TEMPLATES_DIR / "top-jobs.html"
-    if top_jobs_file.exists():
-        return templates.TemplateResponse("top-jobs.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Top Jobs page not found</h2></body></html>"
-    )
-
-# Career Path page
-@app.get("/career-path", response_class=HTMLResponse)
-def career_path_page(request: Request):
-    career_path_file = TEMPLATES_DIR / "career-path.html"
-    if career_path_file.exists():
-        return templates.TemplateResponse("career-path.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Career Path page not found</h2></body></html>"
-    )
-
-# Skills Gap Analysis page
-@app.get("/skills-gap", response_class=HTMLResponse)
-def skills_gap_page(request: Request):
-    skills_gap_file = TEMPLATES_DIR / "skills-gap.html"
-    if skills_gap_file.exists():
-        return templates.TemplateResponse("skills-gap.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Skills Gap page not found</h2></body></html>"
-    )
-
-# Mock Interview Simulator page
-@app.get("/mock-interview", response_class=HTMLResponse)
-def mock_interview_page(request: Request):
-    mock_interview_file = TEMPLATES_DIR / "mock-interview.html"
-    if mock_interview_file.exists():
-        return templates.TemplateResponse("mock-interview.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Mock Interview page not found</h2></body></html>"
-    )
-
-# Resume Builder page
-@app.get("/resume-builder", response_class=HTMLResponse)
-def resume_builder_page(request: Request):
-    resume_builder_file = TEMPLATES_DIR / "resume-builder.html"
-    if resume_builder_file.exists():
-        return templates.TemplateResponse("resume-builder.html", {"request": request})
-    return HTMLResponse(
-        "<html><body><h2>Resume Builder page not found</h2></body></html>"
-    )
+    )),
+    Page("/interview", "interview_page", "interview.html", missing_html="<html><body><h2>Interview page not found</h2></body></html>"),
+    Page("/requirements", "requirements_page", "requirements.html", missing_html="<html><body><h2>Requirements page not found</h2></body></html>"),
+    Page("/top-jobs", "top_jobs_page", "top-jobs.html", missing_html="<html><body><h2>Top Jobs page not found</h2></body></html>"),
+    Page("/career-path", "career_path_page", "career-path.html", missing_html="<html><body><h2>Career Path page not found</h2></body></html>"),
+    Page("/skills-gap", "skills_gap_page", "skills-gap.html", missing_html="<html><body><h2>Skills Gap page not found</h2></body></html>"),
+    Page("/mock-interview", "mock_interview_page", "mock-interview.html", missing_html="<html><body><h2>Mock Interview page not found</h2></body></html>"),
+    Page("/resume-builder", "resume_builder_page", "resume-builder.html", missing_html="<html><body><h2>Resume Builder page not found</h2></body></html>"),
+    Page("/video-interview", "video_interview_page", "video-interview.html"),
+]
+
+
+def _page_endpoint(page: Page):
+    def serve_page(request: Request):
+        return page_cache.response(page, request)
+    return serve_page
+
+
+for _page in PAGES:
+    app.add_api_route(_page.path, _page_endpoint(_page), methods=["GET"], name=_page.name, response_class=HTMLResponse)
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ from fastapi.security import HTTPBearer
 
 from backend.models.chat import ChatRequest, ChatResponse, Message
 from backend.services.chat_service import save_message, get_history
-from backend.services.langchain_adapter import generate_chat_response
+from backend.services.langchain_adapter import agenerate_chat_response
 from backend.services.auth_service import auth_service, User
 
 router = APIRouter()
@@ -27,8 +27,8 @@ async def chat_endpoint(
         created_at=datetime.utcnow().isoformat()
     )
 
-    # generate response using OpenAI
-    reply_text = generate_chat_response(req.message)
+    # generate response using OpenAI (retrieval and skill extraction run concurrently)
+    reply_text = await agenerate_chat_response(req.message, current_user.id)
 
     # persist assistant reply
     save_message(
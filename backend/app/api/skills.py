@@ -1,17 +1,25 @@
 """Skill assessment and analysis endpoints."""
 
+import asyncio
+import json
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from backend.core.config import settings
+
 from backend.services.skill_service import (
     save_skills,
     get_user_skills,
     analyze_skills
 )
-from backend.services.langchain_adapter import analyze_skills_with_ai
+from backend.services.langchain_adapter import analyze_skills_with_ai, aanalyze_skills_batch
 from backend.services.auth_service import auth_service, User
 
 router = APIRouter()
@@ -19,6 +27,13 @@ router = APIRouter()
 class SkillSubmission(BaseModel):
     skills: List[str]
 
+class BulkCandidate(BaseModel):
+    id: str
+    skills: List[str]
+
+class BulkSkillSubmission(BaseModel):
+    candidates: List[BulkCandidate]
+
 @router.post("/submit", response_model=Dict)
 async def submit_skills(
     submission: SkillSubmission,
@@ -33,10 +48,103 @@ async def submit_skills(
     save_skills(current_user.id, skills)
 
     # Analyze using OpenAI
-    analysis = analyze_skills_with_ai(skills)
+    analysis = await run_in_threadpool(analyze_skills_with_ai, skills, current_user.id)
 
     return {"status": "ok", "analysis": analysis}
 
+def _skill_set_key(skills: List[str]) -> Tuple[str, ...]:
+    """Order- and case-insensitive identity of a skill list."""
+    return tuple(sorted({s.strip().lower() for s in skills if s.strip()}))
+
+@router.post("/bulk")
+async def bulk_analyze_skills(
+    submission: BulkSkillSubmission,
+    current_user: User = Depends(auth_service.get_current_user)
+):
+    """
+    Analyze skill lists for many candidates at once.
+
+    Identical skill sets are analyzed once, several distinct sets are packed
+    into each LLM prompt, and results stream back as NDJSON as batches finish:
+    one line per candidate ({"id", "status": "ok"|"error", "analysis"|"error"}),
+    then a final {"summary": {...}} line. A failed batch only fails its own
+    candidates.
+    """
+    candidates = submission.candidates
+    if not candidates:
+        raise HTTPException(status_code=400, detail="candidates must be a non-empty list")
+    if len(candidates) > settings.SKILLS_BULK_MAX_CANDIDATES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many candidates (max {settings.SKILLS_BULK_MAX_CANDIDATES})",
+        )
+
+    # Deduplicate: skill set -> candidate ids sharing it (first spelling is sent to the model)
+    groups: "OrderedDict[Tuple[str, ...], List[str]]" = OrderedDict()
+    representative: Dict[Tuple[str, ...], List[str]] = {}
+    invalid: List[str] = []
+    for candidate in candidates:
+        key = _skill_set_key(candidate.skills)
+        if not key:
+            invalid.append(candidate.id)
+            continue
+        if key not in groups:
+            groups[key] = []
+            representative[key] = list(dict.fromkeys(s.strip() for s in candidate.skills if s.strip()))
+        groups[key].append(candidate.id)
+
+    keys = list(groups)
+    size = max(1, settings.SKILLS_BULK_BATCH_SIZE)
+    batches = [keys[i:i + size] for i in range(0, len(keys), size)]
+    semaphore = asyncio.Semaphore(max(1, settings.SKILLS_BULK_CONCURRENCY))
+
+    async def run_batch(batch):
+        async with semaphore:
+            try:
+                results = await aanalyze_skills_batch([representative[k] for k in batch], current_user.id)
+            except Exception as e:
+                # Includes AdmissionRejected: only this batch's candidates fail
+                results = [{"error": str(e)}] * len(batch)
+        return batch, results
+
+    def line(payload: Dict) -> str:
+        return json.dumps(payload, ensure_ascii=False) + "\n"
+
+    async def stream():
+        started = time.perf_counter()
+        errors = len(invalid)
+        for candidate_id in invalid:
+            yield line({"id": candidate_id, "status": "error", "error": "skills must be a non-empty list"})
+
+        tasks = [asyncio.ensure_future(run_batch(batch)) for batch in batches]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                batch, results = await next_done
+                for key, result in zip(batch, results):
+                    for candidate_id in groups[key]:
+                        if "error" in result:
+                            errors += 1
+                            yield line({"id": candidate_id, "status": "error", "error": result["error"]})
+                        else:
+                            yield line({"id": candidate_id, "status": "ok", "analysis": result})
+        finally:
+            # Client went away (or we are done): stop batches that have not finished
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        summary = {
+            "candidates": len(candidates),
+            "unique_skill_sets": len(keys),
+            "batches": len(batches),
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        print(f"[SkillsBulk] 📦 {summary}")
+        yield line({"summary": summary})
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 @router.get("/suggestions", response_model=Dict)
 async def get_suggestions(current_user: User = Depends(auth_service.get_current_user)):
     """Get job and interview suggestions based on user's skills."""
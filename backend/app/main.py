@@ -6,7 +6,10 @@ from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 import os
 from fastapi.middleware.cors import CORSMiddleware
+from backend.core.assets import asset_url, router as assets_router
+from backend.core.compression import CompressionMiddleware
 from backend.core.config import settings
+from backend.services.admission import AdmissionRejected, admission_rejected_handler
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -23,6 +26,12 @@ app = FastAPI(
 
 TEMPLATES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../Templates'))
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
+# {{ asset_url('app.js') }} -> content-hashed, immutable /assets/ URL
+templates.env.globals["asset_url"] = asset_url
+app.include_router(assets_router)
+
+# LLM admission control rejections -> 429 + Retry-After
+app.add_exception_handler(AdmissionRejected, admission_rejected_handler)
 
 # Serve the video interview page
 @app.get("/video-interview", response_class=HTMLResponse)
@@ -38,6 +47,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# zstd / brotli / gzip per Accept-Encoding (HTML, JSON, JS, CSS, streams)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 app.include_router(
     auth.router,
     prefix=f"{API_V1_STR}/auth",
@@ -0,0 +1,256 @@
+# backend/core/assets.py
+"""
+Content-hashed, precompressed static assets.
+
+`python -m backend.tools.build_assets` copies every file under Static/ to
+Static/dist/ with a content hash in its name (app.js -> app.3f2a9c1b0d.js),
+writes .zst / .br / .gz siblings for the text assets and records it all in
+Static/dist/manifest.json.
+
+Builds only add files: a page rendered before a deploy (or cached by a
+browser or CDN) still links the previous hashes, so those stay servable.
+Each build's manifest is also kept under Static/dist/builds/, and prune()
+deletes the files that none of the last ASSETS_KEEP_BUILDS builds use.
+
+GET /assets/<hashed name> serves those files with
+Cache-Control: immutable and a strong ETag, picking the precompressed
+sibling that matches Accept-Encoding, so nothing is compressed per request.
+Templates link assets through the `asset_url` Jinja global; if the
+manifest has not been built, it falls back to the plain /static/ URL.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import zstandard
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, Response
+
+from backend.core.compression import available_encodings, brotli, is_compressible, negotiate_encoding
+from backend.core.config import settings
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "Static"
+DIST_DIR = STATIC_DIR / "dist"
+MANIFEST_PATH = DIST_DIR / "manifest.json"
+BUILDS_DIRNAME = "builds"  # one manifest per build, for serving and pruning older hashes
+
+# Precompressed sibling suffix per content coding
+ENCODING_SUFFIXES = {"zstd": ".zst", "br": ".br", "gzip": ".gz"}
+# Editor / backup leftovers that are not served
+SKIP_SUFFIXES = {".backup", ".bak", ".orig", ".swp"}
+
+router = APIRouter()
+
+
+def _content_type(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def _encode(coding: str, data: bytes) -> bytes:
+    """Offline (maximum) compression for the build step."""
+    if coding == "zstd":
+        return zstandard.ZstdCompressor(level=19).compress(data)
+    if coding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+# =====================================================
+# BUILD
+# =====================================================
+def _write_atomic(path: Path, data: bytes):
+    """Write via a temporary file and a rename, so readers never see a partial file."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def build(static_dir: Path = STATIC_DIR, dist_dir: Path = DIST_DIR, hash_length: int = 10) -> Dict[str, Any]:
+    """Fingerprint and precompress everything under static_dir; returns the manifest."""
+    assets: Dict[str, Any] = {}
+    dist_dir.mkdir(parents=True, exist_ok=True)
+
+    for source in sorted(static_dir.rglob("*")):
+        if not source.is_file() or source.suffix in SKIP_SUFFIXES:
+            continue
+        if dist_dir in source.parents:
+            continue
+        name = source.relative_to(static_dir).as_posix()
+        data = source.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()[:hash_length]
+        hashed = source.relative_to(static_dir).with_name(f"{source.stem}.{digest}{source.suffix}").as_posix()
+        target = dist_dir / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Hashed names are content-addressed: an existing file already has these bytes
+        if not target.exists():
+            _write_atomic(target, data)
+
+        encodings: Dict[str, int] = {}
+        if is_compressible(_content_type(name)):
+            for coding in available_encodings():
+                encoded = _encode(coding, data)
+                if len(encoded) < len(data):
+                    _write_atomic(dist_dir / (hashed + ENCODING_SUFFIXES[coding]), encoded)
+                    encodings[coding] = len(encoded)
+        assets[name] = {"path": hashed, "hash": digest, "size": len(data), "encodings": encodings}
+
+    build_id = hashlib.sha256(json.dumps(assets, sort_keys=True).encode("utf-8")).hexdigest()[:hash_length]
+    manifest = {"version": 1, "build": build_id, "built_at": time.time(), "assets": assets}
+    payload = json.dumps(manifest, indent=2, ensure_ascii=False).encode("utf-8")
+    builds_dir = dist_dir / BUILDS_DIRNAME
+    builds_dir.mkdir(exist_ok=True)
+    _write_atomic(builds_dir / f"{build_id}.json", payload)
+    # Every file is in place before the manifest switches over to them
+    _write_atomic(dist_dir / MANIFEST_PATH.name, payload)
+    return manifest
+
+
+def _read_builds(dist_dir: Path) -> List[Dict[str, Any]]:
+    """Manifests of the kept builds, newest first."""
+    builds = []
+    for path in (dist_dir / BUILDS_DIRNAME).glob("*.json"):
+        try:
+            builds.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError) as e:
+            print(f"[Assets] ⚠️ Could not read {path}: {e}")
+    return sorted(builds, key=lambda b: b.get("built_at", 0), reverse=True)
+
+
+def prune(dist_dir: Path = DIST_DIR, keep: int = 3) -> List[str]:
+    """Delete the builds older than the last `keep` and the files only they used; returns the removed files."""
+    builds = _read_builds(dist_dir)
+    if not builds:
+        # Not built with build history (or nothing built): nothing is known to be unused
+        return []
+    kept, dropped = builds[:max(1, keep)], builds[max(1, keep):]
+    try:
+        current = json.loads((dist_dir / MANIFEST_PATH.name).read_text(encoding="utf-8"))
+        kept.append(current)
+    except (OSError, ValueError):
+        pass
+    in_use = {MANIFEST_PATH.name}
+    for manifest in kept:
+        for entry in manifest["assets"].values():
+            in_use.add(entry["path"])
+            in_use.update(entry["path"] + ENCODING_SUFFIXES[coding] for coding in entry["encodings"])
+
+    for manifest in dropped:
+        (dist_dir / BUILDS_DIRNAME / f"{manifest['build']}.json").unlink(missing_ok=True)
+    removed = []
+    for path in sorted(dist_dir.rglob("*")):
+        if not path.is_file() or (dist_dir / BUILDS_DIRNAME) in path.parents:
+            continue
+        name = path.relative_to(dist_dir).as_posix()
+        if name not in in_use:
+            path.unlink()
+            removed.append(name)
+    return removed
+
+
+# =====================================================
+# MANIFEST
+# =====================================================
+class AssetManifest:
+    """
+    Logical name -> hashed file, reloaded whenever manifest.json changes.
+    Hashed files of the kept older builds can still be looked up.
+    """
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = path
+        self._mtime: Optional[float] = None
+        self.build: Optional[str] = None
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self.by_path: Dict[str, Dict[str, Any]] = {}
+
+    def refresh(self):
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        assets: Dict[str, Dict[str, Any]] = {}
+        build_id = None
+        if mtime is not None:
+            try:
+                manifest = json.loads(self.path.read_text(encoding="utf-8"))
+                assets = manifest.get("assets", {})
+                # Manifests written before builds had ids: the mtime still identifies them
+                build_id = manifest.get("build") or f"{mtime:.0f}"
+            except (OSError, ValueError) as e:
+                print(f"[Assets] ⚠️ Could not read {self.path}: {e}")
+        by_path: Dict[str, Dict[str, Any]] = {}
+        if mtime is not None:
+            for manifest in reversed(_read_builds(self.path.parent)):
+                by_path.update((entry["path"], entry) for entry in manifest["assets"].values())
+        self.build = build_id
+        self.assets = assets
+        self.by_path = {**by_path, **{entry["path"]: entry for entry in assets.values()}}
+
+    @property
+    def version(self) -> Optional[str]:
+        """The published build's id (None before the first build); changes with every new build."""
+        self.refresh()
+        return self.build
+
+    def url(self, name: str) -> str:
+        self.refresh()
+        name = name.lstrip("/")
+        entry = self.assets.get(name)
+        return f"/assets/{entry['path']}" if entry else f"/static/{name}"
+
+    def lookup(self, hashed_path: str) -> Optional[Dict[str, Any]]:
+        self.refresh()
+        return self.by_path.get(hashed_path)
+
+
+# Global instance
+asset_manifest = AssetManifest()
+
+
+def asset_url(name: str) -> str:
+    """Jinja global: {{ asset_url('app.js') }} -> /assets/app.3f2a9c1b0d.js"""
+    return asset_manifest.url(name)
+
+
+# =====================================================
+# SERVING
+# =====================================================
+@router.get("/assets/{path:path}", include_in_schema=False)
+def serve_asset(path: str, request: Request):
+    entry = asset_manifest.lookup(path)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+
+    offered = [c for c in available_encodings() if c in entry["encodings"]]
+    coding = negotiate_encoding(request.headers.get("accept-encoding"), offered) if offered else None
+    # One strong validator per representation (the bytes differ per encoding)
+    etag = f'"{entry["hash"]}-{coding}"' if coding else f'"{entry["hash"]}"'
+    headers = {
+        "Cache-Control": f"public, max-age={settings.ASSETS_CACHE_MAX_AGE}, immutable",
+        "ETag": etag,
+    }
+    if offered:
+        headers["Vary"] = "Accept-Encoding"
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    file_path = DIST_DIR / (entry["path"] + ENCODING_SUFFIXES[coding] if coding else entry["path"])
+    if not file_path.is_file():
+        # Pruned since the manifest was loaded
+        raise HTTPException(status_code=404, detail="Asset not found")
+    if coding:
+        headers["Content-Encoding"] = coding
+    return FileResponse(file_path, media_type=_content_type(path), headers=headers)
@@ -1,9 +1,13 @@
 import bcrypt
-from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
 import os
 
+from backend.core.lazy import lazy_import
+
+# python-jose (and cryptography under it) is only imported on the first token
+jwt = lazy_import("jose.jwt")
+
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production-12345678")
 ALGORITHM = "HS256"
@@ -36,5 +40,5 @@ def decode_access_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
-    except JWTError:
+    except jwt.JWTError:
         return None
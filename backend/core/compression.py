@@ -0,0 +1,221 @@
+# backend/core/compression.py
+"""
+Response compression middleware (zstd / brotli / gzip).
+
+The encoding is negotiated from Accept-Encoding, preferring zstd, then
+brotli, then gzip (brotli only if the optional `brotli` package is
+installed). Only textual content types are compressed (HTML, CSS, JS,
+JSON, NDJSON, SSE, SVG...), so images such as interviewer.jpg and
+anything already carrying a Content-Encoding pass through untouched.
+
+Complete bodies under the minimum size are sent as is. Streaming
+responses (/api/chat/stream, /api/skills/bulk) are compressed chunk by
+chunk and flushed after every chunk, so each event still reaches the
+browser as soon as it is produced.
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional: brotli is offered only when installed
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/x-javascript",
+    "application/x-ndjson",
+    "application/xml",
+    "application/manifest+json",
+    "image/svg+xml",
+}
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """Text-like content types worth compressing (images, fonts, archives are not)."""
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """"gzip, br;q=0.8, *;q=0" -> {"gzip": 1.0, "br": 0.8, "*": 0.0}"""
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def available_encodings() -> List[str]:
+    """Encodings this server can produce, most preferred first."""
+    return ["zstd", "br", "gzip"] if brotli is not None else ["zstd", "gzip"]
+
+
+def negotiate_encoding(header: Optional[str], offered: Optional[List[str]] = None) -> Optional[str]:
+    """Best encoding acceptable to the client, or None for identity."""
+    accepted = parse_accept_encoding(header)
+    for coding in offered or available_encodings():
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0:
+            return coding
+    return None
+
+
+class _Encoder:
+    """Incremental compressor for one response body."""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int, zstd_level: int):
+        self.coding = coding
+        if coding == "zstd":
+            self._zstd = zstandard.ZstdCompressor(level=zstd_level).compressobj()
+        elif coding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress and flush, so everything fed so far can be decoded by the client."""
+        if self.coding == "zstd":
+            return self._zstd.compress(data) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.coding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._gzip.compress(data) + self._gzip.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.coding == "zstd":
+            return self._zstd.compress(data) + self._zstd.flush()
+        if self.coding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._gzip.compress(data) + self._gzip.flush()
+
+
+class CompressionMiddleware:
+    """ASGI middleware: compress eligible HTTP responses per Accept-Encoding."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level: int = settings.COMPRESSION_ZSTD_LEVEL,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        responder = _CompressionResponder(self, coding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, coding: Optional[str], send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self.downstream = send
+        self.start: Optional[Message] = None
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+
+    def _eligible(self, start: Message) -> Tuple[bool, bool]:
+        """(compressible type, may compress this response)."""
+        headers = Headers(raw=start["headers"])
+        compressible = is_compressible(headers.get("content-type"))
+        allowed = (
+            compressible
+            and self.coding is not None
+            and start["status"] >= 200
+            and start["status"] not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and "content-range" not in headers
+            and "no-transform" not in headers.get("cache-control", "")
+        )
+        return compressible, allowed
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            compressible, allowed = self._eligible(message)
+            headers = MutableHeaders(raw=message["headers"])
+            if compressible and "accept-encoding" not in headers.get("vary", "").lower():
+                # The body differs by Accept-Encoding even when this one goes out plain
+                headers.add_vary_header("Accept-Encoding")
+            if not allowed:
+                self.passthrough = True
+                await self.downstream(message)
+                return
+            # Hold the headers until the first body chunk shows how big the body is
+            self.start = message
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.downstream(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.downstream(start)
+                await self.downstream(message)
+                return
+            self.encoder = _Encoder(
+                self.coding, self.middleware.gzip_level, self.middleware.brotli_quality, self.middleware.zstd_level
+            )
+            headers["Content-Encoding"] = self.coding
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # A different byte representation: the validator is only weakly equal now
+                headers["ETag"] = f"W/{etag}"
+            if more_body:
+                del headers["Content-Length"]
+                await self.downstream(start)
+            else:
+                compressed = self.encoder.finish(body)
+                headers["Content-Length"] = str(len(compressed))
+                await self.downstream(start)
+                await self.downstream({"type": "http.response.body", "body": compressed, "more_body": False})
+                return
+
+        if more_body:
+            data = self.encoder.chunk(body) if body else b""
+        else:
+            data = self.encoder.finish(body)
+        if data or not more_body:
+            await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -1,8 +1,9 @@
 # backend/core/config.py
 from pathlib import Path
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Project root: two levels above this file (backend/core -> backend -> project root)
@@ -26,17 +27,137 @@ class Settings(BaseSettings):
     # OpenAI API settings
     OPENAI_API_KEY: Optional[str] = None
     OPENAI_MODEL: str = "gpt-4o-mini"
+    # Optional OpenAI-compatible endpoint (e.g. a local stand-in); None = api.openai.com
+    OPENAI_BASE_URL: Optional[str] = None
 
     # NVIDIA NIM settings (kept for future use; safe if unset)
     NVIDIA_API_KEY: Optional[str] = None
     NVIDIA_MODEL: str = "nvidia/llama-3.1-nemotron-70b-instruct"
     NIM_BASE_URL: str = "https://integrate.api.nvidia.com/v1"
 
+    # Offline mock LLM server (backend/tools/mock_llm_server.py), e.g. http://127.0.0.1:9100/v1.
+    # When set, OpenAI and NIM traffic (chat + embeddings) both go to the mock.
+    MOCK_LLM_URL: Optional[str] = None
+
+    # Shared LLM client pool (one async client per provider, see services/llm_clients.py)
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_REQUEST_TIMEOUT: float = 60.0
+
+    # Admission control in front of every upstream LLM call (see services/admission.py)
+    LLM_MAX_CONCURRENCY: int = 16           # concurrent LLM calls per process
+    ADMISSION_MAX_QUEUE_PER_USER: int = 4   # queued calls per user before 429
+    ADMISSION_MAX_WAIT_SECONDS: float = 30.0
+
+    # Per-request model tiering for /api/chat (see services/model_tiering.py).
+    # "models" maps provider -> model for that tier; a provider left out uses
+    # OPENAI_MODEL / NVIDIA_MODEL.
+    MODEL_TIERING_ENABLED: bool = True
+    MODEL_TIERS: Dict[str, Dict[str, Any]] = {
+        "fast": {
+            "models": {"openai": "gpt-4.1-nano", "nvidia": "meta/llama-3.1-8b-instruct"},
+            "max_tokens": 256,
+        },
+        "standard": {"models": {}, "max_tokens": 1024},
+        "structured": {"models": {}, "max_tokens": 3000},
+    }
+    MODEL_TIER_DEFAULT: str = "standard"
+    MODEL_TIER_FAST_PAGES: List[str] = ["voice"]   # the only pages whose chat turns go to the fast tier
+
+    # Per-user conversation memory for /api/chat (see services/conversation_memory.py)
+    MEMORY_ENABLED: bool = True
+    MEMORY_RECENT_TURNS: int = 8            # turns always sent verbatim
+    MEMORY_SUMMARIZE_EVERY: int = 6         # older turns folded into the summary per update
+    MEMORY_TURN_MAX_CHARS: int = 1500       # longer turns are clipped in the prompt
+    MEMORY_SUMMARY_MAX_TOKENS: int = 300
+
+    # Per-user chat history (GET /api/history pagination)
+    HISTORY_PAGE_SIZE: int = 50
+    HISTORY_MAX_PAGE_SIZE: int = 200
+
+    # Live voice interview over WebSocket (/api/ws/interview, see services/interview_sessions.py)
+    WS_HEARTBEAT_SECONDS: float = 15.0      # server ping interval
+    WS_IDLE_TIMEOUT_SECONDS: float = 45.0   # close sockets silent for this long
+    WS_SESSION_TTL_SECONDS: float = 120.0   # detached sessions can be resumed for this long
+    WS_REPLAY_BUFFER: int = 512             # frames kept per session for resume
+    WS_RECENT_TURNS: int = 8                # turns kept in the session prompt
+    WS_SPECULATION_ENABLED: bool = True     # start replies on stable interim transcripts
+    WS_SPECULATION_THRESHOLD: float = 0.85  # final vs interim similarity needed to serve the speculation
+    WS_SPECULATION_MIN_CHARS: int = 12      # shorter interim text is not worth speculating on
+
+    # Response compression (see core/compression.py)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 512     # bytes; smaller complete bodies are sent as is
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5     # 0-11; 4-6 is the usual on-the-fly range
+    COMPRESSION_ZSTD_LEVEL: int = 6
+
+    # Fingerprinted static assets (see core/assets.py, tools/build_assets.py)
+    ASSETS_CACHE_MAX_AGE: int = 31536000    # one year; hashed names never change content
+    ASSETS_KEEP_BUILDS: int = 3             # builds whose hashed files stay servable (older pages / caches)
+
+    # Rendered HTML page cache (see core/page_cache.py)
+    PAGE_CACHE_CHECK_MTIME: bool = True     # re-render on template change; turn off in production
+
+    # Chat history RAG index (see services/rag_manager.py). With several workers one process,
+    # elected through a SQLite lease, embeds new chats and publishes index generations;
+    # the other workers reload them.
+    RAG_INDEX_INTERVAL_SECONDS: float = 60.0
+    RAG_POLL_SECONDS: float = 5.0           # lease renewal and new-generation check
+    RAG_LEASE_TTL_SECONDS: float = 30.0     # a dead indexer is replaced after at most this long
+    RAG_KEEP_GENERATIONS: int = 2           # published index directories kept on disk
+
+    # Worker warm-up and readiness (see services/warmup.py, GET /healthz and /readyz)
+    WARMUP_ENABLED: bool = True
+    WARMUP_BLOCKING: bool = False           # True: startup waits for it, no connections are accepted before
+    WARMUP_STEP_TIMEOUT_SECONDS: float = 20.0
+    WARMUP_PROVIDER_CONNECTIONS: int = 2    # keep-alive connections opened per LLM provider
+
+    # Cold-start budget: `import backend.app` in a fresh interpreter (see test_import_budget.py,
+    # tools/importtime.py and core/lazy.py)
+    IMPORT_BUDGET_MS: int = 1100
+
+    # Bulk skill analysis (POST /api/skills/bulk)
+    SKILLS_BULK_MAX_CANDIDATES: int = 1000
+    SKILLS_BULK_BATCH_SIZE: int = 8         # distinct skill sets packed into one LLM prompt
+    SKILLS_BULK_CONCURRENCY: int = 4        # batches in flight per request (<= ADMISSION_MAX_QUEUE_PER_USER)
+
+    # Multi-provider routing and hedging (see services/llm_router.py)
+    LLM_HEDGE_DELAY_MS: int = 1500          # 0 = adaptive (primary's rolling p95)
+    LLM_ROUTER_WINDOW: int = 100            # samples kept per provider/model
+    LLM_ROUTER_ERROR_THRESHOLD: float = 0.5 # error rate above which a backend is unhealthy
+    LLM_ROUTER_COOLDOWN_SECONDS: float = 30.0
+
+    # Semantic response cache for /api/chat (see services/response_cache.py)
+    CHAT_CACHE_ENABLED: bool = True
+    CHAT_CACHE_SIMILARITY_THRESHOLD: float = 0.97
+    CHAT_CACHE_TTL_SECONDS: int = 3600
+    CHAT_CACHE_MAX_ENTRIES: int = 512
+
+    # Prompt context token budgets per model (see services/context_builder.py)
+    CONTEXT_TOKEN_BUDGETS: Dict[str, int] = {
+        "gpt-4o-mini": 6000,
+        "gpt-4o": 8000,
+    }
+    CONTEXT_DEFAULT_TOKEN_BUDGET: int = 4000
+    CONTEXT_REPLY_RESERVE_TOKENS: int = 1000
+
     # General app settings
     PROJECT_NAME: str = "AskTech"
     # IMPORTANT: Set a secure SECRET_KEY in production via environment variable
     DATABASE_URL: str = "sqlite:///./asktech.db"
 
+    @model_validator(mode="after")
+    def _apply_mock_llm(self) -> "Settings":
+        """Point every provider at the mock server so nothing leaves the machine."""
+        if self.MOCK_LLM_URL:
+            self.OPENAI_BASE_URL = self.MOCK_LLM_URL
+            self.NIM_BASE_URL = self.MOCK_LLM_URL
+            # The mock accepts any key; real keys are never sent to it
+            self.OPENAI_API_KEY = "mock-openai-key"
+            self.NVIDIA_API_KEY = "mock-nvidia-key"
+        return self
+
     def is_openai_configured(self) -> bool:
         """Return True if an OpenAI API key is present (non-empty string)."""
         return bool(self.OPENAI_API_KEY and self.OPENAI_API_KEY.strip())
@@ -0,0 +1,94 @@
+# backend/core/lazy.py
+"""
+Deferred imports for heavy dependencies.
+
+    np = lazy_import("numpy")
+
+returns a stand-in module; numpy itself is only imported on the first
+attribute access (np.dot(...)), after which the stand-in forwards to the
+real module. Importing backend.app therefore no longer pays for numpy,
+langchain, httpx or jose: a worker starts serving sooner, and the cost
+moves to the first request that needs them (or to preload() during
+startup warm-up).
+
+If the module is already imported, lazy_import() returns it directly.
+Each deferred load is timed; stats() shows which ones happened and what
+they cost. Use `python -m backend.tools.importtime` to find new candidates.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import time
+import types
+from typing import Any, Dict, List, Optional
+
+# Every deferred module, by name
+_registry: Dict[str, "LazyModule"] = {}
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first use."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+        self.__dict__["_lazy_load_ms"] = None
+
+    def _lazy_load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            started = time.perf_counter()
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_lazy_load_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("__") and attr.endswith("__"):
+            # copy / pickle / inspect probing the stand-in must not trigger the import
+            raise AttributeError(attr)
+        value = getattr(self._lazy_load(), attr)
+        # Later lookups are plain dict hits
+        self.__dict__[attr] = value
+        return value
+
+    def __dir__(self) -> List[str]:
+        return dir(self._lazy_load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_lazy_target"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str):
+    """The module if already imported, else a LazyModule that imports it on first use."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    lazy = _registry.get(name)
+    if lazy is None:
+        lazy = _registry[name] = LazyModule(name)
+    return lazy
+
+
+def preload(names: Optional[List[str]] = None) -> Dict[str, Optional[float]]:
+    """Import the given deferred modules (default: all) now; returns name -> load ms."""
+    loaded: Dict[str, Optional[float]] = {}
+    for name in names or list(_registry):
+        lazy = _registry.get(name)
+        if lazy is not None:
+            lazy._lazy_load()
+            loaded[name] = lazy.__dict__["_lazy_load_ms"]
+    return loaded
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        name: {
+            "loaded": lazy.__dict__["_lazy_target"] is not None,
+            "load_ms": lazy.__dict__["_lazy_load_ms"],
+        }
+        for name, lazy in _registry.items()
+    }
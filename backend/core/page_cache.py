@@ -0,0 +1,143 @@
+# backend/core/page_cache.py
+"""
+Rendered-page cache for the Jinja2 HTML routes.
+
+The pages are static per template (all user data is loaded by JS), so each
+one is rendered once and the bytes are kept with a strong ETag; later hits
+answer straight from memory, or with 304 Not Modified when the browser
+already has that version. Templates are compiled at startup (compile()).
+
+Pages link the hashed asset URLs of one build, so the cache key and the
+ETag include the asset manifest version: after `build_assets` the pages
+are re-rendered with the new URLs, and browsers holding the old page get
+a 200 instead of a 304. With settings.PAGE_CACHE_CHECK_MTIME on
+(development), every hit also checks the template file's mtime and
+re-renders when it changed. In production turn it off: templates then
+only change with a deploy (a new process).
+
+Cached templates must not depend on the request: they are rendered
+without one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi.templating import Jinja2Templates
+
+from backend.core.assets import asset_manifest
+
+
+@dataclass(frozen=True)
+class Page:
+    path: str
+    name: str  # route name, for url_for
+    template: str
+    redirect_if_missing: Optional[str] = None
+    missing_html: str = "<html><body><h2>Page not found</h2></body></html>"
+
+
+@dataclass
+class _Rendered:
+    body: bytes
+    etag: str
+    mtime: Optional[float]  # template file mtime when rendered
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison, as If-None-Match requires (compression may have weakened the tag)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+class PageCache:
+    """Template name -> rendered bytes + ETag."""
+
+    def __init__(self, templates: Jinja2Templates, check_mtime: bool = True):
+        self.templates = templates
+        self.check_mtime = check_mtime
+        # Production: Jinja itself does not need to stat templates either
+        self.templates.env.auto_reload = check_mtime
+        self._pages: Dict[Tuple[str, Optional[str]], _Rendered] = {}  # (template, asset manifest version)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.served = 0
+        self.not_modified = 0
+        self.renders = 0
+
+    def _path(self, template: str) -> Optional[str]:
+        for directory in self.templates.env.loader.searchpath:
+            path = os.path.join(directory, template)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def _mtime(self, template: str) -> Optional[float]:
+        path = self._path(template)
+        return os.path.getmtime(path) if path else None
+
+    def compile(self, templates: Iterable[str]):
+        """Compile and render the given templates up front (skips missing ones)."""
+        for template in templates:
+            self.get(template)
+
+    def get(self, template: str) -> Optional[_Rendered]:
+        """The rendered page, rendering it if needed; None if the template does not exist."""
+        assets_version = asset_manifest.version
+        key = (template, assets_version)
+        cached = self._pages.get(key)
+        if cached is not None and not self.check_mtime:
+            return cached
+        mtime = self._mtime(template)
+        if cached is not None and cached.mtime == mtime:
+            return cached
+        if mtime is None:
+            return None
+
+        with self._lock:
+            body = self.templates.env.get_template(template).render().encode("utf-8")
+            digest = hashlib.sha256(body).hexdigest()[:20]
+            etag = f'"{digest}-{assets_version}"' if assets_version else f'"{digest}"'
+            rendered = _Rendered(body=body, etag=etag, mtime=mtime)
+            # Drop the renders linking an older build's assets
+            for stale in [k for k in self._pages if k[0] == template]:
+                del self._pages[stale]
+            self._pages[key] = rendered
+            self.renders += 1
+        print(f"[PageCache] 🧱 Rendered {template} ({len(body):,} bytes)")
+        return rendered
+
+    def response(self, page: Page, request: Request) -> Response:
+        rendered = self.get(page.template)
+        if rendered is None:
+            if page.redirect_if_missing:
+                return RedirectResponse(url=page.redirect_if_missing)
+            return HTMLResponse(page.missing_html)
+
+        # Revalidate every time, so a deploy shows up on the next load
+        headers = {"ETag": rendered.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), rendered.etag):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        self.served += 1
+        return HTMLResponse(rendered.body, headers=headers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pages": len(self._pages),
+            "renders": self.renders,
+            "served": self.served,
+            "not_modified": self.not_modified,
+            "check_mtime": self.check_mtime,
+        }
@@ -0,0 +1,272 @@
+# backend/services/admission.py
+"""
+Admission control for upstream LLM calls.
+
+A global cap on concurrent LLM calls, with fair per-user queues in front of
+it. When every slot is busy, callers wait in their own user's queue and freed
+slots are handed out round-robin across users, so a single user (or a stuck
+voice loop) cannot starve everyone else. Each user's queue is bounded; a full
+queue (or a wait longer than the limit) is rejected immediately with
+AdmissionRejected, which the API turns into 429 + Retry-After.
+
+Works for both async callers (FastAPI routes) and threads (the sync
+langchain_adapter functions run in the threadpool).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from backend.core.config import settings
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted (queue full or waited too long)."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    """One queued caller: an asyncio future or a threading event."""
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.loop = loop
+        self.future: Optional[asyncio.Future] = loop.create_future() if loop else None
+        self.event: Optional[threading.Event] = None if loop else threading.Event()
+        self.granted = False
+        self.enqueued_at = time.monotonic()
+
+    def wake(self):
+        if self.future is not None:
+            self.loop.call_soon_threadsafe(self._resolve)
+        else:
+            self.event.set()
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(True)
+
+
+class AdmissionController:
+    """Global LLM concurrency limit with fair, bounded per-user queues."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        max_queue_per_user: int = 4,
+        max_wait_seconds: float = 30.0,
+        window: int = 500,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue_per_user = max_queue_per_user
+        self.max_wait_seconds = max_wait_seconds
+        self._lock = threading.Lock()
+        self._active = 0
+        # user -> waiting callers; order of keys = round-robin order
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+
+        # Metrics
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._service_times: Deque[float] = deque(maxlen=window)
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.max_depth_seen = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "AdmissionController":
+        return cls(
+            max_concurrency=settings.LLM_MAX_CONCURRENCY,
+            max_queue_per_user=settings.ADMISSION_MAX_QUEUE_PER_USER,
+            max_wait_seconds=settings.ADMISSION_MAX_WAIT_SECONDS,
+        )
+
+    # ------------------------------------------------------------------
+    # Internals (call with self._lock held)
+    # ------------------------------------------------------------------
+    def _depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _retry_after(self, position: int) -> int:
+        """Rough seconds until a slot would free up for someone at this queue position."""
+        if self._service_times:
+            avg = sum(self._service_times) / len(self._service_times)
+        else:
+            avg = 1.0
+        return max(1, math.ceil(avg * (position + 1) / max(self.max_concurrency, 1)))
+
+    def _try_enter(self, user: str, waiter_factory) -> Optional[_Waiter]:
+        """Take a slot right away (returns None) or enqueue and return the waiter."""
+        if self._active < self.max_concurrency and not self._queues:
+            self._active += 1
+            self.admitted += 1
+            self._waits.append(0.0)
+            return None
+        queue = self._queues.get(user)
+        if queue is not None and len(queue) >= self.max_queue_per_user:
+            self.rejected_queue_full += 1
+            raise AdmissionRejected(
+                f"Too many queued requests for this user (max {self.max_queue_per_user})",
+                retry_after=self._retry_after(self._depth()),
+            )
+        waiter = waiter_factory()
+        if queue is None:
+            queue = self._queues[user] = deque()
+        queue.append(waiter)
+        self.queued += 1
+        self.max_depth_seen = max(self.max_depth_seen, self._depth())
+        return waiter
+
+    def _grant_next(self):
+        """Hand free slots to queued callers, one user at a time (round-robin)."""
+        while self._active < self.max_concurrency and self._queues:
+            user, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(user)
+            else:
+                del self._queues[user]
+            waiter.granted = True
+            self._active += 1
+            self.admitted += 1
+            self._waits.append(time.monotonic() - waiter.enqueued_at)
+            waiter.wake()
+
+    def _abandon(self, user: str, waiter: _Waiter) -> bool:
+        """Remove a waiter that gave up. Returns False if it was granted meanwhile."""
+        if waiter.granted:
+            return False
+        queue = self._queues.get(user)
+        if queue is not None:
+            try:
+                queue.remove(waiter)
+            except ValueError:
+                pass
+            if not queue:
+                del self._queues[user]
+        return True
+
+    def _release(self, started: float):
+        with self._lock:
+            self._active -= 1
+            self._service_times.append(time.monotonic() - started)
+            self._grant_next()
+
+    def _timeout_error(self) -> AdmissionRejected:
+        self.rejected_timeout += 1
+        return AdmissionRejected(
+            f"Timed out after {self.max_wait_seconds:.0f}s waiting for an LLM slot",
+            retry_after=self._retry_after(self._depth()),
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def acquire(self, user: str):
+        """Wait for a slot (async). Raises AdmissionRejected."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._try_enter(user, lambda: _Waiter(loop))
+        if waiter is None:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            with self._lock:
+                if self._abandon(user, waiter):
+                    raise self._timeout_error()
+            # Granted just as the wait timed out: keep the slot
+        except asyncio.CancelledError:
+            with self._lock:
+                abandoned = self._abandon(user, waiter)
+            if not abandoned:
+                # The slot was granted while the caller went away: hand it back
+                self._release(time.monotonic())
+            raise
+
+    def acquire_sync(self, user: str):
+        """Wait for a slot (blocking, for threadpool callers). Raises AdmissionRejected."""
+        with self._lock:
+            waiter = self._try_enter(user, _Waiter)
+        if waiter is None:
+            return
+        if waiter.event.wait(timeout=self.max_wait_seconds):
+            return
+        with self._lock:
+            if self._abandon(user, waiter):
+                raise self._timeout_error()
+        # Granted just as the wait timed out: keep the slot
+
+    @asynccontextmanager
+    async def slot(self, user: Any) -> AsyncIterator[None]:
+        """async with admission.slot(user_id): ... one upstream LLM call ..."""
+        await self.acquire(str(user))
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(started)
+
+    @contextmanager
+    def slot_sync(self, user: Any) -> Iterator[None]:
+        """with admission.slot_sync(user_id): ... (thread-based callers)"""
+        self.acquire_sync(str(user))
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._release(started)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits: List[float] = sorted(self._waits)
+            depth_by_user = {user: len(q) for user, q in self._queues.items()}
+            depth = sum(depth_by_user.values())
+            active = self._active
+
+        def pct(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(p / 100.0 * len(waits)))] * 1000, 1)
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active": active,
+            "queue_depth": depth,
+            "queued_users": len(depth_by_user),
+            "max_queue_depth_seen": self.max_depth_seen,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "wait_p50_ms": pct(50),
+            "wait_p95_ms": pct(95),
+            "wait_max_ms": round(waits[-1] * 1000, 1) if waits else None,
+        }
+
+
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    """FastAPI exception handler: 429 with a Retry-After hint."""
+    print(f"[Admission] 🚦 Rejected {request.url.path}: {exc.reason}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": exc.reason, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# Single process-wide controller shared by every LLM call site
+admission = AdmissionController.from_settings(settings)
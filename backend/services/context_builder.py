@@ -0,0 +1,203 @@
+# backend/services/context_builder.py
+"""
+Token-budgeted prompt context assembly.
+
+Counts tokens with tiktoken and packs the pieces of a prompt into a per-model
+token budget, in this priority order:
+
+1. system prompt (always kept; its count is cached since it never changes)
+2. the user message (always kept; truncated only if it alone exceeds the budget)
+3. recent conversation history, newest turns first
+4. retrieved RAG snippets in relevance order, deduplicated
+
+Whatever does not fit is dropped, so prompt size stays bounded however much
+history a user accumulates.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from backend.core.config import settings
+
+# Rough per-message overhead of the chat format (role markers etc.)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class TokenCounter:
+    """Counts tokens for a model, with a cache for fixed prompt strings."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.encoding = None
+        try:
+            import tiktoken
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                # Unknown model name (e.g. NIM models): use the GPT-4 family encoding
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            # tiktoken missing or its BPE files unavailable offline
+            print(f"[ContextAssembler] tiktoken unavailable ({e}); using approximate counts")
+        self._fixed: Dict[str, int] = {}
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is None:
+            # ~4 characters per token is a reasonable approximation
+            return len(text) // 4 + 1
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def count_fixed(self, text: str) -> int:
+        """Count a string that is reused across requests (system prompts)."""
+        n = self._fixed.get(text)
+        if n is None:
+            n = self.count(text)
+            self._fixed[text] = n
+        return n
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text down to at most max_tokens tokens."""
+        if max_tokens <= 0:
+            return ""
+        if self.encoding is None:
+            return text[: max_tokens * 4]
+        tokens = self.encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max_tokens])
+
+
+@dataclass
+class AssembledContext:
+    system_prompt: str
+    user_message: str
+    history: List[str] = field(default_factory=list)
+    snippets: List[str] = field(default_factory=list)
+    token_usage: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def context(self) -> str:
+        """History and snippets joined into one context block."""
+        return "\n".join(self.history + self.snippets)
+
+
+def _dedup_key(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+class ContextAssembler:
+    """Packs system prompt, user message, history and RAG hits into a token budget."""
+
+    def __init__(self, model: str, budget: int, reply_reserve: int = 0):
+        self.counter = TokenCounter(model)
+        self.model = model
+        self.budget = budget
+        self.reply_reserve = reply_reserve
+
+        # Running totals for monitoring
+        self.requests = 0
+        self.total_prompt_tokens = 0
+        self.dropped_items = 0
+
+    def assemble(
+        self,
+        system_prompt: str,
+        user_message: str,
+        history: Optional[Iterable[str]] = None,
+        snippets: Optional[Iterable[str]] = None,
+    ) -> AssembledContext:
+        """
+        Build the context for one request. history is oldest-first; snippets are
+        in relevance order. Returns the kept pieces plus per-part token counts.
+        """
+        available = self.budget - self.reply_reserve
+
+        system_tokens = self.counter.count_fixed(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+        available -= system_tokens
+
+        # The user message is mandatory; only truncate it if it cannot fit at all
+        user_tokens = self.counter.count(user_message) + MESSAGE_OVERHEAD_TOKENS
+        if user_tokens > available:
+            user_message = self.counter.truncate(user_message, max(available - MESSAGE_OVERHEAD_TOKENS, 0))
+            user_tokens = self.counter.count(user_message) + MESSAGE_OVERHEAD_TOKENS
+        available -= user_tokens
+
+        seen = {_dedup_key(user_message)}
+        dropped = 0
+
+        # Recent history: walk newest -> oldest, keep chronological order in the result
+        kept_history: List[str] = []
+        history_tokens = 0
+        for turn in reversed(list(history or [])):
+            key = _dedup_key(turn)
+            if not key or key in seen:
+                continue
+            n = self.counter.count(turn) + 1  # +1 for the joining newline
+            if n > available:
+                dropped += 1
+                continue
+            seen.add(key)
+            kept_history.append(turn)
+            history_tokens += n
+            available -= n
+        kept_history.reverse()
+
+        # RAG snippets in relevance order, skipping duplicates of anything already kept
+        kept_snippets: List[str] = []
+        snippet_tokens = 0
+        for snippet in snippets or []:
+            key = _dedup_key(snippet)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            n = self.counter.count(snippet) + 1
+            if n > available:
+                dropped += 1
+                continue
+            kept_snippets.append(snippet)
+            snippet_tokens += n
+            available -= n
+
+        total = system_tokens + user_tokens + history_tokens + snippet_tokens
+        self.requests += 1
+        self.total_prompt_tokens += total
+        self.dropped_items += dropped
+
+        return AssembledContext(
+            system_prompt=system_prompt,
+            user_message=user_message,
+            history=kept_history,
+            snippets=kept_snippets,
+            token_usage={
+                "system": system_tokens,
+                "user": user_tokens,
+                "history": history_tokens,
+                "snippets": snippet_tokens,
+                "total": total,
+                "budget": self.budget,
+                "reply_reserve": self.reply_reserve,
+                "dropped_items": dropped,
+            },
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "model": self.model,
+            "budget": self.budget,
+            "requests": self.requests,
+            "avg_prompt_tokens": round(self.total_prompt_tokens / self.requests, 1) if self.requests else 0.0,
+            "dropped_items": self.dropped_items,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_context_assembler(model: str) -> ContextAssembler:
+    """One assembler (and tiktoken encoding) per model, created on first use."""
+    budget = settings.CONTEXT_TOKEN_BUDGETS.get(model, settings.CONTEXT_DEFAULT_TOKEN_BUDGET)
+    return ContextAssembler(model, budget=budget, reply_reserve=settings.CONTEXT_REPLY_RESERVE_TOKENS)
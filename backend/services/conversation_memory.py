@@ -0,0 +1,289 @@
+# backend/services/conversation_memory.py
+"""
+Per-user conversation memory, persisted in SQLite.
+
+Turns are read from the chat_messages table (see history_store.py). The prompt for the next
+turn gets a running summary of the older part of the conversation plus the
+most recent turns verbatim, so its size stays roughly constant however long
+the candidate talks, and nothing about past conversations lives in process
+memory.
+
+Once enough turns have piled up behind the recent window, they are folded
+into the summary by a background LLM call (schedule_summary); the request
+that triggered it does not wait for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from backend.core.config import settings
+from backend.core.lazy import lazy_import
+from backend.db.db import get_connection
+from backend.services.history_store import DEFAULT_CONVERSATION, history_store
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+# langchain is only imported when the first prompt is built
+lc_messages = lazy_import("langchain_core.messages")
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You maintain a running summary of a career-coaching conversation between a candidate "
+    "and an AI assistant.\n"
+    "Update the current summary with the new turns. Keep what matters for the rest of the "
+    "conversation: the candidate's skills and experience level, goals and target roles, "
+    "questions already asked and how they were answered, and advice already given.\n"
+    "Write at most 150 words, in the language the candidate uses. Return only the summary."
+)
+
+# Given summary-update messages, returns the new summary text
+Summarizer = Callable[[List["BaseMessage"]], Awaitable[str]]
+
+
+@dataclass
+class MemoryContext:
+    summary: str = ""
+    turns: List[Tuple[str, str]] = field(default_factory=list)  # (role, text), oldest first
+
+    @property
+    def empty(self) -> bool:
+        return not self.summary and not self.turns
+
+    def messages(self) -> List[BaseMessage]:
+        """Prompt messages to place between the system prompt and the new user message."""
+        result: List[BaseMessage] = []
+        if self.summary:
+            result.append(lc_messages.SystemMessage(content=f"Summary of the earlier conversation:\n{self.summary}"))
+        for role, text in self.turns:
+            result.append(lc_messages.HumanMessage(content=text) if role == "user" else lc_messages.AIMessage(content=text))
+        return result
+
+    def exchanges(self) -> List[Tuple[str, str]]:
+        """(human, ai) pairs, for chains that take chat_history as tuples."""
+        pairs: List[Tuple[str, str]] = []
+        if self.summary:
+            pairs.append(("Summarize our conversation so far.", self.summary))
+        human: Optional[str] = None
+        for role, text in self.turns:
+            if role == "user":
+                if human is not None:
+                    pairs.append((human, ""))
+                human = text
+            else:
+                pairs.append((human or "", text))
+                human = None
+        if human is not None:
+            pairs.append((human, ""))
+        return pairs
+
+
+class ConversationMemory:
+    """Recent turns verbatim + a rolling summary of everything older, per user."""
+
+    def __init__(
+        self,
+        recent_turns: int = 8,
+        summarize_every: int = 6,
+        turn_max_chars: int = 1500,
+        enabled: bool = True,
+    ):
+        self.recent_turns = recent_turns
+        self.summarize_every = summarize_every
+        self.turn_max_chars = turn_max_chars
+        self.enabled = enabled
+        self._in_flight: Set[Tuple[str, str]] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.summaries_written = 0
+        self.summary_failures = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "ConversationMemory":
+        return cls(
+            recent_turns=settings.MEMORY_RECENT_TURNS,
+            summarize_every=settings.MEMORY_SUMMARIZE_EVERY,
+            turn_max_chars=settings.MEMORY_TURN_MAX_CHARS,
+            enabled=settings.MEMORY_ENABLED,
+        )
+
+    def init_db(self):
+        """Initialize chat_summaries table, called at startup (chat_messages belongs to the history store)."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS chat_summaries (
+                user_id TEXT NOT NULL,
+                conversation_id TEXT NOT NULL DEFAULT 'default',
+                summary TEXT NOT NULL,
+                summarized_through INTEGER NOT NULL,
+                updated_at TEXT,
+                PRIMARY KEY (user_id, conversation_id)
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def add_turn(self, user_id: Any, role: str, text: str, conversation_id: str = DEFAULT_CONVERSATION) -> int:
+        """Persist one turn; returns its id."""
+        return history_store.append(user_id, role, text, conversation_id)
+
+    def _summary_row(self, cur, user_id: str, conversation_id: str) -> Tuple[str, int]:
+        cur.execute(
+            "SELECT summary, summarized_through FROM chat_summaries WHERE user_id = ? AND conversation_id = ?",
+            (user_id, conversation_id),
+        )
+        row = cur.fetchone()
+        return (row["summary"], row["summarized_through"]) if row else ("", 0)
+
+    def _unsummarized(self, cur, user_id: str, conversation_id: str, after_id: int, limit: int) -> List[Any]:
+        """The newest `limit` turns after the summary, oldest first."""
+        cur.execute(
+            "SELECT id, role, text FROM chat_messages "
+            "WHERE user_id = ? AND conversation_id = ? AND id > ? AND role IN ('user', 'assistant') "
+            "ORDER BY id DESC LIMIT ?",
+            (user_id, conversation_id, after_id, limit),
+        )
+        return list(reversed(cur.fetchall()))
+
+    def _clip(self, text: str) -> str:
+        if len(text) <= self.turn_max_chars:
+            return text
+        return text[: self.turn_max_chars] + " …"
+
+    def load(self, user_id: Any, conversation_id: str = DEFAULT_CONVERSATION) -> MemoryContext:
+        """Summary + recent turns for the next prompt (bounded even if summarizing falls behind)."""
+        if not self.enabled:
+            return MemoryContext()
+        conn = get_connection()
+        cur = conn.cursor()
+        summary, through = self._summary_row(cur, str(user_id), conversation_id)
+        rows = self._unsummarized(cur, str(user_id), conversation_id, through, self.recent_turns + self.summarize_every)
+        conn.close()
+        return MemoryContext(summary=summary, turns=[(r["role"], self._clip(r["text"])) for r in rows])
+
+    def clear(self, user_id: Any, conversation_id: Optional[str] = None) -> int:
+        """Forget a user's conversation(s): messages and summaries. Returns messages deleted."""
+        conn = get_connection()
+        cur = conn.cursor()
+        if conversation_id is None:
+            cur.execute("DELETE FROM chat_summaries WHERE user_id = ?", (str(user_id),))
+        else:
+            cur.execute(
+                "DELETE FROM chat_summaries WHERE user_id = ? AND conversation_id = ?",
+                (str(user_id), conversation_id),
+            )
+        conn.commit()
+        conn.close()
+        return history_store.delete(user_id, conversation_id)
+
+    # ------------------------------------------------------------------
+    # Rolling summary
+    # ------------------------------------------------------------------
+    def _pending_fold(self, user_id: str, conversation_id: str) -> Optional[Tuple[str, int, List[Any]]]:
+        """(old summary, its watermark, turns to fold) if enough turns sit behind the recent window."""
+        conn = get_connection()
+        cur = conn.cursor()
+        summary, through = self._summary_row(cur, user_id, conversation_id)
+        cur.execute(
+            "SELECT id, role, text FROM chat_messages "
+            "WHERE user_id = ? AND conversation_id = ? AND id > ? AND role IN ('user', 'assistant') "
+            "ORDER BY id",
+            (user_id, conversation_id, through),
+        )
+        rows = cur.fetchall()
+        conn.close()
+        older = rows[: max(0, len(rows) - self.recent_turns)]
+        if len(older) < self.summarize_every:
+            return None
+        return summary, through, older
+
+    def _store_summary(self, user_id: str, conversation_id: str, summary: str, old_through: int, new_through: int) -> bool:
+        """Write the new summary unless someone else already moved the watermark."""
+        conn = get_connection()
+        cur = conn.cursor()
+        now = datetime.utcnow().isoformat()
+        if old_through == 0:
+            cur.execute(
+                "INSERT OR IGNORE INTO chat_summaries (user_id, conversation_id, summary, summarized_through, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (user_id, conversation_id, summary, new_through, now),
+            )
+        else:
+            cur.execute(
+                "UPDATE chat_summaries SET summary = ?, summarized_through = ?, updated_at = ? "
+                "WHERE user_id = ? AND conversation_id = ? AND summarized_through = ?",
+                (summary, new_through, now, user_id, conversation_id, old_through),
+            )
+        written = cur.rowcount == 1
+        conn.commit()
+        conn.close()
+        return written
+
+    async def summarize(self, user_id: Any, summarizer: Summarizer, conversation_id: str = DEFAULT_CONVERSATION) -> bool:
+        """Fold the turns behind the recent window into the summary. Returns True if it did."""
+        user_id = str(user_id)
+        pending = await asyncio.to_thread(self._pending_fold, user_id, conversation_id)
+        if pending is None:
+            return False
+        summary, through, older = pending
+        transcript = "\n".join(f"{r['role']}: {self._clip(r['text'])}" for r in older)
+        new_summary = await summarizer([
+            lc_messages.SystemMessage(content=SUMMARY_SYSTEM_PROMPT),
+            lc_messages.HumanMessage(content=f"Current summary:\n{summary or '(none yet)'}\n\nNew turns:\n{transcript}"),
+        ])
+        written = await asyncio.to_thread(
+            self._store_summary, user_id, conversation_id, new_summary.strip(), through, older[-1]["id"]
+        )
+        if written:
+            self.summaries_written += 1
+            print(f"[ConversationMemory] 📝 Folded {len(older)} turns into the summary for user {user_id}")
+        return written
+
+    def schedule_summary(self, user_id: Any, summarizer: Summarizer, conversation_id: str = DEFAULT_CONVERSATION):
+        """Run summarize() in the background (at most one per conversation at a time)."""
+        if not self.enabled:
+            return
+        key = (str(user_id), conversation_id)
+        with self._lock:
+            if key in self._in_flight:
+                return
+            self._in_flight.add(key)
+
+        async def _run():
+            try:
+                await self.summarize(user_id, summarizer, conversation_id)
+            except Exception as e:
+                # The turns stay verbatim and are folded on a later attempt
+                self.summary_failures += 1
+                print(f"[ConversationMemory] ⚠️ Summary update failed for user {user_id}: {e}")
+            finally:
+                with self._lock:
+                    self._in_flight.discard(key)
+
+        task = asyncio.get_running_loop().create_task(_run())
+        # Keep a reference so the task is not garbage-collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "recent_turns": self.recent_turns,
+            "summaries_written": self.summaries_written,
+            "summary_failures": self.summary_failures,
+            "summaries_in_flight": len(self._in_flight),
+        }
+
+
+# Global instance
+conversation_memory = ConversationMemory.from_settings(settings)
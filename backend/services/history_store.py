@@ -0,0 +1,188 @@
+# backend/services/history_store.py
+"""
+Per-user chat history, persisted in SQLite.
+
+Messages live in the chat_messages table, keyed by user and conversation
+(the main chat is "default"; JSON page prompts get one conversation per
+page). Reads use keyset pagination on the autoincrement id
+(WHERE id < before_id ORDER BY id DESC LIMIT n), so every page costs the
+same however long the history is, and nothing is held in process memory.
+
+Each user also has a version counter (chat_history_versions), bumped on
+every write and delete. It is one primary-key lookup, so GET /api/history
+can answer conditional requests (ETag / If-None-Match -> 304) and since_id
+delta fetches without touching the messages. reset_version records the
+version of the last delete, so clients know when to drop their cache.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.core.config import settings
+from backend.db.db import get_connection
+
+DEFAULT_CONVERSATION = "default"
+
+
+@dataclass
+class HistoryPage:
+    messages: List[Dict[str, Any]] = field(default_factory=list)  # oldest first
+    next_before_id: Optional[int] = None  # pass back as before_id for the previous page
+    has_more: bool = False  # older messages exist (page) / newer messages exist (since)
+
+    @property
+    def last_id(self) -> Optional[int]:
+        return self.messages[-1]["id"] if self.messages else None
+
+
+class HistoryStore:
+    """Append-only chat history with cursor pagination."""
+
+    def __init__(self, page_size: int = 50, max_page_size: int = 200):
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    @classmethod
+    def from_settings(cls, settings) -> "HistoryStore":
+        return cls(page_size=settings.HISTORY_PAGE_SIZE, max_page_size=settings.HISTORY_MAX_PAGE_SIZE)
+
+    def init_db(self):
+        """Initialize chat_messages and chat_history_versions tables (called at startup)."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS chat_messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                conversation_id TEXT NOT NULL DEFAULT 'default',
+                role TEXT NOT NULL,
+                text TEXT NOT NULL,
+                created_at TEXT
+            )
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_chat_messages_user
+            ON chat_messages (user_id, conversation_id, id)
+        """)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS chat_history_versions (
+                user_id TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                reset_version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _bump(cur, user_id: str, reset: bool = False):
+        """Advance the user's version (in the caller's transaction)."""
+        if reset:
+            cur.execute(
+                "INSERT INTO chat_history_versions (user_id, version, reset_version) VALUES (?, 1, 1) "
+                "ON CONFLICT(user_id) DO UPDATE SET version = version + 1, reset_version = version + 1",
+                (user_id,),
+            )
+        else:
+            cur.execute(
+                "INSERT INTO chat_history_versions (user_id, version, reset_version) VALUES (?, 1, 0) "
+                "ON CONFLICT(user_id) DO UPDATE SET version = version + 1",
+                (user_id,),
+            )
+
+    def version(self, user_id: Any) -> Tuple[int, int]:
+        """(version, reset_version) of a user's history; (0, 0) if they never chatted."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT version, reset_version FROM chat_history_versions WHERE user_id = ?",
+            (str(user_id),),
+        )
+        row = cur.fetchone()
+        conn.close()
+        return (row["version"], row["reset_version"]) if row else (0, 0)
+
+    def append(self, user_id: Any, role: str, text: str, conversation_id: str = DEFAULT_CONVERSATION) -> int:
+        """Persist one message; returns its id."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            "INSERT INTO chat_messages (user_id, conversation_id, role, text, created_at) VALUES (?, ?, ?, ?, ?)",
+            (str(user_id), conversation_id, role, text, datetime.utcnow().isoformat()),
+        )
+        message_id = cur.lastrowid
+        self._bump(cur, str(user_id))
+        conn.commit()
+        conn.close()
+        return message_id
+
+    def page(
+        self,
+        user_id: Any,
+        conversation_id: str = DEFAULT_CONVERSATION,
+        before_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> HistoryPage:
+        """The newest `limit` messages older than before_id (None = the latest page)."""
+        limit = max(1, min(limit or self.page_size, self.max_page_size))
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, role, text, created_at FROM chat_messages "
+            "WHERE user_id = ? AND conversation_id = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (str(user_id), conversation_id, before_id if before_id is not None else 2 ** 63 - 1, limit + 1),
+        )
+        rows = cur.fetchall()
+        conn.close()
+
+        has_more = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        return HistoryPage(
+            messages=[dict(row) for row in rows],
+            next_before_id=rows[0]["id"] if has_more else None,
+            has_more=has_more,
+        )
+
+    def since(
+        self,
+        user_id: Any,
+        conversation_id: str = DEFAULT_CONVERSATION,
+        since_id: int = 0,
+        limit: Optional[int] = None,
+    ) -> HistoryPage:
+        """Messages newer than since_id, oldest first (has_more: there are even newer ones)."""
+        limit = max(1, min(limit or self.max_page_size, self.max_page_size))
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute(
+            "SELECT id, role, text, created_at FROM chat_messages "
+            "WHERE user_id = ? AND conversation_id = ? AND id > ? ORDER BY id LIMIT ?",
+            (str(user_id), conversation_id, since_id, limit + 1),
+        )
+        rows = cur.fetchall()
+        conn.close()
+        return HistoryPage(messages=[dict(row) for row in rows[:limit]], has_more=len(rows) > limit)
+
+    def delete(self, user_id: Any, conversation_id: Optional[str] = None) -> int:
+        """Delete a user's messages (one conversation or all); returns how many."""
+        conn = get_connection()
+        cur = conn.cursor()
+        if conversation_id is None:
+            cur.execute("DELETE FROM chat_messages WHERE user_id = ?", (str(user_id),))
+        else:
+            cur.execute(
+                "DELETE FROM chat_messages WHERE user_id = ? AND conversation_id = ?",
+                (str(user_id), conversation_id),
+            )
+        deleted = cur.rowcount
+        self._bump(cur, str(user_id), reset=True)
+        conn.commit()
+        conn.close()
+        return deleted
+
+
+# Global instance
+history_store = HistoryStore.from_settings(settings)
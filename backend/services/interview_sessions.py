@@ -0,0 +1,207 @@
+# backend/services/interview_sessions.py
+"""
+Server-side state of live voice interview sessions (WebSocket transport).
+
+A session is created once per interview, after a single JWT check, and
+keeps what every POST /api/chat used to resend: the user, the interview
+language and mode (and so the system prompt), and the recent turns. Each
+utterance is then one small WebSocket frame.
+
+Every frame sent to the client carries a sequence number and is kept in a
+bounded replay buffer. When the socket drops, the session stays in the
+registry (detached) for settings.WS_SESSION_TTL_SECONDS and any reply in
+progress keeps generating into the buffer; a client that reconnects with
+{session_id, last_seq} gets the frames it missed and carries on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import secrets
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from backend.core.config import settings
+from backend.services.speculation import speculative_prefetch
+
+# Instruction that the interview page used to prepend to every utterance
+INTERVIEW_STYLE_PROMPTS = {
+    "ar": (
+        "محادثة رسمية: يُرجى تقديم إجابة باللغة العربية الفُصحى بأسلوب مهني محترم، "
+        "على ألا تتجاوز ثلاث جُمل، مع الحفاظ على الطابع الرسمي."
+    ),
+    "en": "Live chat: reply in max 3 short sentences, direct and casual.",
+}
+
+
+@dataclass
+class InterviewSession:
+    session_id: str
+    user_id: int
+    username: str
+    language: str = "ar-SA"
+    mode: str = "free"
+    turns: Deque[Tuple[str, str]] = field(default_factory=deque)  # (role, text), oldest first
+    seq: int = 0
+    replay: Deque[Tuple[int, str]] = field(default_factory=deque)  # (seq, encoded frame)
+    websocket: Any = None
+    task: Optional[asyncio.Task] = None  # reply being generated, if any
+    speculation: Any = None  # speculation.Speculation started on interim text, if any
+    last_seen: float = field(default_factory=time.monotonic)
+    detached_at: Optional[float] = None
+    send_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def connected(self) -> bool:
+        return self.websocket is not None
+
+    @property
+    def lang_code(self) -> str:
+        return "ar" if self.language.lower().startswith("ar") else "en"
+
+    def style_prompt(self) -> str:
+        return INTERVIEW_STYLE_PROMPTS[self.lang_code]
+
+    def add_turn(self, role: str, text: str, limit: int):
+        self.turns.append((role, text))
+        while len(self.turns) > limit:
+            self.turns.popleft()
+
+    async def send(self, frame_type: str, replay: bool = True, **data: Any):
+        """
+        Send one frame. Replayable frames get the next sequence number and are
+        buffered even while detached; heartbeats are not.
+        """
+        frame: Dict[str, Any] = {"type": frame_type, **data}
+        async with self.send_lock:
+            if replay:
+                self.seq += 1
+                frame["seq"] = self.seq
+            encoded = json.dumps(frame, ensure_ascii=False)
+            if replay:
+                self.replay.append((self.seq, encoded))
+            websocket = self.websocket
+            if websocket is None:
+                return
+            try:
+                await websocket.send_text(encoded)
+            except Exception:
+                # The socket went away; the receive loop detaches the session
+                pass
+
+    def frames_after(self, last_seq: int) -> Tuple[List[str], bool]:
+        """Buffered frames newer than last_seq, and whether any were already dropped."""
+        frames = [encoded for seq, encoded in self.replay if seq > last_seq]
+        return frames, bool(self.replay) and self.replay[0][0] > last_seq + 1
+
+
+class InterviewSessionStore:
+    """Registry of live interview sessions, with a grace period for reconnects."""
+
+    def __init__(self, session_ttl: float = 120.0, replay_buffer: int = 512, recent_turns: int = 8):
+        self.session_ttl = session_ttl
+        self.replay_buffer = replay_buffer
+        self.recent_turns = recent_turns
+        self._sessions: Dict[str, InterviewSession] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.sessions_created = 0
+        self.resumes = 0
+        self.resume_failures = 0
+        self.turns = 0
+        self.expired = 0
+
+    @classmethod
+    def from_settings(cls, settings) -> "InterviewSessionStore":
+        return cls(
+            session_ttl=settings.WS_SESSION_TTL_SECONDS,
+            replay_buffer=settings.WS_REPLAY_BUFFER,
+            recent_turns=settings.WS_RECENT_TURNS,
+        )
+
+    def create(self, user_id: int, username: str, language: str, mode: str) -> InterviewSession:
+        session = InterviewSession(
+            session_id=secrets.token_urlsafe(16),
+            user_id=user_id,
+            username=username,
+            language=language,
+            mode=mode,
+            replay=deque(maxlen=self.replay_buffer),
+        )
+        # Also evicts sessions that were abandoned and will never be resumed
+        self.sweep()
+        with self._lock:
+            self._sessions[session.session_id] = session
+            self.sessions_created += 1
+        return session
+
+    def resume(self, session_id: str, user_id: int) -> Optional[InterviewSession]:
+        """The caller's detached (or stale) session, if it has not expired."""
+        self.sweep()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.user_id != user_id:
+                self.resume_failures += 1
+                return None
+            self.resumes += 1
+            return session
+
+    def attach(self, session: InterviewSession, websocket: Any):
+        session.websocket = websocket
+        session.detached_at = None
+        session.last_seen = time.monotonic()
+
+    def detach(self, session: InterviewSession, websocket: Any):
+        """Called when a socket closes; a newer socket may already own the session."""
+        if session.websocket is websocket:
+            session.websocket = None
+            session.detached_at = time.monotonic()
+
+    def close(self, session: InterviewSession):
+        """End a session for good (client said goodbye)."""
+        with self._lock:
+            self._sessions.pop(session.session_id, None)
+        self._cancel(session)
+
+    @staticmethod
+    def _cancel(session: InterviewSession):
+        if session.task is not None and not session.task.done():
+            session.task.cancel()
+        speculative_prefetch.discard(session.speculation)
+        session.speculation = None
+
+    def sweep(self):
+        """Drop sessions that stayed detached longer than the TTL."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                s for s in self._sessions.values()
+                if s.detached_at is not None and now - s.detached_at > self.session_ttl
+            ]
+            for session in expired:
+                del self._sessions[session.session_id]
+            self.expired += len(expired)
+        for session in expired:
+            self._cancel(session)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "sessions": len(sessions),
+            "connected": sum(1 for s in sessions if s.connected),
+            "sessions_created": self.sessions_created,
+            "resumes": self.resumes,
+            "resume_failures": self.resume_failures,
+            "turns": self.turns,
+            "expired": self.expired,
+        }
+
+
+# Global instance
+interview_sessions = InterviewSessionStore.from_settings(settings)
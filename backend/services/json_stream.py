@@ -0,0 +1,144 @@
+# backend/services/json_stream.py
+"""
+Incremental JSON array item extraction for streamed LLM output.
+
+JSON-mode replies look like {"phases": [{...}, {...}]} or
+{"questions": ["...", "..."]}. JsonItemStreamer is fed the reply token by
+token and returns each element of those arrays as soon as its closing
+bracket/quote arrives, so the page can render phase 1 while the model is
+still writing phase 5. Anything before the first "{" or "[" (prose, a
+```json fence) is ignored; elements that fail to parse are skipped.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Top-level keys whose array elements are streamed
+DEFAULT_ITEM_KEYS = ("phases", "questions")
+
+_WHITESPACE = " \t\r\n"
+
+
+class _Frame:
+    __slots__ = ("kind", "key", "member_key", "expect_key", "target", "index", "item_start")
+
+    def __init__(self, kind: str, key: Optional[str] = None, target: bool = False):
+        self.kind = kind                # "{" or "["
+        self.key = key                  # for arrays: the object key they sit under
+        self.member_key: Optional[str] = None  # for objects: key of the current member
+        self.expect_key = kind == "{"
+        self.target = target            # array whose elements we emit
+        self.index = 0
+        self.item_start: Optional[int] = None
+
+
+class JsonItemStreamer:
+    """Feeds text chunks, returns (key, index, item) for every completed array element."""
+
+    def __init__(self, keys: Iterable[str] = DEFAULT_ITEM_KEYS):
+        self.keys = set(keys)
+        self.buffer = ""
+        self.pos = 0
+        self.started = False
+        self.stack: List[_Frame] = []
+        self.in_string = False
+        self.escape = False
+        self.string_start = 0
+        self.done = False
+        self.skipped = 0
+
+    # ------------------------------------------------------------------
+    def feed(self, chunk: str) -> List[Tuple[Optional[str], int, Any]]:
+        """Add a chunk of model output; return the elements completed by it."""
+        self.buffer += chunk
+        items: List[Tuple[Optional[str], int, Any]] = []
+        while self.pos < len(self.buffer) and not self.done:
+            self._step(self.buffer[self.pos], items)
+            self.pos += 1
+        return items
+
+    def _emit(self, frame: _Frame, end: int, items: list):
+        raw = self.buffer[frame.item_start:end].strip()
+        frame.item_start = None
+        if not raw:
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            self.skipped += 1
+            return
+        items.append((frame.key, frame.index, value))
+        frame.index += 1
+
+    def _step(self, ch: str, items: list):
+        pos = self.pos
+        top = self.stack[-1] if self.stack else None
+
+        if self.in_string:
+            if self.escape:
+                self.escape = False
+            elif ch == "\\":
+                self.escape = True
+            elif ch == '"':
+                self.in_string = False
+                if top is not None and top.kind == "{" and top.expect_key:
+                    try:
+                        top.member_key = json.loads(self.buffer[self.string_start:pos + 1])
+                    except ValueError:
+                        top.member_key = None
+                elif top is not None and top.target and top.item_start == self.string_start:
+                    # A string element of a target array (e.g. one question)
+                    self._emit(top, pos + 1, items)
+            return
+
+        if not self.started:
+            # Skip prose / code fences until the document starts
+            if ch not in "{[":
+                return
+            self.started = True
+
+        if ch in _WHITESPACE:
+            return
+
+        # First character of a new element in a target array
+        if top is not None and top.target and top.item_start is None and ch not in ",]":
+            top.item_start = pos
+
+        if ch == '"':
+            self.in_string = True
+            self.string_start = pos
+        elif ch == "{":
+            self.stack.append(_Frame("{"))
+        elif ch == "[":
+            if top is None:
+                # Bare top-level array: stream its elements too
+                self.stack.append(_Frame("[", key=None, target=True))
+            else:
+                key = top.member_key if top.kind == "{" else None
+                target = top.kind == "{" and len(self.stack) == 1 and key in self.keys
+                self.stack.append(_Frame("[", key=key, target=target))
+        elif ch == ":":
+            if top is not None and top.kind == "{":
+                top.expect_key = False
+        elif ch == ",":
+            if top is None:
+                return
+            if top.kind == "{":
+                top.expect_key = True
+            elif top.target and top.item_start is not None:
+                # End of a scalar element (number / true / false / null)
+                self._emit(top, pos, items)
+        elif ch in "}]":
+            if top is None:
+                return
+            if top.target and top.item_start is not None:
+                self._emit(top, pos, items)
+            self.stack.pop()
+            parent = self.stack[-1] if self.stack else None
+            if parent is None:
+                self.done = True
+            elif parent.target and parent.item_start is not None:
+                # A nested object/array element just closed
+                self._emit(parent, pos + 1, items)
@@ -1,13 +1,19 @@
 # backend/services/langchain_adapter.py
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import Any, List, Dict, Optional
+from collections import deque
+import asyncio
 import json
+import threading
+import time
 from datetime import datetime
 
+from pydantic import BaseModel, ValidationError
+
 # ---- LangChain modern imports ----from langchain_nvidia_ai_endpoints import ChatNVIDIA, NVIDIAEmbeddings
 
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.prompts import ChatPromptTemplate
@@ -18,6 +24,11 @@ from backend.core.config import settings
 from backend.db.db import get_connection
 from backend.services.rag_manager import RAGManager
 from backend.services.prompt_manager import prompt_manager
+from backend.services.skill_extractor import skill_extractor
+from backend.services.context_builder import get_context_assembler
+from backend.services.singleflight import SingleFlight, make_key
+from backend.services.llm_clients import build_embeddings
+from backend.services.admission import AdmissionRejected, admission
 
 
 # =====================================================
@@ -28,6 +39,8 @@ from backend.services.prompt_manager import prompt_manager
 chat = None
 embeddings = None
 rag_manager = None
+# Callers in several threads must not each build a RAGManager (each would start an indexer)
+_clients_lock = threading.Lock()
 
 def _ensure_openai_clients():
     """Lazy initialization of OpenAI clients - only when API key is available."""
@@ -39,20 +52,30 @@ def _ensure_openai_clients():
             "or create a .env file with OPENAI_API_KEY=your_key_here"
         )
     
-    if chat is None:
-        chat = ChatOpenAI(
-            model=settings.OPENAI_MODEL,
-            api_key=settings.OPENAI_API_KEY,
-            temperature=0.7
-        )
-    
-    if embeddings is None:
-        embeddings = OpenAIEmbeddings(
-            api_key=settings.OPENAI_API_KEY
-        )
-    
-    if rag_manager is None:
-        rag_manager = RAGManager(embeddings=embeddings)
+    with _clients_lock:
+        if chat is None:
+            chat = ChatOpenAI(
+                model=settings.OPENAI_MODEL,
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL,
+                temperature=0.7
+            )
+
+        if embeddings is None:
+            embeddings = build_embeddings(settings)
+
+        if rag_manager is None:
+            rag_manager = RAGManager(embeddings=embeddings)
+
+
+async def _aensure_openai_clients():
+    """_ensure_openai_clients for coroutines: the first call loads the FAISS index, so it runs in a thread."""
+    if chat is None or embeddings is None or rag_manager is None:
+        await asyncio.get_running_loop().run_in_executor(None, _ensure_openai_clients)
+
+# Coalesces concurrent analyze_skills_with_ai calls for the same skill set
+analyze_singleflight = SingleFlight("analyze_skills")
+
 
 # Text splitter for chunking longer content
 text_splitter = RecursiveCharacterTextSplitter(
@@ -64,10 +87,11 @@ text_splitter = RecursiveCharacterTextSplitter(
 # =====================================================
 # ANALYZE SKILLS WITH AI
 # =====================================================
-def analyze_skills_with_ai(skills: List[str]) -> Dict:
+def analyze_skills_with_ai(skills: List[str], user_id: Optional[Any] = None) -> Dict:
     """
     Use the LLM to analyze given skills and suggest relevant job titles
-    and technical interview questions.
+    and technical interview questions. user_id is used for admission control
+    (AdmissionRejected propagates so the API can answer 429).
     """
     _ensure_openai_clients()  # Ensure clients are initialized
     
@@ -85,18 +109,26 @@ def analyze_skills_with_ai(skills: List[str]) -> Dict:
         HumanMessage(content=f"Skills to analyze: {skill_list}")
     ]
 
-    try:
-        response = chat.invoke(messages)
-        result = json.loads(response.content)
-        return {
-            "titles": result.get("titles", [])[:5],
-            "questions": result.get("questions", [])[:5]
-        }
-    except json.JSONDecodeError:
-        # fallback if model didn't return valid JSON
-        return {"titles": [], "questions": []}
-    except Exception as e:
-        return {"error": str(e)}
+    def _analyze() -> Dict:
+        # Outside the try: a rejection must not be turned into an "error" result
+        with admission.slot_sync(user_id if user_id is not None else "anonymous"):
+            try:
+                response = chat.invoke(messages)
+                result = json.loads(response.content)
+                return {
+                    "titles": result.get("titles", [])[:5],
+                    "questions": result.get("questions", [])[:5]
+                }
+            except json.JSONDecodeError:
+                # fallback if model didn't return valid JSON
+                return {"titles": [], "questions": []}
+            except Exception as e:
+                return {"error": str(e)}
+
+    # Identical skill lists analyzed concurrently share one LLM call
+    key = make_key(*sorted(s.strip().lower() for s in skills))
+    # (a rejection of the leader's user is not passed on to the other callers)
+    return dict(analyze_singleflight.do_sync(key, _analyze, retry_on=(AdmissionRejected,)))
 
 
 # =====================================================
@@ -117,47 +149,286 @@ def get_relevant_chat_history(query: str, limit: int = 3) -> List[str]:
 
 
 # =====================================================
-# GENERATE CHAT RESPONSE
+# GENERATE CHAT RESPONSE (async DAG)
 # =====================================================
-def generate_chat_response(user_message: str) -> str:
+#
+#   retrieval ──> local skills ──> [LLM skill fallback] ──> follow-ups ──> answer
+#
+# Skills come from the local dictionary extractor (microseconds), run over the
+# retrieved history plus the user message. Only when that finds nothing is
+# the LLM asked to extract skills, from the same text; it is started after
+# retrieval so it never costs a call (or an admission slot) that the local
+# match or a new conversation makes unnecessary. A new conversation (no
+# history) skips the skill branch.
+
+CHAT_SYSTEM_PROMPT = (
+    "You are a career advisor and technical interviewer helping users with job-related questions.\n"
+    "Use the provided chat history for context and follow these guidelines:\n"
+    "1. If this is a new conversation, use an initial assessment prompt.\n"
+    "2. When skills are mentioned, ask relevant follow-up questions.\n"
+    "3. Guide users through skill assessment before making job suggestions.\n"
+    "4. Give detailed, actionable advice specific to mentioned technologies.\n"
+    "5. If appropriate, probe for experience level with specific skills."
+)
+
+
+class StageTimings:
+    """Rolling per-stage latencies of the chat pipeline."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self.window)).append(seconds)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for stage, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[stage] = {
+                    "count": len(ordered),
+                    "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+                    "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+                }
+            return result
+
+
+pipeline_timings = StageTimings()
+
+
+async def _timed(stage: str, timings: Dict[str, float], awaitable):
+    """Await a pipeline stage and record how long it took."""
+    start = time.perf_counter()
+    result = await awaitable
+    # Only completed stages are recorded (cancelled branches would skew the numbers)
+    elapsed = time.perf_counter() - start
+    timings[stage] = round(elapsed * 1000, 1)
+    pipeline_timings.record(stage, elapsed)
+    return result
+
+
+async def _ainvoke(messages, user_id: Optional[Any] = None):
+    """Async chat call through the shared LLM admission controller."""
+    async with admission.slot(user_id if user_id is not None else "anonymous"):
+        return await chat.ainvoke(messages)
+
+
+async def _extract_skills_llm(conversation: str, user_id: Optional[Any] = None) -> List[str]:
+    """LLM fallback for conversations the local skill dictionary knows nothing about."""
+    skill_extraction_prompt = (
+        "Extract any technical skills mentioned in the following text:\n"
+        f"{conversation}\n"
+        "List the skills as a comma-separated list."
+    )
+    skills_response = await _ainvoke([HumanMessage(content=skill_extraction_prompt)], user_id)
+    return [s.strip() for s in skills_response.content.split(",") if s.strip()]
+
+
+def _follow_ups(skills: List[str]) -> List[str]:
+    """Collect prompt-manager follow-up questions for the detected skills."""
+    follow_ups: List[str] = []
+    for skill in skills:
+        for question in prompt_manager.get_follow_up_questions(skill):
+            if question not in follow_ups:
+                follow_ups.append(question)
+    return follow_ups
+
+
+async def _run_pipeline(user_message: str, user_id: Optional[Any] = None) -> str:
+    await _aensure_openai_clients()  # Ensure clients are initialized
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    retrieval = asyncio.ensure_future(_timed(
+        "retrieval", timings, asyncio.to_thread(get_relevant_chat_history, user_message)
+    ))
+
+    try:
+        relevant_history = await retrieval
+
+        # Pack retrieved history into the model's token budget (deduplicated)
+        assembled = get_context_assembler(settings.OPENAI_MODEL).assemble(
+            system_prompt=CHAT_SYSTEM_PROMPT,
+            user_message=user_message,
+            snippets=relevant_history,
+        )
+        print(f"[ContextAssembler] Token usage: {assembled.token_usage}")
+        user_message = assembled.user_message
+        context = assembled.context or "No relevant history found."
+
+        # ---- Case 1: New conversation (follow-ups are not used) ----
+        if not relevant_history:
+            initial_prompt = prompt_manager.get_initial_prompt()
+            messages = [
+                SystemMessage(content=CHAT_SYSTEM_PROMPT),
+                HumanMessage(content=f"New conversation started. User said: {user_message}"),
+                SystemMessage(content=f"Use this initial prompt: {initial_prompt}")
+            ]
+        # ---- Case 2: Existing conversation ----
+        else:
+            conversation = f"{context}\n{user_message}"
+            start = time.perf_counter()
+            skills = skill_extractor.extract(conversation)
+            timings["skills_local"] = round((time.perf_counter() - start) * 1000, 3)
+            if not skills:
+                try:
+                    skills = await _timed("skills_llm", timings, _extract_skills_llm(conversation, user_id))
+                except Exception as e:
+                    # Follow-ups are optional: answer without them
+                    print(f"[ChatPipeline] Skill extraction failed: {e}")
+            questions = _follow_ups(skills)
+            messages = [
+                SystemMessage(content=CHAT_SYSTEM_PROMPT),
+                SystemMessage(content=f"Relevant chat history:\n{context}"),
+                HumanMessage(content=user_message)
+            ]
+            if questions:
+                messages.append(SystemMessage(
+                    content="If it fits the conversation, ask one of these follow-up questions:\n"
+                    + "\n".join(f"- {q}" for q in questions[:3])
+                ))
+
+        response = await _timed("answer", timings, _ainvoke(messages, user_id))
+    finally:
+        # Cancelled or failed callers must not leave retrieval running
+        if not retrieval.done():
+            retrieval.cancel()
+
+    total = time.perf_counter() - started
+    pipeline_timings.record("total", total)
+    timings["total"] = round(total * 1000, 1)
+    print(f"[ChatPipeline] ⏱️ Stage timings (ms): {timings}")
+    return response.content
+
+
+# The pooled async OpenAI client must always be driven from the same event
+# loop, so every pipeline run (async or sync caller) executes on this one
+_pipeline_loop: Optional[asyncio.AbstractEventLoop] = None
+_pipeline_loop_lock = threading.Lock()
+
+
+def _get_pipeline_loop() -> asyncio.AbstractEventLoop:
+    global _pipeline_loop
+    with _pipeline_loop_lock:
+        if _pipeline_loop is None:
+            _pipeline_loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_pipeline_loop.run_forever,
+                name="chat-pipeline-loop",
+                daemon=True,
+            ).start()
+        return _pipeline_loop
+
+
+async def agenerate_chat_response(user_message: str, user_id: Optional[Any] = None) -> str:
     """
     Generate a contextual chat response that:
     - Uses retrieved conversation history
     - Adapts follow-up prompts based on detected skills
     - Provides detailed, actionable career advice
+    Independent stages run concurrently; see the DAG above.
     """
-    _ensure_openai_clients()  # Ensure clients are initialized
+    future = asyncio.run_coroutine_threadsafe(_run_pipeline(user_message, user_id), _get_pipeline_loop())
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
 
-    # Retrieve context
-    relevant_history = get_relevant_chat_history(user_message)
-    context = "\n".join(relevant_history) if relevant_history else "No relevant history found."
 
-    system_prompt = (
-        "You are a career advisor and technical interviewer helping users with job-related questions.\n"
-        "Use the provided chat history for context and follow these guidelines:\n"
-        "1. If this is a new conversation, use an initial assessment prompt.\n"
-        "2. When skills are mentioned, ask relevant follow-up questions.\n"
-        "3. Guide users through skill assessment before making job suggestions.\n"
-        "4. Give detailed, actionable advice specific to mentioned technologies.\n"
-        "5. If appropriate, probe for experience level with specific skills."
+def generate_chat_response(user_message: str, user_id: Optional[Any] = None) -> str:
+    """Blocking wrapper around agenerate_chat_response (for threads and scripts)."""
+    future = asyncio.run_coroutine_threadsafe(_run_pipeline(user_message, user_id), _get_pipeline_loop())
+    return future.result()
+
+
+# =====================================================
+# BULK SKILL ANALYSIS (batched prompts)
+# =====================================================
+SKILLS_BATCH_SYSTEM_PROMPT = (
+    "You are a career advisor and technical interviewer.\n"
+    "You will receive a JSON object with a list of candidates, each with an id and a list of skills.\n"
+    "For EACH candidate, suggest up to 5 suitable job titles ranked by relevance and up to 5 "
+    "technical interview questions specific to that candidate's skills.\n"
+    "Return ONLY a JSON object of exactly this shape, with one entry per candidate id:\n"
+    '{"results": [{"id": <candidate id>, "titles": ["..."], "questions": ["..."]}]}'
+)
+
+
+class _CandidateAnalysis(BaseModel):
+    """Schema every entry of a batched reply must satisfy."""
+    id: int
+    titles: List[str]
+    questions: List[str]
+
+
+def _parse_batch_reply(content: str, ids: List[int]) -> Dict[int, Dict]:
+    """Validate a batched reply; returns the analyses that came back well-formed, by id."""
+    start, end = content.find("{"), content.rfind("}")
+    try:
+        data = json.loads(content[start:end + 1]) if start != -1 else {}
+    except json.JSONDecodeError:
+        return {}
+    entries = data.get("results") if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        return {}
+
+    parsed: Dict[int, Dict] = {}
+    for entry in entries:
+        try:
+            item = _CandidateAnalysis.model_validate(entry)
+        except ValidationError:
+            continue
+        if item.id in ids and item.id not in parsed:
+            parsed[item.id] = {"titles": item.titles[:5], "questions": item.questions[:5]}
+    return parsed
+
+
+async def _analyze_batch(skill_sets: List[List[str]], user_id: Optional[Any] = None, retry: bool = True) -> List[Dict]:
+    """
+    One LLM call for several skill sets; one result (or {"error": ...}) per set, in order.
+    Sets missing from the reply are retried once, together in a second call.
+    """
+    ids = list(range(len(skill_sets)))
+    payload = json.dumps(
+        {"candidates": [{"id": i, "skills": skills} for i, skills in zip(ids, skill_sets)]},
+        ensure_ascii=False,
     )
+    response = await _ainvoke(
+        [SystemMessage(content=SKILLS_BATCH_SYSTEM_PROMPT), HumanMessage(content=payload)],
+        user_id,
+    )
+    parsed = _parse_batch_reply(response.content, ids)
 
-    # ---- Case 1: New conversation ----
-    if not relevant_history:
-        initial_prompt = prompt_manager.get_initial_prompt()
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"New conversation started. User said: {user_message}"),
-            SystemMessage(content=f"Use this initial prompt: {initial_prompt}")
-        ]
-        response = chat.invoke(messages)
-        return response.content
+    missing = [i for i in ids if i not in parsed]
+    if missing and retry and len(skill_sets) > 1:
+        # Retry the sets the model dropped or mangled, so one bad entry does not
+        # fail the whole batch. One call for all of them: a call per set would
+        # take that many admission slots at once and overrun the per-user queue.
+        try:
+            retried = await _analyze_batch([skill_sets[i] for i in missing], user_id, retry=False)
+        except Exception as e:
+            retried = [{"error": str(e)}] * len(missing)
+        parsed.update(zip(missing, retried))
 
-    # ---- Case 2: Existing conversation ----
-    # Extract skills mentioned in conversation
-    all_text = f"{context}\n{user_message}"
-    skill_extraction_prompt = (
-        "Extract any technical skills mentioned in the following text:\n"
-        f"{all_text}\n"
-        "List the skills as a comma-separated list."
-    )
\ No newline at end of file
+    return [parsed.get(i, {"error": "Model returned no valid analysis for these skills"}) for i in ids]
+
+
+async def aanalyze_skills_batch(skill_sets: List[List[str]], user_id: Optional[Any] = None) -> List[Dict]:
+    """
+    Analyze several skill sets with a single LLM prompt (see analyze_skills_with_ai
+    for the per-set result shape). Runs on the shared pipeline loop; every call
+    goes through admission control.
+    """
+    await _aensure_openai_clients()  # Ensure clients are initialized
+    future = asyncio.run_coroutine_threadsafe(_analyze_batch(skill_sets, user_id), _get_pipeline_loop())
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
@@ -0,0 +1,128 @@
+# backend/services/leader_lease.py
+"""
+Leader election between worker processes, through a lease row in SQLite.
+
+With `uvicorn --workers N` every worker is its own process, so anything
+that must happen once (the chat index's background embedding) needs one
+elected owner. The owner holds a row in the `leases` table of the chat DB
+(name, holder, expires_at) and keeps renewing it well before it expires.
+If the process dies, the row expires, and another process takes over at
+most `ttl` seconds later.
+
+Acquiring and renewing are a single conditional UPSERT, so two processes
+can never both hold the same lease.
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backend.db.db import get_connection
+
+
+class LeaderLease:
+    """A named, expiring lease; whoever holds it is the leader for that job."""
+
+    def __init__(self, name: str, ttl: float = 30.0, holder: Optional[str] = None):
+        self.name = name
+        self.ttl = ttl
+        # Unique per instance, readable in the table: host:pid:random
+        self.holder = holder or f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self._held_until = 0.0  # time.monotonic() deadline of our current term
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.terms = 0   # times this instance became leader
+        self.losses = 0  # times it found the lease taken over
+
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize leases table."""
+        conn = get_connection()
+        cur = conn.cursor()
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS leases (
+                name TEXT PRIMARY KEY,
+                holder TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+    @property
+    def is_leader(self) -> bool:
+        """Holds the lease right now (by the local clock, with the term measured from before the write)."""
+        return time.monotonic() < self._held_until
+
+    def acquire(self) -> bool:
+        """Take the lease if it is free or expired, or renew it if already ours. True if held."""
+        with self._lock:
+            started = time.monotonic()
+            now = time.time()
+            was_leader = self.is_leader
+            try:
+                conn = get_connection()
+                try:
+                    cur = conn.cursor()
+                    cur.execute(
+                        "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+                        "WHERE leases.holder = excluded.holder OR leases.expires_at < ?",
+                        (self.name, self.holder, now + self.ttl, now),
+                    )
+                    conn.commit()
+                    won = cur.rowcount == 1
+                finally:
+                    conn.close()
+            except Exception as e:
+                # Locked / unavailable DB: keep the term we have, it still expires on time
+                print(f"[LeaderLease] ⚠️ Could not renew lease '{self.name}': {e}")
+                return self.is_leader
+
+            if won:
+                self._held_until = started + self.ttl
+                if not was_leader:
+                    self.terms += 1
+                    print(f"[LeaderLease] 👑 {self.holder} now holds '{self.name}'")
+            else:
+                if was_leader:
+                    self.losses += 1
+                    print(f"[LeaderLease] ⚠️ {self.holder} lost '{self.name}'")
+                self._held_until = 0.0
+            return won
+
+    def release(self):
+        """Give the lease up (on shutdown) so another process can take over right away."""
+        with self._lock:
+            self._held_until = 0.0
+            try:
+                conn = get_connection()
+                conn.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (self.name, self.holder))
+                conn.commit()
+                conn.close()
+            except Exception as e:
+                print(f"[LeaderLease] Error releasing lease '{self.name}': {e}")
+
+    def current_holder(self) -> Optional[str]:
+        conn = get_connection()
+        row = conn.execute(
+            "SELECT holder FROM leases WHERE name = ? AND expires_at >= ?", (self.name, time.time())
+        ).fetchone()
+        conn.close()
+        return row["holder"] if row else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "holder": self.holder,
+            "leader": self.is_leader,
+            "terms": self.terms,
+            "losses": self.losses,
+        }
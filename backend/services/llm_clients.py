@@ -0,0 +1,144 @@
+# backend/services/llm_clients.py
+"""
+Process-wide pool of async LLM clients.
+
+One long-lived ChatOpenAI client per provider, each backed by its own bounded
+httpx.AsyncClient, so requests reuse keep-alive connections (no TLS handshake
+per request) and never block a threadpool worker while waiting on the model.
+Created once in the FastAPI startup event and kept on app.state.llm_pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List, Optional
+
+import httpx
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+
+class LLMClientPool:
+    """Holds one pooled async chat client per provider ("openai", "nvidia")."""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        timeout: float = 60.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = timeout
+        self._http: Dict[str, httpx.AsyncClient] = {}
+        self._chat: Dict[str, ChatOpenAI] = {}
+        self._models: Dict[str, str] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "LLMClientPool":
+        """Build the pool and register every provider that has an API key."""
+        pool = cls(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            timeout=settings.LLM_REQUEST_TIMEOUT,
+        )
+        if settings.is_openai_configured():
+            pool.register(
+                "openai",
+                api_key=settings.OPENAI_API_KEY,
+                model=settings.OPENAI_MODEL,
+                base_url=settings.OPENAI_BASE_URL,
+            )
+        if settings.is_nvidia_configured():
+            # NIM exposes an OpenAI-compatible API, so the same client works
+            pool.register(
+                "nvidia",
+                api_key=settings.NVIDIA_API_KEY,
+                model=settings.NVIDIA_MODEL,
+                base_url=settings.NIM_BASE_URL,
+            )
+        return pool
+
+    def register(
+        self,
+        provider: str,
+        api_key: str,
+        model: str,
+        base_url: Optional[str] = None,
+        temperature: float = 0.7,
+    ):
+        """Create the pooled HTTP client and chat client for a provider."""
+        http_client = httpx.AsyncClient(
+            base_url=base_url or "https://api.openai.com/v1",
+            headers={"Authorization": f"Bearer {api_key}"},
+            limits=self.limits,
+            timeout=self.timeout,
+        )
+        self._http[provider] = http_client
+        self._models[provider] = model
+        self._chat[provider] = ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            api_key=api_key,
+            base_url=base_url,
+            timeout=self.timeout,
+            http_async_client=http_client,
+        )
+        print(f"[LLMClientPool] Registered provider '{provider}' (model={model})")
+
+    def has(self, provider: str) -> bool:
+        return provider in self._chat
+
+    @property
+    def providers(self) -> List[str]:
+        return list(self._chat.keys())
+
+    def get(self, provider: str = "openai") -> ChatOpenAI:
+        """Return the shared chat client for a provider."""
+        try:
+            return self._chat[provider]
+        except KeyError:
+            raise ValueError(f"LLM provider '{provider}' is not configured")
+
+    def http(self, provider: str) -> httpx.AsyncClient:
+        """Return the raw pooled HTTP client (OpenAI-compatible base URL + auth)."""
+        try:
+            return self._http[provider]
+        except KeyError:
+            raise ValueError(f"LLM provider '{provider}' is not configured")
+
+    def model(self, provider: str) -> str:
+        return self._models[provider]
+
+    async def warm(self, provider: str, connections: int = 1) -> List[int]:
+        """
+        Open `connections` keep-alive connections to a provider (TLS handshake
+        included) ahead of the first chat request; returns the HTTP statuses.
+        Any HTTP answer counts: only the connection matters here.
+        """
+        client = self.http(provider)
+        responses = await asyncio.gather(*(client.get("/models") for _ in range(max(1, connections))))
+        return [response.status_code for response in responses]
+
+    async def aclose(self):
+        """Close every pooled connection (called from the shutdown event)."""
+        for provider, client in self._http.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"[LLMClientPool] Error closing '{provider}' client: {e}")
+        self._http.clear()
+        self._chat.clear()
+        self._models.clear()
+
+
+def build_embeddings(settings) -> OpenAIEmbeddings:
+    """OpenAI embeddings client honouring OPENAI_BASE_URL (real API or the mock server)."""
+    return OpenAIEmbeddings(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL,
+        # Client-side tiktoken chunking only makes sense against the real API;
+        # OpenAI-compatible stand-ins get the raw strings
+        check_embedding_ctx_length=settings.OPENAI_BASE_URL is None,
+    )
@@ -0,0 +1,291 @@
+# backend/services/llm_router.py
+"""
+Latency-aware routing across LLM providers with hedged requests.
+
+The router tracks a rolling window of latencies and errors per provider/model
+and sends each request to the fastest healthy backend. Model tiering can
+swap the model per request (gpt-4.1-nano for voice turns, the full model
+for roadmaps), so each (provider, model) pair keeps its own statistics and
+a request is ranked and hedged on the numbers of the models it will use. If the primary has not
+answered within the hedge delay, a duplicate request is fired at the next best
+backend and whichever answers first wins (the other one is cancelled).
+Backends are the pooled clients from LLMClientPool (OpenAI, NVIDIA NIM, or any
+OpenAI-compatible stand-in configured through the *_BASE_URL settings).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+
+def _percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BackendStats:
+    """Rolling latency / error statistics for one provider + model."""
+
+    def __init__(self, window: int = 100, error_threshold: float = 0.5, cooldown: float = 30.0):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.error_threshold = error_threshold
+        self.cooldown = cooldown
+        self.last_error_at = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    def fresh(self) -> "BackendStats":
+        """Empty statistics with the same window and thresholds."""
+        return BackendStats(window=self.latencies.maxlen, error_threshold=self.error_threshold, cooldown=self.cooldown)
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.requests += 1
+
+    def record_censored(self, elapsed: float):
+        """Record a cancelled call: it took *at least* elapsed seconds."""
+        self.latencies.append(elapsed)
+
+    def record_error(self):
+        self.outcomes.append(False)
+        self.last_error_at = time.monotonic()
+        self.requests += 1
+        self.errors += 1
+
+    @property
+    def p50(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 50)
+
+    @property
+    def p95(self) -> Optional[float]:
+        return _percentile(list(self.latencies), 95)
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def healthy(self) -> bool:
+        if self.error_rate <= self.error_threshold:
+            return True
+        # Half-open: let traffic probe again once the cooldown has passed
+        return time.monotonic() - self.last_error_at > self.cooldown
+
+    def as_dict(self) -> Dict[str, Any]:
+        p50, p95 = self.p50, self.p95
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "healthy": self.healthy,
+        }
+
+
+@dataclass
+class LLMBackend:
+    provider: str
+    model: str
+    client: Any
+    stats: BackendStats = field(default_factory=BackendStats)
+    # Statistics of the tier models requested instead of `model`, by model name
+    model_stats: Dict[str, BackendStats] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    def model_for(self, models: Optional[Dict[str, str]]) -> str:
+        """The model this backend runs for a request (model tiering may override it)."""
+        if models and self.provider in models:
+            return models[self.provider]
+        return self.model
+
+    def stats_for(self, model: str) -> BackendStats:
+        if model == self.model:
+            return self.stats
+        if model not in self.model_stats:
+            self.model_stats[model] = self.stats.fresh()
+        return self.model_stats[model]
+
+    def all_stats(self) -> Dict[str, BackendStats]:
+        """provider:model -> statistics, for every model this backend has run."""
+        return {
+            f"{self.provider}:{model}": stats
+            for model, stats in {self.model: self.stats, **self.model_stats}.items()
+        }
+
+
+class LLMRouter:
+    """Routes chat calls to the fastest healthy backend, hedging slow requests."""
+
+    def __init__(self, backends: List[LLMBackend], hedge_delay: Optional[float] = 1.5):
+        if not backends:
+            raise ValueError("LLMRouter needs at least one backend")
+        self.backends = backends
+        # None -> adaptive: hedge after the primary's own p95
+        self.hedge_delay = hedge_delay
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @classmethod
+    def from_pool(cls, pool, settings) -> "LLMRouter":
+        backends = [
+            LLMBackend(
+                provider=provider,
+                model=pool.model(provider),
+                client=pool.get(provider),
+                stats=BackendStats(
+                    window=settings.LLM_ROUTER_WINDOW,
+                    error_threshold=settings.LLM_ROUTER_ERROR_THRESHOLD,
+                    cooldown=settings.LLM_ROUTER_COOLDOWN_SECONDS,
+                ),
+            )
+            for provider in pool.providers
+        ]
+        delay_ms = settings.LLM_HEDGE_DELAY_MS
+        return cls(backends, hedge_delay=delay_ms / 1000.0 if delay_ms > 0 else None)
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+    def ranked(self, models: Optional[Dict[str, str]] = None) -> List[LLMBackend]:
+        """
+        Healthy backends first, then by rolling p50 (unmeasured ones first, to
+        explore), judged on the model each backend would run for this request.
+        """
+        def key(backend: LLMBackend):
+            stats = backend.stats_for(backend.model_for(models))
+            return (not stats.healthy, stats.p50 or 0.0)
+
+        return sorted(self.backends, key=key)
+
+    def pick(self, models: Optional[Dict[str, str]] = None) -> LLMBackend:
+        return self.ranked(models)[0]
+
+    def _hedge_delay_for(self, backend: LLMBackend, models: Optional[Dict[str, str]] = None) -> float:
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+        return backend.stats_for(backend.model_for(models)).p95 or 1.5
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _kwargs_for(backend: LLMBackend, models: Optional[Dict[str, str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-request model override for this backend's provider (model tiering)."""
+        if models and backend.provider in models:
+            return {**kwargs, "model": models[backend.provider]}
+        return kwargs
+
+    async def _call(self, backend: LLMBackend, messages, models: Optional[Dict[str, str]] = None, **kwargs):
+        model = backend.model_for(models)
+        stats = backend.stats_for(model)
+        kwargs = self._kwargs_for(backend, models, kwargs)
+        start = time.monotonic()
+        try:
+            result = await backend.client.ainvoke(messages, **kwargs)
+        except asyncio.CancelledError:
+            # Lost a hedge race (or the client went away): not an error, but
+            # keep the elapsed time so a slow backend stops being ranked first
+            stats.record_censored(time.monotonic() - start)
+            raise
+        except Exception as e:
+            stats.record_error()
+            print(f"[LLMRouter] {backend.provider}:{model} failed: {e}")
+            raise
+        stats.record_success(time.monotonic() - start)
+        return result
+
+    async def ainvoke(self, messages, models: Optional[Dict[str, str]] = None, **kwargs):
+        """
+        Invoke the best backend; fire a hedged duplicate if it is slow.
+        models optionally maps provider -> model for this request.
+        """
+        ranked = self.ranked(models)
+        primary = ranked[0]
+        secondary = ranked[1] if len(ranked) > 1 else None
+        if secondary is None:
+            return await self._call(primary, messages, models, **kwargs)
+
+        first = asyncio.ensure_future(self._call(primary, messages, models, **kwargs))
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay_for(primary, models))
+            if first in done:
+                if first.exception() is None:
+                    return first.result()
+                # Primary failed fast: go straight to the next backend
+                return await self._call(secondary, messages, models, **kwargs)
+
+            self.hedges += 1
+            hedge = asyncio.ensure_future(self._call(secondary, messages, models, **kwargs))
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def astream(self, messages, models: Optional[Dict[str, str]] = None, **kwargs) -> AsyncIterator[Any]:
+        """
+        Stream from the best backend. Falls over to the next backend if the
+        stream fails before producing its first chunk (no hedging for streams).
+        Streams record their time to first chunk: the full duration depends on
+        the reply length and would make a backend look slow for ainvoke.
+        """
+        ranked = self.ranked(models)
+        for i, backend in enumerate(ranked):
+            model = backend.model_for(models)
+            stats = backend.stats_for(model)
+            start = time.monotonic()
+            first_chunk: Optional[float] = None
+            try:
+                async for chunk in backend.client.astream(messages, **self._kwargs_for(backend, models, kwargs)):
+                    if first_chunk is None:
+                        first_chunk = time.monotonic() - start
+                    yield chunk
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.record_error()
+                print(f"[LLMRouter] {backend.provider}:{model} stream failed: {e}")
+                if first_chunk is not None or i == len(ranked) - 1:
+                    raise
+                continue
+            stats.record_success(first_chunk if first_chunk is not None else time.monotonic() - start)
+            return
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backends": {
+                name: stats.as_dict()
+                for b in self.backends
+                for name, stats in b.all_stats().items()
+            },
+            "order": [b.name for b in self.ranked()],
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
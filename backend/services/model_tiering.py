@@ -0,0 +1,160 @@
+# backend/services/model_tiering.py
+"""
+Per-request model tiering for /api/chat.
+
+A small rule-based classifier looks at the prompt variant (JSON mode /
+Arabic / English) and the page the request came from, and picks a tier
+from settings.MODEL_TIERS: which model to use on each provider and a
+max_tokens budget. Spoken turns (the voice pages, whose replies are read
+out and kept short) go to the "fast" tier; structured JSON requests
+(roadmaps, generated questions, scoring) get the "structured" tier with
+room for the whole document. Everything else, however short the question
+("explain microservices vs monolith"), keeps the standard budget.
+
+Every decision is logged and counted with its latency and output size, so
+/api/metrics shows what each tier costs.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+from backend.core.config import settings
+from backend.services.context_builder import get_context_assembler
+
+
+@dataclass
+class TierDecision:
+    tier: str
+    reason: str
+    models: Dict[str, str] = field(default_factory=dict)  # provider -> model
+    max_tokens: Optional[int] = None
+
+    def llm_kwargs(self) -> Dict[str, Any]:
+        """Extra arguments for the chat call (the model is chosen per provider by the router)."""
+        return {"max_tokens": self.max_tokens} if self.max_tokens else {}
+
+    def describe(self) -> str:
+        models = ", ".join(f"{p}:{m}" for p, m in self.models.items()) or "provider default"
+        return f"tier={self.tier} models=[{models}] max_tokens={self.max_tokens} ({self.reason})"
+
+
+class _TierStats:
+    def __init__(self, window: int):
+        self.requests = 0
+        self.output_tokens = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.reasons: Dict[str, int] = {}
+
+
+def page_from_referer(referer: Optional[str]) -> Optional[str]:
+    """"http://host/career-path?x=1" -> "career-path"; "/" and "/home" -> "home"."""
+    if not referer:
+        return None
+    path = urlparse(referer).path.strip("/")
+    return path.split("/")[0] if path else "home"
+
+
+class ModelTierClassifier:
+    """Picks a model tier and max_tokens budget per chat request."""
+
+    def __init__(
+        self,
+        tiers: Dict[str, Dict[str, Any]],
+        default_tier: str = "standard",
+        fast_pages: Optional[List[str]] = None,
+        enabled: bool = True,
+        window: int = 200,
+    ):
+        self.tiers = tiers
+        self.default_tier = default_tier
+        self.fast_pages = set(fast_pages or [])
+        self.enabled = enabled
+        self.window = window
+        self._lock = threading.Lock()
+        self._stats: Dict[str, _TierStats] = {}
+
+    @classmethod
+    def from_settings(cls, settings) -> "ModelTierClassifier":
+        return cls(
+            tiers=settings.MODEL_TIERS,
+            default_tier=settings.MODEL_TIER_DEFAULT,
+            fast_pages=settings.MODEL_TIER_FAST_PAGES,
+            enabled=settings.MODEL_TIERING_ENABLED,
+        )
+
+    def _decision(self, tier: str, reason: str) -> TierDecision:
+        if tier not in self.tiers:
+            tier, reason = self.default_tier, f"{reason}; tier '{tier}' not configured"
+        config = self.tiers.get(tier, {})
+        return TierDecision(
+            tier=tier,
+            reason=reason,
+            models=dict(config.get("models", {})),
+            max_tokens=config.get("max_tokens"),
+        )
+
+    def for_tier(self, tier: str, reason: str) -> TierDecision:
+        """Decision for a fixed tier (internal calls such as background summaries)."""
+        return self._decision(tier, reason)
+
+    def classify(self, message: str, variant: str, page: Optional[str] = None) -> TierDecision:
+        """
+        variant is the prompt variant from routes.select_system_prompt
+        ("json", "arabic" or "english"); page is the page of origin, if known.
+        """
+        if not self.enabled:
+            return self._decision(self.default_tier, "tiering disabled")
+        if variant == "json":
+            return self._decision("structured", "json mode")
+        if page and page in self.fast_pages:
+            return self._decision("fast", f"page={page}")
+        # Text chat: the reply length is not capped by the prompt, so a short
+        # question can still need a long answer
+        return self._decision(self.default_tier, f"{variant} text chat ({len(message)} chars)")
+
+    # ------------------------------------------------------------------
+    # Accounting
+    # ------------------------------------------------------------------
+    def record(self, decision: TierDecision, latency: float, reply: str, usage: Optional[Dict[str, Any]] = None):
+        """Log a finished call and add it to the per-tier counters."""
+        if usage and usage.get("output_tokens"):
+            output_tokens = int(usage["output_tokens"])
+        else:
+            output_tokens = get_context_assembler(settings.OPENAI_MODEL).counter.count(reply)
+        with self._lock:
+            stats = self._stats.get(decision.tier)
+            if stats is None:
+                stats = self._stats[decision.tier] = _TierStats(self.window)
+            stats.requests += 1
+            stats.output_tokens += output_tokens
+            stats.latencies.append(latency)
+            reason = decision.reason.split(" (")[0]
+            stats.reasons[reason] = stats.reasons.get(reason, 0) + 1
+        print(
+            f"[ModelTier] 🎚️ {decision.describe()} "
+            f"latency={latency * 1000:.0f}ms output_tokens={output_tokens}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            result: Dict[str, Any] = {}
+            for tier, stats in self._stats.items():
+                ordered = sorted(stats.latencies)
+                result[tier] = {
+                    "requests": stats.requests,
+                    "output_tokens": stats.output_tokens,
+                    "avg_output_tokens": round(stats.output_tokens / stats.requests, 1) if stats.requests else 0,
+                    "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+                    "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1) if ordered else None,
+                    "reasons": dict(stats.reasons),
+                }
+            return {"enabled": self.enabled, "tiers": result}
+
+
+# Global instance
+model_tiering = ModelTierClassifier.from_settings(settings)
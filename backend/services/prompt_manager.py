@@ -3,6 +3,8 @@
 from typing import Dict, List
 import random
 
+from backend.services.skill_extractor import skill_extractor
+
 class PromptManager:
     def __init__(self):
         self.assessment_prompts = {
@@ -59,15 +61,11 @@ class PromptManager:
         return template.format(skill=skill)
     
     def get_follow_up_questions(self, skill: str) -> List[str]:
-        """Get relevant follow-up questions based on a skill."""
-        # Normalize skill to category
-        skill_lower = skill.lower()
-        if "python" in skill_lower:
-            return self.follow_up_questions["python"]
-        elif any(js in skill_lower for js in ["javascript", "js", "node", "react", "angular"]):
-            return self.follow_up_questions["javascript"]
-        elif any(data in skill_lower for data in ["sql", "database", "etl", "hadoop", "spark"]):
-            return self.follow_up_questions["data"]
+        """Get relevant follow-up questions based on a skill (name, alias or free text)."""
+        # Map the skill to its category ("python" / "javascript" / "data") via the skill dictionary
+        for category in skill_extractor.categories_in([skill]):
+            if category in self.follow_up_questions:
+                return self.follow_up_questions[category]
         return []
     
     def get_role_interest_prompt(self) -> str:
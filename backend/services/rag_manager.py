@@ -1,8 +1,24 @@
 # backend/services/rag_manager.py
+"""
+FAISS index over the chat history, kept up to date in the background.
+
+Several workers (uvicorn --workers N) share one index on disk. Only the
+process holding the "rag_indexer" lease (services/leader_lease.py) embeds
+new messages and persists the index. It publishes every update as a new
+generation directory (chat_index.generations/000042/), then atomically
+replaces chat_index.meta, which names the current generation. The other
+processes (followers) watch the meta file and hot-reload each new
+generation; they never embed or write anything. Embedding spend therefore
+does not grow with the number of workers. If the leader dies, a follower
+takes over the lease and carries on from the last published generation.
+"""
+
 from __future__ import annotations
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import json
+import os
 from pathlib import Path
+import shutil
 import threading
 import time
 from datetime import datetime
@@ -16,96 +32,195 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 # Internal imports
 from backend.db.db import get_connection
 from backend.core.config import settings
+from backend.services.leader_lease import LeaderLease
 
 
 class RAGManager:
     """Manages FAISS vector index for chat history, with background updating."""
 
     def __init__(
-        self, 
-        embeddings: Embeddings, 
+        self,
+        embeddings: Embeddings,
         index_path: Optional[Path] = None,
-        skip_initial_index: bool = False
+        skip_initial_index: bool = False,
+        lease: Optional[LeaderLease] = None,
     ):
         # Accept embeddings as argument (caller supplies it)
         self.embeddings = embeddings
         self.index_path = Path(index_path) if index_path else Path(__file__).parent / "chat_index"
-        self.lock = threading.Lock()
+        self.meta_path = self.index_path.with_suffix(".meta")
+        self.generations_path = self.index_path.with_name(self.index_path.name + ".generations")
+        # Re-entrant: index_new_messages/search call _save_index/_load_or_create_index while holding it
+        self.lock = threading.RLock()
         self.last_indexed_id = 0
+        self.generation = 0  # published generation held in memory (0 = none / legacy layout)
         self.vectorstore = None
 
+        # Metrics
+        self.indexed_messages = 0
+        self.published = 0
+        self.reloads = 0
+
+        # Only the lease holder embeds and persists; decided now so the initial load knows its role
+        self.lease = lease or LeaderLease("rag_indexer", ttl=settings.RAG_LEASE_TTL_SECONDS)
+        self.lease.acquire()
+
         # Create or load index (skip if requested to avoid startup errors)
         if not skip_initial_index:
             self._load_or_create_index()
 
         # Background indexing control
         self.should_run = True
+        self._stop = threading.Event()
         self.index_thread = threading.Thread(target=self._periodic_index, daemon=True)
         self.index_thread.start()
 
     # ------------------------------------------------------------------
     # Internal Index Handling
     # ------------------------------------------------------------------
+    def _read_meta(self) -> Dict[str, Any]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _generation_dir(self, generation: int) -> Path:
+        return self.generations_path / f"{generation:06d}"
+
+    def _published_dir(self, meta: Dict[str, Any]) -> Optional[Path]:
+        """Directory of the published index: its generation, or the legacy single directory."""
+        generation = meta.get("generation")
+        if generation:
+            return self._generation_dir(generation)
+        if (self.index_path / "index.faiss").exists():
+            return self.index_path
+        return None
+
     def _load_or_create_index(self):
-        """Load existing FAISS index or create a new one."""
+        """Load the published FAISS index, or (leader only) create a new one."""
         with self.lock:
-            try:
-                # FAISS.save_local/load_local expect a directory; check for an indicator file
-                if (self.index_path / "index.faiss").exists() or (self.index_path).exists():
+            meta = self._read_meta()
+            published = self._published_dir(meta)
+            if published is not None:
+                try:
                     self.vectorstore = FAISS.load_local(
-                        str(self.index_path),
+                        str(published),
                         self.embeddings,
                         allow_dangerous_deserialization=True
                     )
-                    meta_path = self.index_path.with_suffix(".meta")
-                    if meta_path.exists():
-                        with open(meta_path, "r", encoding="utf-8") as f:
-                            meta = json.load(f)
-                            self.last_indexed_id = meta.get("last_id", 0)
-                    print(f"[RAGManager] Loaded existing FAISS index at {self.index_path}")
-                else:
-                    print(f"[RAGManager] Creating new FAISS index at {self.index_path}")
-                    # FAISS.from_texts builds an index with the provided embeddings
-                    self.vectorstore = FAISS.from_texts(["Initial empty index"], self.embeddings)
-                    self._save_index()
+                    self.last_indexed_id = meta.get("last_id", 0)
+                    self.generation = meta.get("generation", 0)
+                    print(f"[RAGManager] Loaded existing FAISS index at {published}")
+                    return
+                except Exception as e:
+                    print(f"[RAGManager] Error loading index: {e}")
+
+            if not self.lease.is_leader:
+                # Followers never build or write the index; the leader publishes one shortly
+                print("[RAGManager] No published index yet; waiting for the indexer process")
+                return
+            print(f"[RAGManager] Creating new FAISS index at {self.generations_path}")
+            try:
+                # FAISS.from_texts builds an index with the provided embeddings
+                self.vectorstore = FAISS.from_texts(["Initial empty index"], self.embeddings)
+                self._save_index()
             except Exception as e:
-                print(f"[RAGManager] Error loading index: {e} → creating new one")
-                try:
-                    self.vectorstore = FAISS.from_texts(["Initial empty index"], self.embeddings)
-                    self._save_index()
-                except Exception as e2:
-                    print(f"[RAGManager] Failed to create FAISS index: {e2}")
-                    self.vectorstore = None
+                print(f"[RAGManager] Failed to create FAISS index: {e}")
+                self.vectorstore = None
+
+    def ensure_index(self) -> bool:
+        """Load (or create) the index now unless it already is; True if one is available."""
+        with self.lock:
+            if self.vectorstore is None:
+                self._load_or_create_index()
+            return self.vectorstore is not None
 
     def _save_index(self):
-        """Save FAISS index and metadata atomically."""
+        """
+        Publish the index as a new generation (leader only): write it to its
+        own directory, then switch chat_index.meta over with an atomic
+        rename, so readers see either the old generation or the new one.
+        """
         with self.lock:
+            if self.vectorstore is None or not self.lease.acquire():
+                return
             try:
-                if self.vectorstore is not None:
-                    self.vectorstore.save_local(str(self.index_path))
-                meta_path = self.index_path.with_suffix(".meta")
-                with open(meta_path, "w", encoding="utf-8") as f:
-                    json.dump({"last_id": self.last_indexed_id}, f)
+                generation = max(self.generation, self._read_meta().get("generation", 0)) + 1
+                self.vectorstore.save_local(str(self._generation_dir(generation)))
+                tmp_path = self.meta_path.with_name(f"{self.meta_path.name}.{os.getpid()}-{id(self)}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"last_id": self.last_indexed_id, "generation": generation}, f)
+                os.replace(tmp_path, self.meta_path)
+                self.generation = generation
+                self.published += 1
+                self._prune_generations()
             except Exception as e:
                 print(f"[RAGManager] Error saving index: {e}")
 
+    def _prune_generations(self):
+        """Drop old generations, keeping the last few for followers still loading one."""
+        keep = max(1, settings.RAG_KEEP_GENERATIONS)
+        for old in sorted(self.generations_path.iterdir())[:-keep]:
+            shutil.rmtree(old, ignore_errors=True)
+
+    def _reload_if_published(self):
+        """Load a generation published by the leader since ours (outside the lock, then swap)."""
+        meta = self._read_meta()
+        generation = meta.get("generation", 0)
+        if not generation or generation == self.generation:
+            return
+        vectorstore = FAISS.load_local(
+            str(self._generation_dir(generation)),
+            self.embeddings,
+            allow_dangerous_deserialization=True
+        )
+        with self.lock:
+            self.vectorstore = vectorstore
+            self.generation = generation
+            self.last_indexed_id = meta.get("last_id", 0)
+        self.reloads += 1
+        print(f"[RAGManager] Reloaded index generation {generation} (up to ID {self.last_indexed_id})")
+
     # ------------------------------------------------------------------
     # Background Updating
     # ------------------------------------------------------------------
-    def _periodic_index(self, interval: int = 60):
-        """Background thread to index new messages periodically."""
-        while self.should_run:
+    def _periodic_index(self, interval: Optional[float] = None):
+        """
+        Background thread: renew (or try to win) the indexer lease every
+        RAG_POLL_SECONDS. The leader indexes new messages every `interval`
+        seconds; followers reload newly published generations.
+        """
+        interval = settings.RAG_INDEX_INTERVAL_SECONDS if interval is None else interval
+        last_indexed = None
+        while self.should_run and not self._stop.is_set():
             try:
-                self.index_new_messages()
+                was_leader = self.lease.is_leader
+                if self.lease.acquire():
+                    if not was_leader:
+                        # Taking over: continue from the last generation the old leader published
+                        self._reload_if_published()
+                    if last_indexed is None or time.monotonic() - last_indexed >= interval:
+                        last_indexed = time.monotonic()
+                        self.index_new_messages()
+                else:
+                    self._reload_if_published()
             except Exception as e:
                 print(f"[RAGManager] Error during background indexing: {e}")
-            time.sleep(interval)
+            self._stop.wait(settings.RAG_POLL_SECONDS)
 
     # ------------------------------------------------------------------
     # Main Indexing Logic
     # ------------------------------------------------------------------
     def index_new_messages(self):
-        """Index new chat messages from DB (if any)."""
+        """Index new chat messages from DB (if any). Leader only: followers reload instead."""
+        if not self.lease.is_leader:
+            return
+        with self.lock:
+            if self.vectorstore is None:
+                # Start from the published index (and its last_id), not from scratch
+                self._load_or_create_index()
+
         try:
             conn = get_connection()
             cur = conn.cursor()
@@ -144,6 +259,7 @@ class RAGManager:
                 else:
                     self.vectorstore.add_documents(documents)
                 self.last_indexed_id = new_messages[-1][0]
+                self.indexed_messages += len(new_messages)
                 self._save_index()
                 print(f"[RAGManager] Indexed {len(new_messages)} new messages (up to ID {self.last_indexed_id})")
             except Exception as e:
@@ -160,27 +276,40 @@ class RAGManager:
                 if self.vectorstore is None:
                     print("[RAGManager] Vectorstore not initialized, attempting lazy initialization...")
                     self._load_or_create_index()
-                
-                # Ensure latest messages are indexed
+
+                # Ensure latest messages are indexed (no-op on followers)
                 self.index_new_messages()
-                
+
                 if self.vectorstore is None:
                     print("[RAGManager] Warning: Vectorstore still None after initialization attempt")
                     return []
-                    
+
                 return self.vectorstore.similarity_search(query, k=k)
             except Exception as e:
                 print(f"[RAGManager] Search error: {e}")
                 return []
                 return []
 
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "role": "leader" if self.lease.is_leader else "follower",
+            "generation": self.generation,
+            "last_indexed_id": self.last_indexed_id,
+            "indexed_messages": self.indexed_messages,
+            "published": self.published,
+            "reloads": self.reloads,
+            "lease": self.lease.stats(),
+        }
+
     # ------------------------------------------------------------------
     # Shutdown
     # ------------------------------------------------------------------
     def shutdown(self):
-        """Stop background thread and persist state."""
+        """Stop background thread and hand the indexer lease over."""
         self.should_run = False
+        self._stop.set()
         if hasattr(self, "index_thread") and self.index_thread.is_alive():
             self.index_thread.join(timeout=5)
-        self._save_index()
+        # Every indexing pass is already published; only give the lease up
+        self.lease.release()
         print("[RAGManager] Graceful shutdown complete")
@@ -13,7 +13,8 @@ from langchain.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import SystemMessage, HumanMessage
 from langchain.chains import ConversationalRetrievalChain
-from langchain.memory import ConversationBufferMemory
+
+from backend.services.conversation_memory import conversation_memory
 
 class RAGPipeline:
     """Manages the full RAG workflow: ingestion, indexing, and retrieval."""
@@ -40,17 +41,10 @@ class RAGPipeline:
         # Initialize or load vector store
         self.vectorstore = self._load_or_create_vectorstore()
         
-        # Initialize conversation memory
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
-        
-        # Initialize retrieval chain
+        # Initialize retrieval chain (conversation memory is per user, see query())
         self.qa_chain = ConversationalRetrievalChain.from_llm(
             llm=self.llm,
             retriever=self.vectorstore.as_retriever(),
-            memory=self.memory,
             verbose=True
         )
     
@@ -105,9 +99,16 @@ class RAGPipeline:
         self,
         question: str,
         chat_history: Optional[List[tuple[str, str]]] = None,
-        metadata_filter: Optional[Dict[str, Any]] = None
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        user_id: Optional[Any] = None,
     ) -> Dict[str, Any]:
-        """Query the knowledge base with context awareness."""
+        """
+        Query the knowledge base with context awareness.
+        With a user_id (and no explicit chat_history), that user's persistent
+        conversation memory is used and the new exchange is added to it.
+        """
+        if chat_history is None and user_id is not None:
+            chat_history = conversation_memory.load(user_id).exchanges()
         
         # Prepare retrieval parameters
         search_kwargs = {}
@@ -129,10 +130,14 @@ class RAGPipeline:
                 "metadata": doc.metadata
             })
         
+        if user_id is not None:
+            conversation_memory.add_turn(user_id, "user", question)
+            conversation_memory.add_turn(user_id, "assistant", response["answer"])
+        
         return {
             "answer": response["answer"],
             "sources": sources,
-            "chat_history": self.memory.chat_memory.messages
+            "chat_history": (chat_history or []) + [(question, response["answer"])]
         }
     
     def save_index(self):
@@ -147,6 +152,5 @@ class RAGPipeline:
             self.qa_chain = ConversationalRetrievalChain.from_llm(
                 llm=self.llm,
                 retriever=self.vectorstore.as_retriever(),
-                memory=self.memory,
                 verbose=True
             )
\ No newline at end of file
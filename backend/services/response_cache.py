@@ -0,0 +1,222 @@
+# backend/services/response_cache.py
+"""
+Semantic response cache for /api/chat.
+
+Entries are keyed by the system prompt variant ("json" / "arabic" / "english"),
+the page the request came from and the normalized user message. A lookup
+first tries an exact match on that key (no embedding call needed). Free-text
+chat then falls back to cosine similarity against cached messages of the
+same variant and page. Structured JSON prompts never do: they are long
+templates where only a field differs ("roadmap for <job title>"), so two
+prompts for different jobs can be 0.97+ similar and must not share a
+reply. Entries expire after a TTL and the whole cache is capped with LRU
+eviction.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from backend.core.lazy import lazy_import
+
+# numpy is only imported on the first similarity lookup
+np = lazy_import("numpy")
+
+# Prompt variants built from page templates + structured fields: exact match only
+EXACT_ONLY_VARIANTS = frozenset({"json"})
+
+
+def normalize_message(message: str) -> str:
+    """Collapse whitespace so trivially different prompts share a cache key."""
+    return re.sub(r"\s+", " ", message or "").strip()
+
+
+@dataclass
+class _CacheEntry:
+    variant: str
+    page: str
+    text: str
+    response: str
+    vector: Optional[np.ndarray]
+    created_at: float
+
+
+@dataclass
+class CacheLookup:
+    """Result of a cache lookup; vector is reused when storing on a miss."""
+    response: Optional[str] = None
+    vector: Optional[np.ndarray] = None
+    similarity: float = 0.0
+
+    @property
+    def hit(self) -> bool:
+        return self.response is not None
+
+
+class SemanticResponseCache:
+    """LRU + TTL cache of LLM replies matched by prompt variant and message embedding."""
+
+    def __init__(
+        self,
+        embeddings=None,
+        similarity_threshold: float = 0.97,
+        ttl_seconds: int = 3600,
+        max_entries: int = 512,
+    ):
+        self.embeddings = embeddings
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Tuple[str, str, str], _CacheEntry] = OrderedDict()  # (variant, page, text)
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_settings(cls, settings, embeddings=None) -> "SemanticResponseCache":
+        return cls(
+            embeddings=embeddings,
+            similarity_threshold=settings.CHAT_CACHE_SIMILARITY_THRESHOLD,
+            ttl_seconds=settings.CHAT_CACHE_TTL_SECONDS,
+            max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+        )
+
+    # ------------------------------------------------------------------
+    # Embedding helpers
+    # ------------------------------------------------------------------
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        if self.embeddings is None:
+            return None
+        try:
+            vector = np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+        except Exception as e:
+            print(f"[ResponseCache] Embedding failed, using exact match only: {e}")
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def _is_expired(self, entry: _CacheEntry, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - entry.created_at > self.ttl_seconds
+
+    def _purge_expired(self, now: float):
+        """
+        Drop expired entries from the least recently used end, up to the first
+        live one. A recently used entry can still expire further back; lookups
+        check each entry they would return.
+        """
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if not self._is_expired(entry, now):
+                break
+            del self._entries[key]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def aget(self, variant: str, message: str, page: Optional[str] = None) -> CacheLookup:
+        """Look up a cached reply for this variant + page + message."""
+        text = normalize_message(message)
+        key = (variant, page or "", text)
+        now = time.time()
+
+        # 1. Exact match on the normalized message
+        with self._lock:
+            self._purge_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry, now):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self.exact_hits += 1
+                return CacheLookup(response=entry.response, vector=entry.vector, similarity=1.0)
+
+        if variant in EXACT_ONLY_VARIANTS:
+            with self._lock:
+                self.misses += 1
+            return CacheLookup()
+
+        # 2. Nearest neighbour among entries of the same variant and page
+        vector = await self._embed(text)
+        if vector is not None:
+            with self._lock:
+                best_key, best_score = None, -1.0
+                for candidate, entry in self._entries.items():
+                    if entry.variant != variant or entry.page != (page or "") or entry.vector is None:
+                        continue
+                    if self._is_expired(entry, now):
+                        continue
+                    score = float(np.dot(vector, entry.vector))
+                    if score > best_score:
+                        best_key, best_score = candidate, score
+                if best_key is not None and best_score >= self.similarity_threshold:
+                    self._entries.move_to_end(best_key)
+                    self.hits += 1
+                    self.semantic_hits += 1
+                    return CacheLookup(
+                        response=self._entries[best_key].response,
+                        vector=vector,
+                        similarity=best_score,
+                    )
+
+        with self._lock:
+            self.misses += 1
+        return CacheLookup(vector=vector)
+
+    async def aset(
+        self,
+        variant: str,
+        message: str,
+        response: str,
+        vector: Optional[np.ndarray] = None,
+        page: Optional[str] = None,
+    ):
+        """Store a reply; pass the vector from the preceding lookup to avoid re-embedding."""
+        text = normalize_message(message)
+        key = (variant, page or "", text)
+        if vector is None and variant not in EXACT_ONLY_VARIANTS:
+            vector = await self._embed(text)
+        with self._lock:
+            self._entries[key] = _CacheEntry(
+                variant=variant,
+                page=page or "",
+                text=text,
+                response=response,
+                vector=vector,
+                created_at=time.time(),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "similarity_threshold": self.similarity_threshold,
+                "ttl_seconds": self.ttl_seconds,
+            }
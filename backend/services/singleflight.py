@@ -0,0 +1,136 @@
+# backend/services/singleflight.py
+"""
+Single-flight request coalescing.
+
+Concurrent callers that ask for the same key share one execution of the
+underlying call: the first caller (the leader) runs it, every caller that
+arrives while it is still in flight waits for and receives the same result.
+Used to collapse byte-identical LLM prompts sent in parallel by the frontend.
+
+Some failures belong to the leader, not to the call: the leader's own
+admission rejection (its user's queue is full) says nothing about the
+followers. Exception types passed as `retry_on` are not shared: a follower
+that sees one runs the call itself (leading a new flight or joining one).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+# All SingleFlight groups, so /api/metrics can report them together
+_registry: Dict[str, "SingleFlight"] = {}
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable coalescing key from normalized request parts."""
+    raw = "\x1f".join(str(p) for p in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _SyncCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces identical in-flight calls (async and thread-based)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: Dict[str, asyncio.Future] = {}
+        self._calls: Dict[str, _SyncCall] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.collapsed = 0
+        self.retried = 0  # followers that ran the call again after a leader-only failure
+        _registry[name] = self
+
+    async def do(
+        self, key: str, fn: Callable[[], Awaitable[T]], retry_on: Tuple[Type[BaseException], ...] = ()
+    ) -> T:
+        """Run fn() once per key among concurrent async callers."""
+        while True:
+            task = self._tasks.get(key)
+            leader = task is None
+            if leader:
+                # Run as an independent task so a cancelled leader (client
+                # disconnect) does not cancel the call for its followers
+                task = asyncio.ensure_future(fn())
+                self._tasks[key] = task
+                task.add_done_callback(lambda t, k=key: self._finish_task(k, t))
+                self.leaders += 1
+            else:
+                self.collapsed += 1
+            try:
+                return await asyncio.shield(task)
+            except retry_on:
+                if leader:
+                    raise
+                # The leader's own failure: run the call with this caller's fn
+                if self._tasks.get(key) is task:
+                    del self._tasks[key]
+                self.retried += 1
+
+    def _finish_task(self, key: str, task: asyncio.Future):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the exception as retrieved even if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    def do_sync(self, key: str, fn: Callable[[], T], retry_on: Tuple[Type[BaseException], ...] = ()) -> T:
+        """Run fn() once per key among concurrent threads."""
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = _SyncCall()
+                    self._calls[key] = call
+                    self.leaders += 1
+                else:
+                    self.collapsed += 1
+            if leader:
+                break
+
+            call.done.wait()
+            if call.error is None:
+                return call.result
+            if not isinstance(call.error, retry_on):
+                raise call.error
+            # The leader's own failure: run the call with this caller's fn
+            with self._lock:
+                self.retried += 1
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        total = self.leaders + self.collapsed
+        return {
+            "calls": total,
+            "upstream_calls": self.leaders,
+            "collapsed": self.collapsed,
+            "retried": self.retried,
+            "in_flight": len(self._tasks) + len(self._calls),
+        }
+
+
+def all_stats() -> Dict[str, Dict[str, int]]:
+    """Stats for every SingleFlight group created in this process."""
+    return {name: flight.stats() for name, flight in _registry.items()}
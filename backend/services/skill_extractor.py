@@ -0,0 +1,209 @@
+# backend/services/skill_extractor.py
+"""
+Local, dictionary-based skill extraction.
+
+Builds an Aho-Corasick automaton over every skill name and alias from
+backend/data/skill_job_map.json and backend/data/skill_synonyms.json, then
+finds all of them in one pass over the text. Matching is done on normalized
+text (lowercase, Arabic letter variants and diacritics folded) and only at
+word boundaries; Arabic clitic prefixes such as "ال" / "و" / "بال" in front of
+a skill are allowed. Replaces the LLM round trip that used to extract skills
+from chat messages.
+
+Skill names that are also everyday words ("go", "rust", "swift", "node")
+are listed as "context_aliases" in skill_synonyms.json: they only count
+when the same text also names another skill or talks about code
+("go developer", "python and go"), so "I want to go into management" finds
+nothing.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+SKILL_MAP_PATH = DATA_DIR / "skill_job_map.json"
+SYNONYMS_PATH = DATA_DIR / "skill_synonyms.json"
+
+# Harakat, tatweel and other marks that do not change the word
+_ARABIC_MARKS = re.compile("[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]")
+_ARABIC_FOLD = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه",
+    "پ": "ب", "گ": "ك", "ک": "ك", "ی": "ي",
+})
+
+# Words that make an ambiguous alias ("go", "rust") read as a technology
+_CODE_CONTEXT = {
+    "programming", "programmer", "language", "languages", "developer", "developers",
+    "development", "code", "coding", "backend", "frontend", "framework", "stack",
+    "برمجه", "البرمجه", "مبرمج", "لغه", "مطور", "كود",
+}
+
+# Prefixes that attach to an Arabic word: "البايثون", "والبايثون", "بالبايثون"...
+_ARABIC_PREFIXES = {"ال", "و", "ب", "ل", "ك", "ف", "وال", "بال", "لل", "فال", "كال", "وب", "ول"}
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and fold Arabic spelling variants so aliases match reliably."""
+    text = _ARABIC_MARKS.sub("", text or "")
+    return text.translate(_ARABIC_FOLD).lower()
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class SkillExtractor:
+    """Multi-pattern (Aho-Corasick) matcher from aliases to canonical skill names."""
+
+    def __init__(
+        self,
+        aliases: Dict[str, str],
+        categories: Optional[Dict[str, Optional[str]]] = None,
+        context_aliases: Optional[Dict[str, str]] = None,
+    ):
+        # alias (normalized) -> canonical skill
+        self.aliases = {normalize_text(a).strip(): skill for a, skill in aliases.items() if a.strip()}
+        # Ambiguous aliases: only matched with code context (see _CODE_CONTEXT)
+        self.context_aliases = {
+            normalize_text(a).strip(): skill for a, skill in (context_aliases or {}).items() if a.strip()
+        }
+        self.categories = categories or {}
+        self._build()
+
+    @classmethod
+    def from_files(cls, map_path: Path = SKILL_MAP_PATH, synonyms_path: Path = SYNONYMS_PATH) -> "SkillExtractor":
+        aliases: Dict[str, str] = {}
+        context_aliases: Dict[str, str] = {}
+        categories: Dict[str, Optional[str]] = {}
+        if map_path.exists():
+            with open(map_path, "r", encoding="utf-8") as f:
+                for skill in json.load(f):
+                    if skill != "default":
+                        aliases[skill] = skill
+        if synonyms_path.exists():
+            with open(synonyms_path, "r", encoding="utf-8") as f:
+                for skill, info in json.load(f).items():
+                    ambiguous = info.get("context_aliases", [])
+                    for alias in ambiguous:
+                        context_aliases[alias] = skill
+                    # The canonical name is an alias too, unless it is an ambiguous word
+                    if skill not in ambiguous:
+                        aliases[skill] = skill
+                    categories[skill] = info.get("category")
+                    for alias in info.get("aliases", []):
+                        aliases[alias] = skill
+        for alias in list(context_aliases):
+            # skill_job_map.json may list the same word unconditionally
+            aliases.pop(alias, None)
+        return cls(aliases, categories, context_aliases)
+
+    # ------------------------------------------------------------------
+    # Automaton
+    # ------------------------------------------------------------------
+    def _build(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # per state: (alias length, canonical skill, needs context) for every alias ending here
+        self._out: List[List[Tuple[int, str, bool]]] = [[]]
+
+        patterns = [(alias, skill, False) for alias, skill in self.aliases.items()]
+        patterns += [(alias, skill, True) for alias, skill in self.context_aliases.items()]
+        for alias, skill, needs_context in patterns:
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(alias), skill, needs_context))
+
+        # Breadth-first pass to fill failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _matches(self, text: str) -> List[Tuple[int, int, str, bool]]:
+        """All (start, end, skill, needs context) alias occurrences at word boundaries."""
+        found = []
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, skill, needs_context in self._out[state]:
+                start, end = i - length + 1, i + 1
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[i]):
+                    continue
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    # Allow an attached Arabic prefix ("بالبايثون"), nothing else
+                    token_start = start
+                    while token_start > 0 and _is_word_char(text[token_start - 1]):
+                        token_start -= 1
+                    if text[token_start:start] not in _ARABIC_PREFIXES:
+                        continue
+                found.append((start, end, skill, needs_context))
+        return found
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills mentioned in text, in order of first appearance."""
+        normalized = normalize_text(text)
+        matches = self._matches(normalized)
+        # Leftmost-longest, non-overlapping ("java script" beats "java")
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        selected: List[Tuple[str, bool]] = []
+        last_end = 0
+        for start, end, skill, needs_context in matches:
+            if start < last_end:
+                continue
+            last_end = end
+            selected.append((skill, needs_context))
+
+        # Ambiguous words count only next to another skill or to words about code
+        has_context = any(not needs_context for _, needs_context in selected) or bool(
+            _CODE_CONTEXT.intersection(re.findall(r"\w+", normalized))
+        )
+        skills: List[str] = []
+        for skill, needs_context in selected:
+            if needs_context and not has_context:
+                continue
+            if skill not in skills:
+                skills.append(skill)
+        return skills
+
+    def category(self, skill: str) -> Optional[str]:
+        """Follow-up question category ("python", "javascript", "data") of a canonical skill."""
+        return self.categories.get(skill)
+
+    def categories_in(self, texts: Iterable[str]) -> List[str]:
+        """Distinct categories of every skill found in the given texts."""
+        result: List[str] = []
+        for text in texts:
+            for skill in self.extract(text):
+                cat = self.category(skill)
+                if cat and cat not in result:
+                    result.append(cat)
+        return result
+
+
+# Global instance
+skill_extractor = SkillExtractor.from_files()
@@ -0,0 +1,187 @@
+# backend/services/speculation.py
+"""
+Speculative reply generation on interim speech-recognition results.
+
+While the candidate is still talking, the interview page sends the interim
+transcript once it stops changing. The server starts generating a reply to
+it in the background (nothing is sent to the client yet). When the final
+transcript arrives:
+
+  - similar enough to the speculated text (>= settings.WS_SPECULATION_THRESHOLD):
+    the speculative reply is served, already partly or fully generated;
+  - otherwise: the speculation is cancelled and the reply is generated
+    normally from the final text.
+
+Hits, misses and the tokens spent on discarded speculations are counted
+(see stats()) so the threshold can be tuned against real traffic.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+from difflib import SequenceMatcher
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from backend.core.config import settings
+from backend.services.context_builder import get_context_assembler
+from backend.services.skill_extractor import normalize_text
+
+# Starts generating a reply to the given text
+Generator = Callable[[str], AsyncIterator[str]]
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def _normalize(text: str) -> str:
+    text = _PUNCTUATION.sub(" ", normalize_text(text))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class Speculation:
+    """A reply generating in the background; tokens are buffered until claimed."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.started = time.perf_counter()
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    async def _run(self, source: AsyncIterator[str]):
+        try:
+            async for token in source:
+                self.tokens.append(token)
+                self._changed.set()
+        except asyncio.CancelledError:
+            self.error = asyncio.CancelledError()
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._changed.set()
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Tokens generated so far, then the rest as they arrive."""
+        sent = 0
+        while True:
+            while sent < len(self.tokens):
+                yield self.tokens[sent]
+                sent += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            self._changed.clear()
+            await self._changed.wait()
+
+    def cancel(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+
+class SpeculativePrefetcher:
+    """Starts, keeps, serves or discards speculations, and keeps the score."""
+
+    def __init__(self, threshold: float = 0.85, min_chars: int = 12, enabled: bool = True):
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.superseded = 0
+        self.wasted_tokens = 0
+        self.head_start_total = 0.0  # seconds of generation done before the final transcript
+
+    @classmethod
+    def from_settings(cls, settings) -> "SpeculativePrefetcher":
+        return cls(
+            threshold=settings.WS_SPECULATION_THRESHOLD,
+            min_chars=settings.WS_SPECULATION_MIN_CHARS,
+            enabled=settings.WS_SPECULATION_ENABLED,
+        )
+
+    def similarity(self, a: str, b: str) -> float:
+        a, b = _normalize(a), _normalize(b)
+        if a == b:
+            return 1.0
+        return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+    def offer(self, current: Optional[Speculation], text: str, generate: Generator) -> Optional[Speculation]:
+        """
+        A stable interim transcript. Keeps the current speculation while the
+        text still matches it, otherwise replaces it. Returns the live one.
+        """
+        text = text.strip()
+        if not self.enabled or len(text) < self.min_chars:
+            return current
+        if current is not None:
+            if self.similarity(current.text, text) >= self.threshold:
+                return current
+            self._discard(current)
+            with self._lock:
+                self.superseded += 1
+        speculation = Speculation(text)
+        speculation.task = asyncio.get_running_loop().create_task(speculation._run(generate(text)))
+        with self._lock:
+            self.started += 1
+        return speculation
+
+    def claim(self, speculation: Optional[Speculation], final_text: str) -> Optional[Speculation]:
+        """The final transcript: the speculation to serve, or None (it is discarded)."""
+        if speculation is None:
+            return None
+        score = self.similarity(speculation.text, final_text)
+        # A speculation that failed is not served; the reply is generated again
+        if score >= self.threshold and speculation.error is None:
+            with self._lock:
+                self.hits += 1
+                self.head_start_total += time.perf_counter() - speculation.started
+            print(f"[Speculation] ✅ Hit (similarity={score:.2f}, {len(speculation.tokens)} tokens ready)")
+            return speculation
+        self._discard(speculation)
+        with self._lock:
+            self.misses += 1
+        print(f"[Speculation] ❌ Miss (similarity={score:.2f})")
+        return None
+
+    def discard(self, speculation: Optional[Speculation]):
+        """Drop a speculation nobody will claim (session ended, reply in progress...)."""
+        if speculation is not None:
+            self._discard(speculation)
+
+    def _discard(self, speculation: Speculation):
+        speculation.cancel()
+        wasted = "".join(speculation.tokens)
+        if wasted:
+            tokens = get_context_assembler(settings.OPENAI_MODEL).counter.count(wasted)
+            with self._lock:
+                self.wasted_tokens += tokens
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decided = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "threshold": self.threshold,
+                "started": self.started,
+                "hits": self.hits,
+                "misses": self.misses,
+                "superseded": self.superseded,
+                "hit_rate": round(self.hits / decided, 3) if decided else None,
+                "wasted_tokens": self.wasted_tokens,
+                "avg_head_start_ms": round(self.head_start_total / self.hits * 1000, 1) if self.hits else None,
+            }
+
+
+# Global instance
+speculative_prefetch = SpeculativePrefetcher.from_settings(settings)
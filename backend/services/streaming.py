@@ -0,0 +1,67 @@
+# backend/services/streaming.py
+"""Helpers for streaming chat completions to the browser as Server-Sent Events."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, List
+
+# Characters that end a sentence in English and Arabic text.
+# "؟" is the Arabic question mark, "۔" / "." cover full stops.
+SENTENCE_ENDINGS = (".", "!", "?", "؟", "۔", "…", "\n")
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one Server-Sent Event frame (JSON payload, UTF-8 safe)."""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+class SentenceSplitter:
+    """
+    Accumulates streamed tokens and yields complete sentences as soon as
+    a sentence boundary is seen, so TTS can start on the first sentence.
+    """
+
+    def __init__(self, min_length: int = 2):
+        self.buffer = ""
+        self.min_length = min_length
+
+    def feed(self, token: str) -> List[str]:
+        """
+        Add a token; return any sentences completed by it. A trailing run of
+        terminators is held back until a token after it arrives.
+        """
+        self.buffer += token
+        sentences: List[str] = []
+        start = 0
+        i = 0
+        while i < len(self.buffer):
+            ch = self.buffer[i]
+            i += 1
+            if ch not in SENTENCE_ENDINGS:
+                continue
+            if ch != "\n":
+                # A run of terminators ("...", "?!", ".؟") ends one sentence together
+                end = i
+                while end < len(self.buffer) and self.buffer[end] in SENTENCE_ENDINGS and self.buffer[end] != "\n":
+                    end += 1
+                # Wait for the next token: the run may go on ("Hello world." + "..")
+                if end == len(self.buffer):
+                    break
+                # Treat "3.5" / "v1.2" as part of a number, not a boundary
+                if ch == "." and end == i and self.buffer[end].isdigit():
+                    continue
+                i = end
+            candidate = self.buffer[start:i].strip()
+            if len(candidate) >= self.min_length:
+                sentences.append(candidate)
+                start = i
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever is left in the buffer as a final sentence."""
+        rest = self.buffer.strip()
+        self.buffer = ""
+        return [rest] if rest else []
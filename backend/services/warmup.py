@@ -0,0 +1,205 @@
+# backend/services/warmup.py
+"""
+Worker warm-up and readiness.
+
+Right after a (re)start, the first requests used to pay for everything that
+is set up lazily: the FAISS index load, TLS handshakes to the LLM providers,
+template compilation, the tokenizer and the deferred imports. The startup
+event now does that work once, as named steps (run()), before the worker
+reports itself ready:
+
+  imports            deferred modules (core/lazy.py) and the tokenizers
+  database           one query on the users DB and on the chat DB
+  templates          compile and render the HTML pages (core/page_cache.py)
+  provider:<name>    open pooled keep-alive connections to each LLM provider
+  embeddings         one synthetic embedding (also warms that client)
+  index              load (or create) the FAISS chat index
+
+Every step has a timeout. A failed step is logged and reported, but the
+other steps still run. GET /readyz (api/health.py) answers 503 until the
+warm-up has finished and the required steps (database, templates) passed,
+so the load balancer only routes traffic to warmed workers. AI features are
+optional: if they fail, the worker is reported as "degraded", not unready.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+
+from backend.core import lazy
+from backend.core.config import settings
+from backend.db.database import SessionLocal
+from backend.db.db import get_connection
+from backend.services.context_builder import get_context_assembler
+
+# A worker is not ready unless these steps passed
+REQUIRED_STEPS = ("database", "templates")
+
+
+class StepSkipped(Exception):
+    """A step whose dependency is not configured (e.g. no API key)."""
+
+
+@dataclass
+class StepResult:
+    ok: bool
+    latency_ms: float
+    detail: Optional[str] = None  # what was warmed, or why it failed / was skipped
+    skipped: bool = False
+
+
+def check_database() -> str:
+    """One round trip to each database (SQLAlchemy users DB, sqlite chat DB)."""
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+    conn = get_connection()
+    try:
+        conn.execute("SELECT 1")
+    finally:
+        conn.close()
+    return "users + chats"
+
+
+async def _timed(fn: Callable[[], Awaitable[Optional[str]]], timeout: float) -> StepResult:
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(fn(), timeout)
+        ok, skipped = True, False
+    except StepSkipped as e:
+        detail, ok, skipped = str(e), True, True
+    except asyncio.TimeoutError:
+        detail, ok, skipped = f"timed out after {timeout:g}s", False, False
+    except Exception as e:
+        detail, ok, skipped = f"{type(e).__name__}: {e}", False, False
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    return StepResult(ok=ok, latency_ms=latency_ms, detail=detail, skipped=skipped)
+
+
+class Warmup:
+    """Runs the warm-up steps once per process and reports readiness."""
+
+    def __init__(self, enabled: bool = True, step_timeout: float = 20.0, provider_connections: int = 2):
+        self.enabled = enabled
+        self.step_timeout = step_timeout
+        self.provider_connections = provider_connections
+        self.state = "pending"  # pending -> running -> done
+        self.steps: Dict[str, StepResult] = {}
+        self.duration_ms: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings) -> "Warmup":
+        return cls(
+            enabled=settings.WARMUP_ENABLED,
+            step_timeout=settings.WARMUP_STEP_TIMEOUT_SECONDS,
+            provider_connections=settings.WARMUP_PROVIDER_CONNECTIONS,
+        )
+
+    # =====================================================
+    # WARM-UP
+    # =====================================================
+    async def run(self, app, page_templates: Iterable[str] = ()):
+        """Run every step in order (called from the startup event)."""
+        if not self.enabled:
+            self.state = "done"
+            return
+        self.state = "running"
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        state = app.state
+        pool = getattr(state, "llm_pool", None)
+
+        def in_thread(fn: Callable[[], Optional[str]]) -> Callable[[], Awaitable[Optional[str]]]:
+            return lambda: loop.run_in_executor(None, fn)
+
+        def load_imports() -> str:
+            modules = lazy.preload()
+            models = {settings.OPENAI_MODEL, *(pool.model(p) for p in pool.providers)} if pool else {settings.OPENAI_MODEL}
+            for model in models:
+                get_context_assembler(model).counter.count("warm-up")
+            return f"{len(modules)} modules, {len(models)} tokenizers"
+
+        def compile_templates() -> str:
+            templates = set(page_templates)
+            state.page_cache.compile(templates)
+            return f"{len(templates)} templates"
+
+        def load_index() -> str:
+            rag = getattr(state, "rag_manager", None)
+            if rag is None:
+                raise StepSkipped("RAG disabled")
+            if not rag.ensure_index():
+                raise RuntimeError("index unavailable")
+            return "loaded"
+
+        async def embed() -> str:
+            embeddings = getattr(state, "embeddings", None)
+            if embeddings is None:
+                raise StepSkipped("embeddings not configured")
+            vector = await embeddings.aembed_query("warm-up")
+            return f"{len(vector)} dimensions"
+
+        def open_connections(provider: str) -> Callable[[], Awaitable[str]]:
+            async def warm() -> str:
+                statuses = await pool.warm(provider, self.provider_connections)
+                return f"{len(statuses)} connections (HTTP {', '.join(map(str, statuses))})"
+            return warm
+
+        steps: Dict[str, Callable[[], Awaitable[Optional[str]]]] = {
+            "imports": in_thread(load_imports),
+            "database": in_thread(check_database),
+            "templates": in_thread(compile_templates),
+        }
+        for provider in (pool.providers if pool else []):
+            steps[f"provider:{provider}"] = open_connections(provider)
+        steps["embeddings"] = embed
+        steps["index"] = in_thread(load_index)
+
+        for name, step in steps.items():
+            result = await _timed(step, self.step_timeout)
+            self.steps[name] = result
+            icon = "⏭️" if result.skipped else "✅" if result.ok else "❌"
+            print(f"[Warmup] {icon} {name}: {result.detail} ({result.latency_ms:.0f} ms)")
+
+        self.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.state = "done"
+        print(f"[Warmup] 🔥 Worker warmed up in {self.duration_ms:.0f} ms")
+
+    # =====================================================
+    # READINESS
+    # =====================================================
+    async def readiness(self, app) -> Tuple[bool, Dict[str, Any]]:
+        """(ready, report): the warm-up results plus live database and index checks."""
+        checks: Dict[str, Any] = {name: asdict(result) for name, result in self.steps.items()}
+
+        live = await _timed(lambda: asyncio.get_running_loop().run_in_executor(None, check_database), self.step_timeout)
+        checks["database"] = asdict(live)
+        rag = getattr(app.state, "rag_manager", None)
+        if rag is not None and "index" in checks:
+            # The index can also be (re)loaded after the warm-up, by the first search
+            checks["index"]["ok"] = rag.vectorstore is not None
+
+        warmed = self.state == "done"
+        ready = warmed and all(checks[name]["ok"] for name in REQUIRED_STEPS if name in checks)
+        if not ready:
+            status = "warming" if not warmed else "not_ready"
+        elif all(check["ok"] for check in checks.values()):
+            status = "ready"
+        else:
+            status = "degraded"
+        return ready, {
+            "status": status,
+            "warmup": {"state": self.state, "duration_ms": self.duration_ms},
+            "checks": checks,
+        }
+
+
+# Global instance
+warmup = Warmup.from_settings(settings)
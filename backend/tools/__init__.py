@@ -0,0 +1 @@
+"""Developer tools: offline mock LLM server, load testing and build helpers."""
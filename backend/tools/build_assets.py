@@ -0,0 +1,49 @@
+# backend/tools/build_assets.py
+"""
+Build the fingerprinted, precompressed static assets served under /assets/.
+
+Usage:
+    python -m backend.tools.build_assets
+    python -m backend.tools.build_assets --static-dir backend/Static --out backend/Static/dist
+    python -m backend.tools.build_assets --keep 5     # keep the files of the last 5 builds
+    python -m backend.tools.build_assets --prune-only
+
+Run it on deploy (and after editing files in Static/). A build only adds
+files and then switches manifest.json over, so it is safe while servers
+are running: they look the new hashed names up on the next request, and
+pages rendered before it (cached by a worker, a browser or a CDN) keep
+working because the previous builds' files are still served. After the
+build, the files that none of the last --keep builds use are pruned.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from backend.core.assets import DIST_DIR, STATIC_DIR, build, prune
+from backend.core.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress Static/ assets")
+    parser.add_argument("--static-dir", type=Path, default=STATIC_DIR)
+    parser.add_argument("--out", type=Path, default=DIST_DIR)
+    parser.add_argument("--keep", type=int, default=settings.ASSETS_KEEP_BUILDS,
+                        help="builds whose hashed files stay servable")
+    parser.add_argument("--prune-only", action="store_true", help="only remove the files of older builds")
+    args = parser.parse_args()
+
+    if not args.prune_only:
+        manifest = build(args.static_dir, args.out)
+        for name, entry in manifest["assets"].items():
+            sizes = ", ".join(f"{coding} {size:,}" for coding, size in entry["encodings"].items()) or "not compressed"
+            print(f"  {name:32} -> {entry['path']:40} {entry['size']:>9,} B  ({sizes})")
+        print(f"✅ {len(manifest['assets'])} assets written to {args.out} (build {manifest['build']})")
+
+    removed = prune(args.out, keep=args.keep)
+    print(f"🧹 Pruned {len(removed)} files of builds older than the last {args.keep}")
+
+
+if __name__ == "__main__":
+    main()
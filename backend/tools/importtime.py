@@ -0,0 +1,102 @@
+# backend/tools/importtime.py
+"""
+Startup import profile: where the cold import of the app spends its time.
+
+Usage:
+    python -m backend.tools.importtime
+    python -m backend.tools.importtime --target backend.app --top 25 --depth 3
+
+Runs `python -X importtime -c "import <target>"` in a fresh interpreter and
+prints the slowest import subtrees, the self time per top-level package, and
+the wall-clock import time against settings.IMPORT_BUDGET_MS (exit code 1
+when over budget). Heavy packages that are only needed by some requests
+belong behind backend.core.lazy.lazy_import().
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from backend.core.config import settings
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int  # nesting level; 0 = imported at top level
+
+
+def run_python(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+
+
+def profile(target: str = "backend.app") -> List[ImportRecord]:
+    """Per-module import times of a cold `import target`, in import order."""
+    records = []
+    for line in run_python(f"import {target}", "-X", "importtime").stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(module, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    return records
+
+
+def measure_import_ms(target: str = "backend.app", runs: int = 3) -> float:
+    """Wall-clock ms of `import target` in a fresh interpreter; best of `runs`."""
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"import {target}; print((time.perf_counter() - started) * 1000)"
+    )
+    return min(float(run_python(code).stdout.strip().splitlines()[-1]) for _ in range(runs))
+
+
+def by_package(records: List[ImportRecord]) -> Dict[str, float]:
+    """Self time per top-level package, slowest first."""
+    totals: Dict[str, float] = defaultdict(float)
+    for record in records:
+        totals[record.module.split(".")[0]] += record.self_ms
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the cold import of the app")
+    parser.add_argument("--target", default="backend.app")
+    parser.add_argument("--top", type=int, default=20, help="rows per table")
+    parser.add_argument("--depth", type=int, default=2, help="deepest subtree level listed")
+    parser.add_argument("--budget-ms", type=float, default=settings.IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    records = profile(args.target)
+    print(f"Slowest imports under {args.target} (cumulative / self ms):")
+    subtrees = sorted((r for r in records if r.depth <= args.depth), key=lambda r: r.cumulative_ms, reverse=True)
+    for record in subtrees[: args.top]:
+        print(f"  {record.cumulative_ms:9.1f} {record.self_ms:8.1f}  {'  ' * record.depth}{record.module}")
+
+    print("\nSelf time by top-level package (ms):")
+    for package, ms in list(by_package(records).items())[: args.top]:
+        print(f"  {ms:9.1f}  {package}")
+
+    elapsed = measure_import_ms(args.target)
+    over = elapsed > args.budget_ms
+    print(f"\n{'❌' if over else '✅'} import {args.target}: {elapsed:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+# backend/tools/loadtest.py
+"""
+Async load generator for the AskTech FastAPI app.
+
+Drives a weighted mix of requests described by a scenario file
+(backend/tools/scenarios/*.json) with N concurrent virtual users. Each user
+registers and logs in once, then loops over weighted actions until the
+duration is over. Reports throughput and p50/p95/p99 latency per endpoint and
+compares the run to a stored baseline; a regression makes the exit code 1.
+
+Usage:
+    # against a running server (ideally started with MOCK_LLM_URL set)
+    python -m backend.tools.loadtest --scenario mixed --url http://127.0.0.1:8001
+
+    # in-process against backend.app:app (no server needed)
+    python -m backend.tools.loadtest --scenario smoke --in-process
+
+    # record the current numbers as the baseline for this scenario
+    python -m backend.tools.loadtest --scenario mixed --in-process --save-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+TOOLS_DIR = Path(__file__).resolve().parent
+SCENARIO_DIR = TOOLS_DIR / "scenarios"
+BASELINE_DIR = TOOLS_DIR / "loadtest_baselines"
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Linear-interpolated percentile (pct in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def load_scenario(name_or_path: str) -> Dict[str, Any]:
+    path = Path(name_or_path)
+    if not path.exists():
+        path = SCENARIO_DIR / f"{name_or_path}.json"
+    with open(path, "r", encoding="utf-8") as f:
+        scenario = json.load(f)
+    scenario.setdefault("name", path.stem)
+    return scenario
+
+
+# =====================================================
+# Measurement
+# =====================================================
+class Recorder:
+    """Collects latency samples and errors per endpoint name."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+
+    def record(self, endpoint: str, elapsed: float, ok: bool):
+        self.latencies[endpoint].append(elapsed)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self) -> Dict[str, Any]:
+        wall = (self.finished or time.monotonic()) - self.started
+        endpoints = {}
+        for name, samples in sorted(self.latencies.items()):
+            endpoints[name] = {
+                "requests": len(samples),
+                "errors": self.errors[name],
+                "error_rate": round(self.errors[name] / len(samples), 4),
+                "rps": round(len(samples) / wall, 2) if wall else 0.0,
+                "mean_ms": round(sum(samples) / len(samples) * 1000, 1),
+                "p50_ms": round(percentile(samples, 50) * 1000, 1),
+                "p95_ms": round(percentile(samples, 95) * 1000, 1),
+                "p99_ms": round(percentile(samples, 99) * 1000, 1),
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        errors = sum(e["errors"] for e in endpoints.values())
+        return {
+            "duration_seconds": round(wall, 2),
+            "total_requests": total,
+            "total_errors": errors,
+            "throughput_rps": round(total / wall, 2) if wall else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+# =====================================================
+# Virtual users
+# =====================================================
+def _render(value: Any, variables: Dict[str, str]) -> Any:
+    """Substitute {user}-style placeholders in strings inside a request body."""
+    if isinstance(value, str):
+        # Plain replacement, not str.format: prompts contain literal JSON braces
+        for name, replacement in variables.items():
+            value = value.replace("{" + name + "}", replacement)
+        return value
+    if isinstance(value, list):
+        return [_render(v, variables) for v in value]
+    if isinstance(value, dict):
+        return {k: _render(v, variables) for k, v in value.items()}
+    return value
+
+
+async def _request(client: httpx.AsyncClient, recorder: Recorder, name: str, method: str,
+                   path: str, headers: Dict[str, str], body: Any = None,
+                   expect: int = 200, stream: bool = False) -> Optional[httpx.Response]:
+    start = time.monotonic()
+    try:
+        if stream:
+            # Measure until the whole event stream has been received
+            async with client.stream(method, path, json=body, headers=headers) as response:
+                async for _ in response.aiter_bytes():
+                    pass
+        else:
+            response = await client.request(method, path, json=body, headers=headers)
+        ok = response.status_code == expect
+    except Exception as e:
+        print(f"[LoadTest] {name} failed: {e}")
+        response, ok = None, False
+    recorder.record(name, time.monotonic() - start, ok)
+    return response
+
+
+async def _login(client: httpx.AsyncClient, recorder: Recorder) -> Dict[str, str]:
+    username = f"load_{uuid.uuid4().hex[:10]}"
+    password = "LoadTest123!"
+    await _request(client, recorder, "POST /api/auth/register", "POST", "/api/auth/register", {},
+                   {"email": f"{username}@example.com", "username": username, "password": password},
+                   expect=201)
+    response = await _request(client, recorder, "POST /api/auth/login", "POST", "/api/auth/login", {},
+                              {"username": username, "password": password})
+    if response is None or response.status_code != 200:
+        return {}
+    return {"Authorization": f"Bearer {response.json()['access_token']}", "X-Loadtest-User": username}
+
+
+async def _virtual_user(client: httpx.AsyncClient, recorder: Recorder, scenario: Dict[str, Any],
+                        deadline: float, rng: random.Random):
+    headers = await _login(client, recorder)
+    username = headers.pop("X-Loadtest-User", "anonymous")
+    actions = scenario["actions"]
+    weights = [a.get("weight", 1) for a in actions]
+    think_min, think_max = scenario.get("think_time_ms", [0, 0])
+
+    while time.monotonic() < deadline:
+        action = rng.choices(actions, weights=weights)[0]
+        variables = {"user": username, "n": str(rng.randint(0, 10_000))}
+        body = action.get("json")
+        if "messages" in action:
+            body = {**(body or {}), "message": rng.choice(action["messages"])}
+        await _request(
+            client,
+            recorder,
+            action.get("name", f"{action['method']} {action['path']}"),
+            action["method"],
+            action["path"],
+            headers if action.get("auth", True) else {},
+            _render(body, variables),
+            expect=action.get("expect", 200),
+            stream=action.get("stream", False),
+        )
+        if think_max:
+            await asyncio.sleep(rng.uniform(think_min, think_max) / 1000.0)
+
+
+async def run_scenario(scenario: Dict[str, Any], url: Optional[str] = None,
+                       users: Optional[int] = None, duration: Optional[float] = None,
+                       seed: Optional[int] = None) -> Dict[str, Any]:
+    """Run a scenario and return the report. url=None runs backend.app in-process."""
+    users = users or scenario.get("users", 10)
+    duration = duration or scenario.get("duration_seconds", 30)
+    limits = httpx.Limits(max_connections=users * 2, max_keepalive_connections=users)
+    timeout = httpx.Timeout(scenario.get("timeout_seconds", 120))
+
+    async with contextlib.AsyncExitStack() as stack:
+        if url:
+            client = httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout)
+        else:
+            # Don't let the startup event open a browser tab for every run
+            os.environ.setdefault("RUN_MAIN", "true")
+            from backend.app import app
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://loadtest",
+                limits=limits,
+                timeout=timeout,
+            )
+        await stack.enter_async_context(client)
+
+        recorder = Recorder()
+        deadline = time.monotonic() + duration
+        rng = random.Random(seed)
+        print(f"[LoadTest] ▶️ Scenario '{scenario['name']}': {users} users for {duration}s "
+              f"against {url or 'backend.app (in-process)'}")
+        await asyncio.gather(*[
+            _virtual_user(client, recorder, scenario, deadline, random.Random(rng.random()))
+            for _ in range(users)
+        ])
+        recorder.finished = time.monotonic()
+
+    report = recorder.report()
+    report["scenario"] = scenario["name"]
+    report["users"] = users
+    return report
+
+
+# =====================================================
+# Baseline comparison
+# =====================================================
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                        tolerance: float, error_tolerance: float,
+                        min_delta_ms: float = 5.0) -> List[str]:
+    """Return a list of human-readable regressions (empty = pass)."""
+    regressions = []
+    for name, base in baseline.get("endpoints", {}).items():
+        current = report["endpoints"].get(name)
+        if current is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            # Relative tolerance plus an absolute floor, so jitter on
+            # millisecond-fast endpoints does not count as a regression
+            allowed = max(base[metric] * (1 + tolerance), base[metric] + min_delta_ms)
+            if current[metric] > allowed:
+                regressions.append(
+                    f"{name}: {metric} {current[metric]}ms > {allowed:.1f}ms "
+                    f"(baseline {base[metric]}ms)"
+                )
+        if current["error_rate"] > base["error_rate"] + error_tolerance:
+            regressions.append(
+                f"{name}: error rate {current['error_rate']:.2%} > baseline {base['error_rate']:.2%}"
+            )
+    base_rps = baseline.get("throughput_rps", 0.0)
+    if base_rps and report["throughput_rps"] < base_rps * (1 - tolerance):
+        regressions.append(
+            f"throughput {report['throughput_rps']} rps < baseline {base_rps} rps -{tolerance:.0%}"
+        )
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    header = f"{'endpoint':<32} {'reqs':>6} {'err':>5} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}"
+    print("\n" + header)
+    print("-" * len(header))
+    for name, e in report["endpoints"].items():
+        print(f"{name:<32} {e['requests']:>6} {e['errors']:>5} {e['rps']:>7} "
+              f"{e['p50_ms']:>8} {e['p95_ms']:>8} {e['p99_ms']:>8}")
+    print("-" * len(header))
+    print(f"total: {report['total_requests']} requests, {report['total_errors']} errors, "
+          f"{report['throughput_rps']} rps over {report['duration_seconds']}s\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AskTech load test")
+    parser.add_argument("--scenario", default="mixed", help="scenario name in backend/tools/scenarios or a path")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process)")
+    parser.add_argument("--in-process", action="store_true", help="run backend.app:app in this process")
+    parser.add_argument("--users", type=int, help="override the scenario's concurrent users")
+    parser.add_argument("--duration", type=float, help="override the scenario's duration in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", help="baseline file (default: loadtest_baselines/<scenario>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative latency/throughput regression")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore latency increases smaller than this")
+    parser.add_argument("--error-tolerance", type=float, default=0.01, help="allowed absolute error-rate increase")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    if args.url and args.in_process:
+        parser.error("--url and --in-process are mutually exclusive")
+
+    scenario = load_scenario(args.scenario)
+    report = asyncio.run(run_scenario(
+        scenario,
+        url=args.url,
+        users=args.users,
+        duration=args.duration,
+        seed=args.seed,
+    ))
+    print_report(report)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline_path = Path(args.baseline) if args.baseline else BASELINE_DIR / f"{scenario['name']}.json"
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"[LoadTest] 💾 Baseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"[LoadTest] ℹ️ No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare_to_baseline(
+        report, baseline, args.tolerance, args.error_tolerance, args.min_delta_ms
+    )
+    if regressions:
+        print("[LoadTest] ❌ Regressions against baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("[LoadTest] ✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+# backend/tools/mock_llm_server.py
+"""
+Offline OpenAI / NVIDIA NIM compatible mock server for load and latency tests.
+
+Implements the endpoints the app actually uses:
+- POST /v1/chat/completions  (normal and "stream": true SSE chunks)
+- POST /v1/embeddings        (deterministic, similarity-preserving vectors)
+- GET  /v1/models
+
+Latency, token rate and error injection are configurable from the command line,
+environment variables (MOCK_LLM_*) or at runtime via POST /_mock/config.
+Point the app at it with MOCK_LLM_URL=http://127.0.0.1:9100/v1 in .env.
+
+Usage:
+    python -m backend.tools.mock_llm_server --port 9100 --latency-ms 400 --tokens-per-sec 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class MockConfig:
+    latency_ms: float = 300.0         # time to first token
+    latency_jitter_ms: float = 100.0
+    latency_dist: str = "normal"      # fixed | uniform | normal | lognormal
+    tokens_per_sec: float = 50.0      # generation speed after the first token
+    error_rate: float = 0.0           # probability of an injected error
+    error_status: int = 500           # status used for injected errors (e.g. 429, 503)
+    embedding_dim: int = 1536
+    seed: Optional[int] = None
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        cfg = cls()
+        for name, value in asdict(cfg).items():
+            raw = os.getenv(f"MOCK_LLM_{name.upper()}")
+            if raw is None:
+                continue
+            kind = type(value) if value is not None else int
+            setattr(cfg, name, kind(raw))
+        return cfg
+
+    def update(self, values: Dict[str, Any]):
+        for name, value in values.items():
+            if hasattr(self, name):
+                current = getattr(self, name)
+                setattr(self, name, type(current)(value) if current is not None else value)
+
+
+config = MockConfig.from_env()
+rng = random.Random(config.seed)
+stats: Dict[str, int] = {
+    "chat_requests": 0,
+    "stream_requests": 0,
+    "embedding_requests": 0,
+    "embedded_inputs": 0,
+    "errors_injected": 0,
+    "completion_tokens": 0,
+}
+
+app = FastAPI(title="AskTech mock LLM server")
+
+
+# =====================================================
+# Simulation helpers
+# =====================================================
+def _sample_latency() -> float:
+    """Seconds until the first token, drawn from the configured distribution."""
+    mean = config.latency_ms / 1000.0
+    jitter = config.latency_jitter_ms / 1000.0
+    if config.latency_dist == "fixed" or jitter <= 0:
+        value = mean
+    elif config.latency_dist == "uniform":
+        value = rng.uniform(mean - jitter, mean + jitter)
+    elif config.latency_dist == "lognormal":
+        # Long right tail, median ~= mean
+        sigma = min(jitter / mean, 2.0) if mean > 0 else 0.5
+        value = mean * math.exp(rng.gauss(0, sigma))
+    else:
+        value = rng.gauss(mean, jitter)
+    return max(value, 0.0)
+
+
+def _token_delay() -> float:
+    return 1.0 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+
+
+def _injected_error() -> Optional[JSONResponse]:
+    if config.error_rate <= 0 or rng.random() >= config.error_rate:
+        return None
+    stats["errors_injected"] += 1
+    headers = {"Retry-After": "1"} if config.error_status == 429 else {}
+    return JSONResponse(
+        status_code=config.error_status,
+        content={"error": {"message": "Injected mock error", "type": "mock_error", "code": config.error_status}},
+        headers=headers,
+    )
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return str(content)
+
+
+def _build_reply(messages: List[Dict[str, Any]]) -> str:
+    """Deterministic reply text shaped like what the frontend pages expect."""
+    user_text = next((_message_text(m) for m in reversed(messages) if m.get("role") == "user"), "")
+    all_text = " ".join(_message_text(m) for m in messages)
+    digest = int(hashlib.sha256(user_text.encode("utf-8")).hexdigest(), 16)
+
+    if '"phases"' in all_text or "roadmap" in all_text.lower():
+        phases = [
+            {
+                "title": f"المرحلة {i}: مرحلة تجريبية {digest % 97 + i}",
+                "duration": f"{2 * i}-{2 * i + 2} أسابيع",
+                "icon": ["📚", "📊", "🚀", "🎯"][i % 4],
+                "description": "• نقطة أولى • نقطة ثانية • نقطة ثالثة",
+                "skills": [f"skill-{i}-a", f"skill-{i}-b"],
+                "resources": [f"resource-{i}"],
+            }
+            for i in range(1, 5)
+        ]
+        return json.dumps({"phases": phases}, ensure_ascii=False)
+    if '"results"' in all_text:
+        # Batched skill analysis: one entry per candidate in the user's JSON payload
+        try:
+            candidates = json.loads(user_text).get("candidates", [])
+        except (ValueError, AttributeError):
+            candidates = []
+        results = [
+            {
+                "id": c.get("id"),
+                "titles": [f"Mock {s.title()} Engineer" for s in c.get("skills", [])[:3]],
+                "questions": [f"Explain a project where you used {s}." for s in c.get("skills", [])[:5]],
+            }
+            for c in candidates
+        ]
+        return json.dumps({"results": results}, ensure_ascii=False)
+    if '"scores"' in all_text:
+        scores = [{"question": f"q{i}", "answer": f"a{i}", "score": 5 + (digest + i) % 5, "justification": "mock"} for i in range(1, 6)]
+        return json.dumps({"scores": scores, "average": 7.0}, ensure_ascii=False)
+    if '"questions"' in all_text or "json" in all_text.lower():
+        questions = [f"سؤال تجريبي رقم {i} ({digest % 1000})" for i in range(1, 6)]
+        return json.dumps({"questions": questions, "titles": ["Mock Engineer"]}, ensure_ascii=False)
+    if re.search("[؀-ۿ]", user_text):
+        return "ده رد تجريبي من السيرفر. جرّب تسأل تاني. بالتوفيق!"
+    snippet = " ".join(user_text.split()[:12])
+    return f"This is a mock reply. You asked about: {snippet}. Keep practicing and good luck!"
+
+
+def _split_tokens(text: str) -> List[str]:
+    # Roughly word-sized chunks, keeping the whitespace so joining restores the text
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+def _embed(item: Any) -> List[float]:
+    """
+    Hashing-trick embedding: each word (or token id) adds a signed unit to one
+    dimension, so texts that share words get similar vectors. Fully deterministic.
+    """
+    if isinstance(item, list):
+        features = [str(t) for t in item]
+    else:
+        features = re.findall(r"\w+", str(item).lower())
+    vector = [0.0] * config.embedding_dim
+    for feature in features or [""]:
+        h = int(hashlib.md5(feature.encode("utf-8")).hexdigest(), 16)
+        vector[h % config.embedding_dim] += 1.0 if (h >> 64) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+# =====================================================
+# OpenAI-compatible endpoints
+# =====================================================
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "mock-model", "object": "model", "owned_by": "mock"}]}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    stats["chat_requests"] += 1
+    error = _injected_error()
+    if error is not None:
+        return error
+
+    model = body.get("model", "mock-model")
+    messages = body.get("messages", [])
+    tokens = _split_tokens(_build_reply(messages))
+    max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+    if max_tokens:
+        tokens = tokens[: int(max_tokens)]
+    stats["completion_tokens"] += len(tokens)
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+    created = int(time.time())
+    prompt_tokens = sum(len(_message_text(m).split()) for m in messages)
+
+    if body.get("stream"):
+        stats["stream_requests"] += 1
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+        async def event_stream():
+            await asyncio.sleep(_sample_latency())
+            yield chunk({"role": "assistant", "content": ""})
+            delay = _token_delay()
+            for token in tokens:
+                yield chunk({"content": token})
+                if delay:
+                    await asyncio.sleep(delay)
+            yield chunk({}, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    await asyncio.sleep(_sample_latency() + _token_delay() * len(tokens))
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": "".join(tokens)},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        },
+    }
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    stats["embedding_requests"] += 1
+    error = _injected_error()
+    if error is not None:
+        return error
+
+    inputs = body.get("input", [])
+    # A single string, a single token list, or a batch of either
+    if isinstance(inputs, str) or (isinstance(inputs, list) and inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+    stats["embedded_inputs"] += len(inputs)
+    await asyncio.sleep(_sample_latency() / 4)
+    return {
+        "object": "list",
+        "model": body.get("model", "mock-embedding"),
+        "data": [{"object": "embedding", "index": i, "embedding": _embed(item)} for i, item in enumerate(inputs)],
+        "usage": {"prompt_tokens": 0, "total_tokens": 0},
+    }
+
+
+# =====================================================
+# Mock control endpoints
+# =====================================================
+@app.get("/_mock/config")
+async def get_config():
+    return asdict(config)
+
+
+@app.post("/_mock/config")
+async def set_config(request: Request):
+    """Change latency / error settings while a load test is running."""
+    config.update(await request.json())
+    return asdict(config)
+
+
+@app.get("/_mock/stats")
+async def get_stats():
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenAI/NIM compatible mock LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, help="mean time to first token")
+    parser.add_argument("--latency-jitter-ms", type=float)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "normal", "lognormal"])
+    parser.add_argument("--tokens-per-sec", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--error-status", type=int)
+    parser.add_argument("--embedding-dim", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    overrides = {
+        k: v for k, v in vars(args).items()
+        if v is not None and k not in ("host", "port")
+    }
+    config.update(overrides)
+    if args.seed is not None:
+        rng.seed(args.seed)
+
+    import uvicorn
+    print(f"[MockLLM] Serving on http://{args.host}:{args.port}/v1 with {asdict(config)}")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
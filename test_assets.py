@@ -0,0 +1,35 @@
+# test_assets.py
+"""
+Asset builds keep the previous hashed files servable until they are pruned,
+so pages rendered before a deploy do not link to missing files.
+"""
+
+from backend.core.assets import AssetManifest, build, prune
+
+
+def _build(static_dir, dist_dir, content):
+    (static_dir / "app.js").write_text(content, encoding="utf-8")
+    return build(static_dir, dist_dir)["assets"]["app.js"]["path"]
+
+
+def test_previous_builds_stay_servable_until_pruned(tmp_path):
+    static_dir, dist_dir = tmp_path / "Static", tmp_path / "Static" / "dist"
+    static_dir.mkdir()
+    paths = [_build(static_dir, dist_dir, f"console.log({i});") for i in range(3)]
+
+    manifest = AssetManifest(dist_dir / "manifest.json")
+    assert manifest.url("app.js") == f"/assets/{paths[-1]}"
+    for path in paths:
+        assert manifest.lookup(path) is not None
+        assert (dist_dir / path).is_file()
+
+    removed = prune(dist_dir, keep=2)
+    assert removed == [paths[0]]
+    assert not (dist_dir / paths[0]).exists()
+    assert (dist_dir / paths[1]).is_file() and (dist_dir / paths[2]).is_file()
+
+
+def test_prune_without_build_history_removes_nothing(tmp_path):
+    (tmp_path / "app.0123456789.js").write_text("x", encoding="utf-8")
+    assert prune(tmp_path, keep=1) == []
+    assert (tmp_path / "app.0123456789.js").exists()
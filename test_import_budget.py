@@ -0,0 +1,33 @@
+# test_import_budget.py
+"""
+Cold-start guard: `import backend.app` in a fresh interpreter must stay
+within settings.IMPORT_BUDGET_MS. If it fails, run
+`python -m backend.tools.importtime` to see which import got slower and
+defer it with backend.core.lazy.lazy_import().
+"""
+
+from backend.core.config import settings
+from backend.tools.importtime import measure_import_ms, run_python
+
+
+def test_cold_import_within_budget():
+    elapsed = measure_import_ms("backend.app")
+    assert elapsed <= settings.IMPORT_BUDGET_MS, (
+        f"cold import of backend.app took {elapsed:.0f} ms "
+        f"(budget {settings.IMPORT_BUDGET_MS} ms)"
+    )
+
+
+def test_heavy_dependencies_deferred():
+    code = (
+        "import sys, backend.app; "
+        "print(','.join(m for m in ('numpy', 'httpx', 'jose', 'langchain_core', 'faiss') if m in sys.modules))"
+    )
+    loaded = run_python(code).stdout.strip().splitlines()[-1:]
+    assert loaded in ([], [""]), f"imported eagerly by backend.app: {loaded[0]}"
+
+
+if __name__ == "__main__":
+    test_cold_import_within_budget()
+    test_heavy_dependencies_deferred()
+    print("OK: backend.app cold import is within budget")
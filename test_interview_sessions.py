@@ -0,0 +1,37 @@
+# test_interview_sessions.py
+"""Interview session registry: abandoned sessions do not pile up."""
+
+import time
+
+from backend.services.interview_sessions import InterviewSessionStore
+
+
+def _abandon(store, session):
+    store.attach(session, websocket=object())
+    store.detach(session, session.websocket)
+    session.detached_at = time.monotonic() - store.session_ttl - 1
+
+
+def test_expired_detached_session_is_dropped_without_resume():
+    store = InterviewSessionStore(session_ttl=10.0)
+    abandoned = store.create(1, "alice", "en-US", "free")
+    _abandon(store, abandoned)
+
+    store.create(2, "bob", "en-US", "free")
+
+    assert store.stats()["sessions"] == 1
+    assert store.stats()["expired"] == 1
+    assert store.resume(abandoned.session_id, 1) is None
+
+
+def test_sweep_keeps_connected_and_recent_sessions():
+    store = InterviewSessionStore(session_ttl=10.0)
+    connected = store.create(1, "alice", "en-US", "free")
+    store.attach(connected, websocket=object())
+    recent = store.create(2, "bob", "en-US", "free")
+    store.attach(recent, websocket=object())
+    store.detach(recent, recent.websocket)
+
+    store.sweep()
+
+    assert store.stats()["sessions"] == 2
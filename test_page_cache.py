@@ -0,0 +1,38 @@
+# test_page_cache.py
+"""
+Cached pages follow asset builds even with PAGE_CACHE_CHECK_MTIME off:
+the manifest version is part of the cache key and of the ETag.
+"""
+
+from fastapi.templating import Jinja2Templates
+
+from backend.core import page_cache
+from backend.core.assets import AssetManifest, build
+
+
+def test_new_asset_build_rerenders_cached_page(tmp_path, monkeypatch):
+    static_dir, dist_dir, template_dir = tmp_path / "Static", tmp_path / "Static" / "dist", tmp_path / "templates"
+    static_dir.mkdir()
+    template_dir.mkdir()
+    (template_dir / "index.html").write_text('<script src="{{ asset_url(\'app.js\') }}"></script>', encoding="utf-8")
+    manifest = AssetManifest(dist_dir / "manifest.json")
+    monkeypatch.setattr(page_cache, "asset_manifest", manifest)
+
+    templates = Jinja2Templates(directory=str(template_dir))
+    templates.env.globals["asset_url"] = manifest.url
+    cache = page_cache.PageCache(templates, check_mtime=False)
+
+    (static_dir / "app.js").write_text("console.log(1);", encoding="utf-8")
+    first_build = build(static_dir, dist_dir)
+    first = cache.get("index.html")
+    assert first_build["assets"]["app.js"]["path"].encode() in first.body
+    assert cache.get("index.html") is first
+
+    (static_dir / "app.js").write_text("console.log(2);", encoding="utf-8")
+    second_build = build(static_dir, dist_dir)
+    second = cache.get("index.html")
+    assert second_build["assets"]["app.js"]["path"].encode() in second.body
+    assert second.etag != first.etag
+    assert second_build["build"] in second.etag
+    assert not page_cache.etag_matches(first.etag, second.etag)
+    assert cache.stats()["pages"] == 1
@@ -0,0 +1,52 @@
+# test_response_cache.py
+"""
+The response cache only matches free-text chat semantically; structured
+JSON prompts (templated per job title) need an exact match on the same page.
+"""
+
+import asyncio
+
+from backend.services.response_cache import SemanticResponseCache
+
+
+class _SameVectorEmbeddings:
+    """Every text embeds to the same vector: any semantic lookup would hit."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def aembed_query(self, text):
+        self.calls += 1
+        return [1.0, 0.0, 0.0]
+
+
+ROADMAP = 'Return JSON only: {"roadmap": [...]} for the job title "%s" with 12 weekly steps.'
+
+
+def test_json_prompts_for_other_jobs_do_not_share_a_reply():
+    embeddings = _SameVectorEmbeddings()
+    cache = SemanticResponseCache(embeddings=embeddings)
+
+    async def run():
+        await cache.aset("json", ROADMAP % "Data Engineer", "data roadmap", page="career-path")
+        other_job = await cache.aget("json", ROADMAP % "Data Scientist", "career-path")
+        same_job = await cache.aget("json", ROADMAP % "Data Engineer", "career-path")
+        other_page = await cache.aget("json", ROADMAP % "Data Engineer", "interview")
+        return other_job, same_job, other_page
+
+    other_job, same_job, other_page = asyncio.run(run())
+    assert not other_job.hit
+    assert same_job.hit and same_job.response == "data roadmap"
+    assert not other_page.hit
+    assert embeddings.calls == 0
+
+
+def test_free_text_chat_still_matches_semantically():
+    cache = SemanticResponseCache(embeddings=_SameVectorEmbeddings())
+
+    async def run():
+        await cache.aset("english", "What is Docker?", "Docker is ...")
+        return await cache.aget("english", "what's docker")
+
+    lookup = asyncio.run(run())
+    assert lookup.hit and lookup.response == "Docker is ..."
@@ -0,0 +1,76 @@
+# test_singleflight_admission.py
+"""Single-flight + admission: one user's 429 is not handed to the others on the same key."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from backend.services.admission import AdmissionController, AdmissionRejected
+from backend.services.singleflight import SingleFlight
+
+
+def test_leader_rejection_is_not_shared_with_other_users():
+    async def scenario():
+        admission = AdmissionController(max_concurrency=1, max_queue_per_user=1, max_wait_seconds=5)
+        flight = SingleFlight("test-chat")
+        # One call holds the only slot; alice already has a request queued (her limit)
+        await admission.acquire("other")
+        alice_queued = asyncio.ensure_future(admission.acquire("alice"))
+        await asyncio.sleep(0)
+
+        def complete_for(user):
+            async def complete():
+                async with admission.slot(user):
+                    return f"answer for {user}"
+            return complete
+
+        alice = asyncio.ensure_future(flight.do("same prompt", complete_for("alice"), retry_on=(AdmissionRejected,)))
+        bob = asyncio.ensure_future(flight.do("same prompt", complete_for("bob"), retry_on=(AdmissionRejected,)))
+        await asyncio.sleep(0.05)
+        # Free the slot: alice's earlier request, then bob's retry, get it in turn
+        admission._release(0.0)
+        await alice_queued
+        admission._release(0.0)
+
+        with pytest.raises(AdmissionRejected):
+            await alice
+        assert await bob == "answer for bob"
+        assert flight.stats()["retried"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_sync_leader_rejection_is_not_shared():
+    flight = SingleFlight("test-analyze")
+    leader_started = threading.Event()
+    follower_joined = threading.Event()
+    results = {}
+
+    def rejected():
+        leader_started.set()
+        follower_joined.wait(1)
+        raise AdmissionRejected("queue full", retry_after=1)
+
+    def leader():
+        try:
+            flight.do_sync("skills", rejected, retry_on=(AdmissionRejected,))
+        except AdmissionRejected:
+            results["leader"] = "429"
+
+    def follower():
+        results["follower"] = flight.do_sync("skills", lambda: "analysis", retry_on=(AdmissionRejected,))
+
+    t1 = threading.Thread(target=leader)
+    t1.start()
+    leader_started.wait(1)
+    t2 = threading.Thread(target=follower)
+    t2.start()
+    while flight.stats()["collapsed"] == 0:
+        time.sleep(0.001)
+    follower_joined.set()
+    t1.join(2)
+    t2.join(2)
+
+    assert results == {"leader": "429", "follower": "analysis"}
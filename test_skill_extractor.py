@@ -0,0 +1,36 @@
+# test_skill_extractor.py
+"""Local skill extraction: real mentions are found, everyday words are not."""
+
+import pytest
+
+from backend.services.skill_extractor import skill_extractor
+
+
+@pytest.mark.parametrize("text", [
+    "I want to go into management",
+    "أنا جيت النهاردة",
+    "نود أن نعرف المزيد",
+    "Let's go, the sun will rust the swift car",
+    "Each node in the tree has two children",
+    "I excel at teamwork",
+    "Job security matters to me",
+    "I need a db of contacts",
+    "I want to learn about ai",
+    "رسمت تابلو جميل",
+])
+def test_everyday_words_are_not_skills(text):
+    assert skill_extractor.extract(text) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("I write backend services in golang", ["go"]),
+    ("I know python and go", ["python", "go"]),
+    ("I am a go developer", ["go"]),
+    ("Experience with node and react", ["node.js", "react"]),
+    ("بشتغل بالبايثون وجيت هاب", ["python", "git"]),
+    ("I use git every day", ["git"]),
+    ("I know python and excel", ["python", "excel"]),
+    ("AI developer with tensorflow", ["artificial intelligence", "tensorflow"]),
+])
+def test_skills_are_found(text, expected):
+    assert skill_extractor.extract(text) == expected
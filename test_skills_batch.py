@@ -0,0 +1,48 @@
+# test_skills_batch.py
+"""
+Skill sets the model drops from a batched reply are retried together in
+one call, not one call (and one admission slot) per set.
+"""
+
+import asyncio
+import json
+
+from backend.services import langchain_adapter
+
+
+class _Reply:
+    def __init__(self, content: str):
+        self.content = content
+
+
+def test_missing_sets_are_retried_in_one_call(monkeypatch):
+    calls = []
+
+    async def fake_ainvoke(messages, user_id=None):
+        ids = [c["id"] for c in json.loads(messages[1].content)["candidates"]]
+        calls.append(ids)
+        # The first reply drops every odd candidate
+        kept = [i for i in ids if i % 2 == 0] if len(calls) == 1 else ids
+        return _Reply(json.dumps({"results": [{"id": i, "titles": ["t"], "questions": ["q"]} for i in kept]}))
+
+    monkeypatch.setattr(langchain_adapter, "_ainvoke", fake_ainvoke)
+    results = asyncio.run(langchain_adapter._analyze_batch([["python"], ["go"], ["sql"], ["rust"], ["java"]]))
+
+    assert calls == [[0, 1, 2, 3, 4], [0, 1]]
+    assert all(result == {"titles": ["t"], "questions": ["q"]} for result in results)
+
+
+def test_sets_still_missing_after_the_retry_get_an_error(monkeypatch):
+    calls = []
+
+    async def fake_ainvoke(messages, user_id=None):
+        calls.append(messages)
+        return _Reply('{"results": [{"id": 0, "titles": ["t"], "questions": ["q"]}]}')
+
+    monkeypatch.setattr(langchain_adapter, "_ainvoke", fake_ainvoke)
+    results = asyncio.run(langchain_adapter._analyze_batch([["python"], ["go"], ["sql"]]))
+
+    # The retry renumbers the missing sets 0..n: its reply covers "go" only
+    assert len(calls) == 2
+    assert results[0] == results[1] == {"titles": ["t"], "questions": ["q"]}
+    assert "error" in results[2]
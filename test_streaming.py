@@ -0,0 +1,32 @@
+# test_streaming.py
+"""SentenceSplitter: sentences are cut once a whole run of terminators has arrived."""
+
+import pytest
+
+from backend.services.streaming import SentenceSplitter
+
+
+def _split(tokens):
+    splitter = SentenceSplitter()
+    sentences = []
+    for token in tokens:
+        sentences.extend(splitter.feed(token))
+    return sentences + splitter.flush()
+
+
+@pytest.mark.parametrize("tokens, expected", [
+    (["Hello", " world.", ".."], ["Hello world..."]),
+    (["Hello", " world.", "..", " Next"], ["Hello world...", "Next"]),
+    (["Really?", "!", " Yes."], ["Really?!", "Yes."]),
+    (["Python 3", ".", "11 is out.", " Try it"], ["Python 3.11 is out.", "Try it"]),
+    (["مرحبا", "؟", " كيف حالك"], ["مرحبا؟", "كيف حالك"]),
+    (["Line one", "\n", "Line two"], ["Line one", "Line two"]),
+])
+def test_sentences(tokens, expected):
+    assert _split(tokens) == expected
+
+
+def test_sentence_is_emitted_once_the_next_token_starts():
+    splitter = SentenceSplitter()
+    assert splitter.feed("Hello world.") == []
+    assert splitter.feed(" How") == ["Hello world."]